@@ -1,7 +1,9 @@
-import pygame
 from abc import ABC, abstractmethod
 
 class Abilities(ABC):
+    __slots__ = ("name", "mana_cost", "cooldown", "remaining_cooldown", "ability_type", "attack", "defense",
+                 "description", "attack_radius", "is_aoe", "damage_type")
+
     def __init__(self, name, mana_cost, cooldown, ability_type, attack=0, defense=0, description="",attack_radius=3,is_aoe=0,damage_type="physical"):
         self.name = name
         self.mana_cost = mana_cost
@@ -70,6 +72,8 @@ class Abilities(ABC):
 
 
 class BuffAbility(Abilities):
+    __slots__ = ("duration",)
+
     def __init__(self, name, mana_cost, cooldown, attack=0, defense=0, description="", duration=8,attack_radius=1):
         # Call the parent constructor with "buff" as the ability type
         super().__init__(name, mana_cost, cooldown, "buff", attack=attack, defense=defense, description=description,attack_radius=attack_radius)
@@ -91,7 +95,7 @@ class BuffAbility(Abilities):
         if not target.is_buffed :
             if self.attack:
                 target.damage += self.attack
-                target.buffed_attack_increase = self.attack  # Track the increase
+                target.buffed_damage_increase = self.attack  # Track the increase
             if self.defense:
                 target.physical_defense += self.defense
                 target.magical_defense += self.defense
@@ -113,6 +117,8 @@ class BuffAbility(Abilities):
 
 
 class DebuffAbility(Abilities):
+    __slots__ = ("duration",)
+
     def __init__(self, name, mana_cost, cooldown, attack=0, defense=0, description="", duration=8,attack_radius=1):
         # Call the parent constructor with "debuff" as the ability type
         super().__init__(name, mana_cost, cooldown, "debuff", attack=attack, defense=defense, description=description,attack_radius=attack_radius)
@@ -159,6 +165,8 @@ class DebuffAbility(Abilities):
 
 
 class DamageHealAbility(Abilities):
+    __slots__ = ()
+
     def __init__(self, name, mana_cost, cooldown, ability_type, attack=0, defense=0,description="", attack_radius=3, is_aoe=0, damage_type="physical"):
         super().__init__(name, mana_cost, cooldown, ability_type=ability_type, attack=attack,defense=defense, description=description, attack_radius=attack_radius, is_aoe=is_aoe, damage_type=damage_type)
 
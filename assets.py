@@ -0,0 +1,195 @@
+import json
+import mmap
+import os
+import queue
+import struct
+import threading
+import pygame
+from cache import surface_cache
+
+
+# Every image the game draws, decoded behind the loading screen
+IMAGE_FILES = [
+    # terrain and overlays
+    "assets/grass_new.png",
+    "assets/water.jpg",
+    "assets/new_rock.png",
+    "assets/bush.png",
+    "assets/inhibetor.png",
+    # units
+    "assets/ashe.png",
+    "assets/garen.png",
+    "assets/darius.png",
+    "assets/soraka.png",
+    "assets/rengar.png",
+    "assets/BlueBuff.png",
+    "assets/RedBuff.png",
+    "assets/BigBuff.png",
+    "assets/Nexus_Blue.png",
+    "assets/Nexus_Red.png",
+    # indicators
+    "assets/indicator.png",
+    "assets/indicator1.jpg",
+    "assets/redsquare.png",
+    # pickups
+    "assets/red_potion.png",
+    "assets/blue_potion.png",
+    "assets/green_potion.png",
+    "assets/golden_potion.png",
+    "assets/black_potion.png",
+    # menus
+    "assets/main_screen.jpg",
+    "assets/lol_background.jpg",
+    "assets/champ_select.jpg",
+    "assets/game_over_image.jpg",
+    "assets/red_key.png",
+    "assets/blue_key.png",
+]
+
+# Packed images written by pack_assets.py: magic, index length, JSON index, raw pixels
+BUNDLE_FILE = "assets/bundle.bin"
+BUNDLE_MAGIC = b"LOBUNDL2"
+BUNDLE_HEADER = struct.Struct("<8sI")
+
+
+
+
+# Asset Manager Class
+class AssetManager:
+    """
+    Process-wide image store keyed by file path. Each image is read from disk once and
+    converted to the display's pixel format once, so blits skip the per-call conversion.
+    Files can be decoded on a worker thread; the conversion itself stays on the main thread.
+    """
+    def __init__(self):
+        self.images = {}  # path -> converted surface
+        self.decoded = queue.Queue()  # (path, surface) decoded by the worker, not converted yet
+        self.pending = set()  # Paths handed to the worker and not collected yet
+        self.worker = None
+
+
+
+
+    def image(self, path):
+        """Return the converted image for `path`, loading it now if it was not preloaded."""
+        surface = self.images.get(path)
+        if surface is None:
+            self.collect()
+            surface = self.images.get(path)
+        if surface is None:
+            surface = self.convert(pygame.image.load(path))
+            self.images[path] = surface
+            self.pending.discard(path)
+        return surface
+
+
+
+
+    def preload(self, paths=IMAGE_FILES):
+        """Start decoding `paths` on a daemon thread. Call collect() from the main thread to pick them up."""
+        paths = [path for path in paths if path not in self.images and path not in self.pending]
+        if not paths:
+            return
+        self.pending.update(paths)
+        self.worker = threading.Thread(target=self.decode, args=(paths,), daemon=True)
+        self.worker.start()
+
+
+
+
+    def load_bundle(self, path=BUNDLE_FILE):
+        """
+        Load every packed image and its pre-scaled copies with a single mmap of the bundle.
+        :return: False when the bundle is missing or older than one of its source files,
+                 in which case the loose files are used.
+        """
+        try:
+            bundle = open(path, "rb")
+        except FileNotFoundError:
+            return False
+
+        with bundle, mmap.mmap(bundle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, index_length = BUNDLE_HEADER.unpack_from(data)
+            if magic != BUNDLE_MAGIC:
+                return False
+            index = json.loads(data[BUNDLE_HEADER.size:BUNDLE_HEADER.size + index_length])
+            if any(os.path.exists(source) and os.path.getmtime(source) != mtime
+                   for source, mtime in index["sources"].items()):
+                return False  # A source image was edited since the bundle was built
+            start = BUNDLE_HEADER.size + index_length
+
+            for image_path, variants in index["images"].items():
+                base = None  # The first variant is the file itself, the others are its scaled copies
+                for width, height, pixel_format, offset, alphas in variants:
+                    length = width * height * len(pixel_format)
+                    pixels = data[start + offset:start + offset + length]
+                    surface = self.convert(pygame.image.frombuffer(pixels, (width, height), pixel_format))
+                    if base is None:
+                        base = surface
+                        self.images[image_path] = base
+                        self.pending.discard(image_path)
+                        continue
+                    # Under the same (image, size, alpha) key SurfaceCache.get_scaled looks up
+                    for alpha in alphas:
+                        faded = surface
+                        if alpha is not None:
+                            faded = surface.copy()
+                            faded.set_alpha(alpha)
+                        surface_cache.put(base, (width, height), faded, alpha)
+        return True
+
+
+
+
+    def decode(self, paths):
+        for path in paths:
+            try:
+                self.decoded.put((path, pygame.image.load(path)))
+            except (FileNotFoundError, pygame.error):
+                self.decoded.put((path, None))  # image() reports the error when the file is used
+
+
+
+
+    def collect(self):
+        """Convert every image the worker has finished decoding."""
+        while True:
+            try:
+                path, surface = self.decoded.get_nowait()
+            except queue.Empty:
+                return
+            if surface is not None and path not in self.images:  # image() may have loaded it first
+                self.images[path] = self.convert(surface)
+            self.pending.discard(path)
+
+
+
+
+    def progress(self):
+        """Fraction of the preloaded images that are ready, 1.0 once nothing is pending."""
+        total = len(self.images) + len(self.pending)
+        return len(self.images) / total if total else 1.0
+
+
+
+
+    def is_loading(self):
+        return bool(self.pending)
+
+
+
+
+    @staticmethod
+    def convert(surface):
+        """Convert to the display format, keeping per-pixel alpha when the file has it."""
+        if pygame.display.get_surface() is None:
+            return surface  # No window yet (headless use), keep the file's format
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+
+
+
+# Images shared by the game, the grid, the pickups and every unit
+assets = AssetManager()
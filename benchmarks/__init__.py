@@ -0,0 +1,6 @@
+"""
+Micro-benchmarks for the rendering and game-logic hot paths.
+
+Run them from the repository root so the relative asset paths resolve, e.g.
+    python -m benchmarks.terrain
+"""
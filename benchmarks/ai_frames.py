@@ -0,0 +1,67 @@
+"""
+Computer seats in the render loop: frame times while two alpha-beta players face each other,
+with the search called from the game loop against the game's seats, which search in a background process.
+The 99th percentile rather than the longest frame: killing a monster plays a blocking animation.
+"""
+import contextlib
+import io
+import random
+import time
+
+from benchmarks.common import start_match
+from game import Game, AI_ACTION_DELAY
+from policies import AlphaBetaPolicy
+
+FRAMES = 600
+
+
+
+
+def session(seat):
+    """
+    Render FRAMES frames with both teams on `seat` ("plain": AlphaBetaPolicy called from the loop,
+    "background": the game's alpha-beta seats, polled by handle_turn).
+    :return: (frame times in ms, sorted; actions played).
+    """
+    with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+        game = start_match(Game(seats={"blue": "alphabeta", "red": "alphabeta"}, throttle=False))
+        players = dict(game.ai_players)
+        if seat == "plain":
+            game.ai_players = {}  # handle_turn then waits for keys, and the loop below plays
+            plain = AlphaBetaPolicy()
+            rng = random.Random(0)
+        actions = 0
+        frames = []
+        last_action = time.perf_counter()
+        moved = game.last_move_time
+        for _ in range(FRAMES):
+            start = time.perf_counter()
+            if seat == "plain" and (start - last_action) * 1000 > AI_ACTION_DELAY:
+                game.apply(plain.choose(game, rng))
+                last_action = time.perf_counter()
+                actions += 1
+            game.run_frame()
+            game.scheduler.tick(True)
+            frames.append((time.perf_counter() - start) * 1000)
+            if seat == "background" and game.last_move_time != moved:  # handle_turn played an action
+                moved = game.last_move_time
+                actions += 1
+        for player in players.values():
+            player.close()
+    return sorted(frames), actions
+
+
+
+
+def main():
+    print(f"Two alpha-beta computers, {FRAMES} frames")
+    for seat, label in (("plain", "search in the loop"), ("background", "background process")):
+        frames, actions = session(seat)
+        print(f"  {label:<20} {actions:3d} actions   frame median {frames[len(frames) // 2]:6.1f} ms, "
+              f"95th {frames[len(frames) * 95 // 100]:6.1f} ms, 99th {frames[len(frames) * 99 // 100]:6.1f} ms")
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Alpha-beta computer player: time per decision against its budget, depth reached, nodes searched
+and transposition table hits, and results of a few matches against the scripted player.
+"""
+import contextlib
+import io
+import random
+import time
+
+from engine import Match
+from policies import AlphaBetaPolicy, ScriptedPolicy
+
+BUDGET_MS = 40  # Small, so the matches finish quickly
+MATCHES = 4
+MAX_TURNS = 600
+
+
+
+
+def play(seed, searcher_color):
+    """One match of the alpha-beta player against the scripted one; returns (winner, turns, decisions)."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    searcher = AlphaBetaPolicy(budget_ms=BUDGET_MS)
+    other = "red" if searcher_color == "blue" else "blue"
+    policies = {searcher_color: searcher, other: ScriptedPolicy()}
+    decisions = []  # (seconds, depth, nodes) of every searched decision
+    match = Match.new()
+    while match.current_turn <= MAX_TURNS and match.legal_actions():
+        policy = policies[match.current_unit.color]
+        start = time.perf_counter()
+        action = policy.choose(match, rng)
+        if policy is searcher and searcher.nodes:
+            decisions.append((time.perf_counter() - start, searcher.depth_reached, searcher.nodes))
+        match.apply(action)
+    table = searcher.table
+    return match.winner(), match.current_turn, decisions, table.hits / max(1, table.hits + table.misses)
+
+
+
+
+def main():
+    print(f"Alpha-beta player, {BUDGET_MS} ms per decision, against the scripted player")
+    wins = 0
+    decisions = []
+    for seed in range(MATCHES):
+        color = "blue" if seed % 2 == 0 else "red"
+        with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+            winner, turns, played, hit_rate = play(seed, color)
+        wins += winner == color
+        decisions += played
+        print(f"  match {seed}: alpha-beta {color:<4}  winner {winner or '-':<4}  {turns:4d} turns  "
+              f"table hits {hit_rate:.0%}")
+
+    seconds = sorted(decision[0] for decision in decisions)
+    depths = [decision[1] for decision in decisions]
+    nodes = sum(decision[2] for decision in decisions)
+    print(f"  {'wins':<28} {wins} / {MATCHES}")
+    print(f"  {'decision, median / max':<28} {seconds[len(seconds) // 2] * 1000:6.1f} / {seconds[-1] * 1000:6.1f} ms")
+    print(f"  {'depth, mean / max':<28} {sum(depths) / len(depths):6.1f} / {max(depths):6d}")
+    print(f"  {'nodes per second':<28} {nodes / sum(seconds):8.0f}")
+
+
+
+
+if __name__ == "__main__":
+    main()
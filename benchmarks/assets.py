@@ -0,0 +1,87 @@
+"""
+Image loading: blit cost of images left in the file's pixel format versus converted to the
+display format, and the disk work of building a second match's units.
+"""
+import time
+import pygame
+from benchmarks.common import setup_display, time_frames, report
+from game import SCREEN_WIDTH, SCREEN_HEIGHT, CELL_SIZE, load_unit_images
+from assets import assets
+import unit
+from unit import Unit
+
+
+
+
+class UnitFactory:
+    """The attribute Unit.create_units reads from the Game it is called on."""
+    def __init__(self):
+        self.unit_images = load_unit_images()
+
+
+
+
+class RecordingAssets:
+    """Stands in for the shared asset manager to record which file each unit asks for."""
+    def __init__(self):
+        self.paths = []
+
+
+
+
+    def image(self, path):
+        self.paths.append(path)
+        return assets.image(path)
+
+
+
+
+def blit_many(screen, image, count):
+    for i in range(count):
+        screen.blit(image, ((i * 7) % SCREEN_WIDTH, (i * 13) % SCREEN_HEIGHT))
+
+
+
+
+def main():
+    screen = setup_display(SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    # Blits of a full-screen menu background and of 200 unit sprites
+    for label, path, size, count in (
+        ("Menu background", "assets/lol_background.jpg", (SCREEN_WIDTH, SCREEN_HEIGHT), 1),
+        ("200 unit sprites", "assets/garen.png", (CELL_SIZE, CELL_SIZE), 200),
+    ):
+        raw = pygame.transform.scale(pygame.image.load(path), size)
+        converted = pygame.transform.scale(assets.image(path), size)
+        report(label, [
+            ("before (file pixel format)", time_frames(lambda: blit_many(screen, raw, count))),
+            ("after (converted once)", time_frames(lambda: blit_many(screen, converted, count))),
+        ])
+
+    # Units of one match: previously every unit read its image from disk in Unit.__init__
+    factory = UnitFactory()
+    recorder = RecordingAssets()
+    unit.assets = recorder
+    Unit.create_units(factory)
+    unit.assets = assets
+    paths = recorder.paths
+
+    start = time.perf_counter()
+    for path in paths:
+        pygame.image.load(path)
+    Unit.create_units(factory)
+    legacy = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    Unit.create_units(factory)
+    shared = (time.perf_counter() - start) * 1000
+
+    print(f"Starting a new match ({len(paths)} units, {len(set(paths))} distinct images)")
+    print(f"  {'before (image.load per unit)':<32} {legacy:8.3f} ms")
+    print(f"  {'after (shared by path)':<32} {shared:8.3f} ms")
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Bitboard match states: snapshot and restore against copying the objects, and move generation,
+reach and area hit tests as bit operations against the object-model queries.
+The mismatch counts compare both representations on positions from random matches.
+"""
+import contextlib
+import copy
+import io
+import random
+import time
+
+from bitboard import MatchState
+from engine import Match
+
+CALLS = 2000
+
+
+
+
+def time_per_call(call, calls=CALLS):
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+
+
+def sample_positions(matches=10, every=25, seed=0):
+    """Matches paused every `every` random actions."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    positions = []
+    for _ in range(matches):
+        match = Match.new()
+        for played in range(1500):
+            actions = match.legal_actions()
+            if not actions:
+                break
+            if played % every == 0 and match.current_unit.state == "move":
+                positions.append(copy.deepcopy(match))
+            match.apply(rng.choice(actions))
+    return positions
+
+
+
+
+def replay(match, seed, actions=200):
+    """Play on with seeded random actions; return the trace of chosen actions and unit healths."""
+    random.seed(seed)
+    rng = random.Random(seed)
+    trace = []
+    for _ in range(actions):
+        legal = match.legal_actions()
+        if not legal:
+            break
+        action = rng.choice(legal)
+        match.apply(action)
+        trace.append((action, tuple(unit.health for unit in match.units)))
+    return trace
+
+
+
+
+def mismatches(positions):
+    """Positions where the bitboard answers differ from the object model's."""
+    moves = reach = restored = 0
+    for i, match in enumerate(positions):
+        state = MatchState.from_match(match)
+        unit = match.current_unit
+        layout = state.layout
+
+        legal = {(action[1], action[2]) for action in match.legal_actions() if action[0] == "move_to"}
+        moves += set(layout.cells(state.moves())) != legal
+        expected = {match.grid.search.position(index) for index in
+                    match.grid.search.reachable_from(unit.initial_x, unit.initial_y, unit.move_range)}
+        reach += set(layout.cells(layout.reachable(unit.initial_x, unit.initial_y, unit.move_range))) != expected
+
+        # The same random continuation from the original match and from a rebuilt one
+        restored += replay(copy.deepcopy(match), i) != replay(state.to_match(), i)
+    return moves, reach, restored
+
+
+
+
+def main():
+    with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+        positions = sample_positions()
+        moves, reach, restored = mismatches(positions)
+
+    match = positions[len(positions) // 2]
+    state = MatchState.from_match(match)
+    target = state.to_match()
+    unit = match.current_unit
+    search = match.grid.search
+    layout = state.layout
+
+    print(f"Bitboard match state ({len(positions)} positions from random matches)")
+    print(f"  {'mismatches: moves / reach / replay':<36} {moves} / {reach} / {restored}")
+    print(f"  {'snapshot, copy.deepcopy(match)':<36} {time_per_call(lambda: copy.deepcopy(match), CALLS // 10):8.1f} us")
+    print(f"  {'snapshot, MatchState.from_match':<36} {time_per_call(lambda: MatchState.from_match(match)):8.1f} us")
+    print(f"  {'restore into a match':<36} {time_per_call(lambda: state.restore(target)):8.1f} us")
+    print(f"  {'move generation, legal_actions':<36} {time_per_call(match.legal_actions):8.1f} us")
+    print(f"  {'move generation, bitboards':<36} {time_per_call(state.moves):8.1f} us")
+    print(f"  {'reach, GridSearch (Dijkstra)':<36} "
+          f"{time_per_call(lambda: search.reachable_from(unit.initial_x, unit.initial_y, unit.move_range)):8.1f} us")
+    print(f"  {'reach, bitboards':<36} "
+          f"{time_per_call(lambda: layout.reachable(unit.initial_x, unit.initial_y, unit.move_range)):8.1f} us")
+    print(f"  {'area hit test, occupancy index':<36} {time_per_call(lambda: match.occupancy.in_range(10, 10, 2)):8.1f} us")
+    print(f"  {'area hit test, bitboards':<36} {time_per_call(lambda: state.hits(10, 10, 2, 'red')):8.1f} us")
+
+
+
+
+if __name__ == "__main__":
+    main()
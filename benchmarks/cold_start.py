@@ -0,0 +1,35 @@
+"""
+Cold start of Game(): every image read and decoded from its own file versus the packed,
+pre-scaled asset bundle. Each run is a fresh interpreter; the best of a few runs is kept.
+"""
+import os
+import tempfile
+from benchmarks.common import setup_display
+from benchmarks.sound_startup import measure
+from pack_assets import pack
+
+
+STARTUP = """
+from game import Game
+Game(preload_sounds=False, asset_bundle={bundle!r})
+"""
+
+
+
+
+def main(runs=5):
+    setup_display(1, 1)
+    with tempfile.TemporaryDirectory() as directory:
+        bundle = os.path.join(directory, "bundle.bin")
+        images, surfaces, size = pack(bundle)
+
+        print(f"Cold start to a ready Game() ({images} images, bundle of {surfaces} surfaces, {size / 1024 / 1024:.1f} MB)")
+        for label, path in (("before (loose files)", None), ("after (asset bundle)", bundle)):
+            best = min(measure(STARTUP.format(bundle=path))[0] for _ in range(runs))
+            print(f"  {label:<32} {best * 1000:8.1f} ms")
+
+
+
+
+if __name__ == "__main__":
+    main()
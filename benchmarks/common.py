@@ -0,0 +1,53 @@
+import os
+import time
+
+# Run pygame without a window or an audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+
+
+
+def setup_display(width, height):
+    """Initialise pygame headlessly and return a display surface of the given size."""
+    pygame.init()
+    return pygame.display.set_mode((width, height))
+
+
+
+
+def time_frames(draw_frame, frames=300):
+    """Call draw_frame() `frames` times and return the mean time per frame in ms."""
+    draw_frame()  # Warm-up frame (lazy caches, first allocations)
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw_frame()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+
+
+def report(title, results):
+    """Print a small table of (label, milliseconds) rows."""
+    print(title)
+    for label, ms in results:
+        print(f"  {label:<32} {ms:8.3f} ms/frame")
+
+
+
+
+def start_match(game):
+    """
+    Set up a 2v2 match on `game` the way Game.show_menu does, without the selection menus:
+    Garen and Ashe for blue, Darius and Soraka for red.
+    """
+    from engine import assign_teams
+    from unit import Unit
+
+    game.units = assign_teams(Unit.create_units(game), ("Garen", "Ashe"), ("Darius", "Soraka"))
+    game.current_unit_index = 0
+    game.start()
+    game.dirty_regions.invalidate()
+    return game
@@ -0,0 +1,57 @@
+"""CPU time per second of play, idle and active, with full-screen flips versus the dirty-rectangle mode."""
+import time
+import pygame
+from benchmarks.common import start_match
+from game import Game, FPS
+
+
+
+
+def play(game, seconds, active):
+    """
+    Run the game loop at FPS for `seconds` of wall time and return the CPU seconds used per second.
+    When `active`, the current unit walks back and forth every 100 ms and a unit takes damage every 500 ms.
+    """
+    unit = game.units[game.current_unit_index]
+    target = game.units[1]
+    step = 1
+    next_move = next_hit = 0
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    while time.perf_counter() - wall_start < seconds:
+        pygame.event.pump()
+        now = pygame.time.get_ticks()
+        if active and now >= next_move:
+            unit.move(step, 0, game.grid)
+            step = -step
+            next_move = now + 100
+        if active and now >= next_hit:
+            unit.attack(target, 10)
+            next_hit = now + 500
+
+        if game.dirty_rects:
+            game.run_dirty_frame()
+        else:
+            game.run_frame()
+        game.clock.tick(FPS)
+
+    return (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+
+
+
+
+def main():
+    print("CPU seconds per second of play (1.0 = one full core)")
+    for dirty_rects in (False, True):
+        label = "dirty rectangles" if dirty_rects else "full flip"
+        game = start_match(Game(dirty_rects=dirty_rects))
+        idle = play(game, 3, active=False)
+        active = play(game, 3, active=True)
+        print(f"  {label:<18} idle {idle:6.3f}   active {active:6.3f}")
+
+
+
+
+if __name__ == "__main__":
+    main()
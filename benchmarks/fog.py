@@ -0,0 +1,78 @@
+"""Frame time of the fog of war at several coverage levels: per-cell alpha blits versus the cached fog surface."""
+import random
+import numpy as np
+import pygame
+from benchmarks.common import setup_display, time_frames, report
+from game import GRID_SIZE, CELL_SIZE
+from interface import Highlight
+
+
+
+
+class FogState:
+    """The attributes Highlight.draw_fog reads from the Game it is called on."""
+    def __init__(self, visible_tiles):
+        self.visible_tiles = visible_tiles
+        self.visible_mask = np.zeros((GRID_SIZE, GRID_SIZE), dtype=bool)
+        for x, y in visible_tiles:
+            self.visible_mask[x, y] = True
+        self.fog_surface = None
+
+
+
+
+def legacy_draw_fog(state, screen):
+    """Previous behaviour: one alpha blit per fogged or edge cell, every frame."""
+    fog_overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+    fog_overlay.fill((0, 0, 0, 170))
+    dim_overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+    dim_overlay.fill((50, 50, 50, 85))
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+    for x in range(GRID_SIZE):
+        for y in range(GRID_SIZE):
+            rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+            if (x, y) not in state.visible_tiles:
+                screen.blit(fog_overlay, rect)
+            elif any((x + dx, y + dy) not in state.visible_tiles for dx, dy in directions):
+                screen.blit(dim_overlay, rect)
+
+
+
+
+def legacy_build_fog_surface(state):
+    """Previous fog surface rebuild: a set lookup and a set_at call per cell."""
+    cells = pygame.Surface((GRID_SIZE, GRID_SIZE), pygame.SRCALPHA)
+    cells.fill((0, 0, 0, 0))
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    for x in range(GRID_SIZE):
+        for y in range(GRID_SIZE):
+            if (x, y) not in state.visible_tiles:
+                cells.set_at((x, y), (0, 0, 0, 170))
+            elif any((x + dx, y + dy) not in state.visible_tiles for dx, dy in directions):
+                cells.set_at((x, y), (50, 50, 50, 85))
+    return pygame.transform.scale(cells, (GRID_SIZE * CELL_SIZE, GRID_SIZE * CELL_SIZE))
+
+
+
+
+def main():
+    screen = setup_display(CELL_SIZE * GRID_SIZE, CELL_SIZE * GRID_SIZE)
+    rng = random.Random(0)
+    cells = [(x, y) for x in range(GRID_SIZE) for y in range(GRID_SIZE)]
+
+    for coverage in (1.0, 0.9, 0.5, 0.1):
+        fogged = int(len(cells) * coverage)
+        state = FogState(set(rng.sample(cells, len(cells) - fogged)))
+        report(f"Fog of war, {coverage:.0%} of the map fogged", [
+            ("before (per-cell alpha blits)", time_frames(lambda: legacy_draw_fog(state, screen))),
+            ("after (cached fog surface)", time_frames(lambda: Highlight.draw_fog(state, screen))),
+            ("fog surface rebuild, per cell", time_frames(lambda: legacy_build_fog_surface(state), frames=50)),
+            ("fog surface rebuild, NumPy masks", time_frames(lambda: Highlight.build_fog_surface(state), frames=50)),
+        ])
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Vision and movement-range searches: list-based BFS versus GridSearch, on the real map and synthetic 200x200 maps.
+Movement is compared against the weighted (Dijkstra) search, which can reach cells the old FIFO search missed.
+"""
+import random
+import time
+from grid_search import GridSearch
+from interface import Grid, GRID_SIZE
+
+
+
+
+def legacy_visibility(tiles, size, start_x, start_y, max_visibility):
+    """Previous update_fog_visibility BFS for a single unit."""
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    queue = [(start_x, start_y, 0)]
+    visible = set()
+    while queue:
+        x, y, distance = queue.pop(0)
+        if distance > max_visibility:
+            continue
+        visible.add((x, y))
+        for dx, dy in directions:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < size and 0 <= ny < size and (nx, ny) not in visible and distance + 1 <= max_visibility:
+                if not tiles[nx][ny].traversable:
+                    visible.add((nx, ny))
+                    continue
+                queue.append((nx, ny, distance + 1))
+    return visible
+
+
+
+
+def legacy_reachable(tiles, size, start_x, start_y, move_range):
+    """Previous highlight_range BFS for the move state."""
+    visited = set()
+    reachable = set()
+    queue = [(start_x, start_y, 0)]
+    while queue:
+        x, y, cost = queue.pop(0)
+        if (x, y) in visited or cost > move_range:
+            continue
+        visited.add((x, y))
+        if tiles[x][y].traversable:
+            reachable.add((x, y))
+            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < size and 0 <= ny < size:
+                    next_cost = cost + tiles[nx][ny].move_cost
+                    if next_cost <= move_range and (nx, ny) not in visited:
+                        queue.append((nx, ny, next_cost))
+    return reachable
+
+
+
+
+class SyntheticTile:
+    def __init__(self, terrain):
+        self.traversable = terrain != "rock"
+        self.move_cost = {"grass": 1, "water": 2, "rock": float("inf")}[terrain]
+
+
+
+
+def synthetic_tiles(size, seed):
+    """Random map with roughly 15% rock and 10% water."""
+    rng = random.Random(seed)
+    terrains = ["rock"] * 15 + ["water"] * 10 + ["grass"] * 75
+    return [[SyntheticTile(rng.choice(terrains)) for _ in range(size)] for _ in range(size)]
+
+
+
+
+def search_from_tiles(tiles):
+    flat = [tile for column in tiles for tile in column]
+    return GridSearch(len(tiles), len(tiles[0]),
+                      [t.traversable for t in flat], [t.move_cost for t in flat])
+
+
+
+
+def measure(function, starts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for x, y in starts:
+            function(x, y)
+    return (time.perf_counter() - start) * 1e6 / (repeat * len(starts))
+
+
+
+
+def compare(title, tiles, radii, repeat):
+    size = len(tiles)
+    search = search_from_tiles(tiles)
+    rng = random.Random(1)
+    starts = [(x, y) for x, y in ((rng.randrange(size), rng.randrange(size)) for _ in range(200)) if tiles[x][y].traversable][:50]
+
+    print(title)
+    for radius in radii:
+        # Vision must match exactly, movement may only gain the cells the FIFO search wrongly missed
+        missed = 0
+        for x, y in starts:
+            assert {search.position(i) for i in search.visible_from(x, y, radius)} == legacy_visibility(tiles, size, x, y, radius)
+            reachable = {search.position(i) for i in search.reachable_from(x, y, radius)}
+            legacy = legacy_reachable(tiles, size, x, y, radius)
+            assert legacy <= reachable
+            missed += len(reachable - legacy)
+
+        rows = [
+            ("vision, list BFS", measure(lambda x, y: legacy_visibility(tiles, size, x, y, radius), starts, repeat)),
+            ("vision, GridSearch", measure(lambda x, y: search.visible_from(x, y, radius), starts, repeat)),
+            ("movement, list BFS", measure(lambda x, y: legacy_reachable(tiles, size, x, y, radius), starts, repeat)),
+            ("movement, Dijkstra", measure(lambda x, y: search.reachable_from(x, y, radius), starts, repeat)),
+        ]
+        for label, us in rows:
+            print(f"  radius {radius:<3} {label:<24} {us:10.1f} us/search")
+        print(f"  radius {radius:<3} cells missed by the FIFO movement search: {missed}")
+
+
+
+
+def main():
+    grid = Grid(GRID_SIZE, {})
+    compare(f"{GRID_SIZE}x{GRID_SIZE} map", grid.tiles, radii=(3, 5, 6), repeat=20)
+    compare("200x200 synthetic map", synthetic_tiles(200, seed=0), radii=(6, 10, 12), repeat=1)
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Throughput of the headless rules engine: random players through whole matches, no display or audio.
+"""
+import contextlib
+import io
+import random
+import sys
+import time
+
+from engine import Match
+
+
+
+
+def play_random_match(rng, max_actions=100000):
+    """Play one match with uniformly random legal actions. Return (winner, actions played)."""
+    match = Match.new()
+    for played in range(max_actions):
+        actions = match.legal_actions()
+        if not actions:
+            return match.winner(), played
+        match.apply(rng.choice(actions))
+    return None, max_actions
+
+
+
+
+def main(matches=100, seed=0):
+    rng = random.Random(seed)
+    random.seed(seed)  # The rules roll critical hits and pickups on the global generator
+    wins = {"blue": 0, "red": 0, None: 0}
+    total_actions = 0
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+        for _ in range(matches):
+            winner, played = play_random_match(rng)
+            wins[winner] += 1
+            total_actions += played
+    elapsed = time.perf_counter() - start
+
+    print(f"Headless random matches ({matches}, pygame imported: {'pygame' in sys.modules})")
+    print(f"  {'matches per minute':<32} {matches / elapsed * 60:8.0f}")
+    print(f"  {'actions per second':<32} {total_actions / elapsed:8.0f}")
+    print(f"  {'actions per match':<32} {total_actions / matches:8.0f}")
+    print(f"  {'wins blue / red / unfinished':<32} {wins['blue']} / {wins['red']} / {wins[None]}")
+
+
+
+
+if __name__ == "__main__":
+    main()
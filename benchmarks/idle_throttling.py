@@ -0,0 +1,41 @@
+"""Measured frame rate and CPU use of an idle match, with and without idle frame throttling."""
+import time
+import pygame
+from benchmarks.common import start_match
+from game import Game
+
+
+
+
+def idle(game, seconds):
+    """Run the match loop with no input for `seconds` and return (frame rate, CPU fraction)."""
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    while time.perf_counter() - start < seconds:
+        pygame.event.get()
+        if game.dirty_rects:
+            game.run_dirty_frame()
+        else:
+            game.run_frame()
+        game.scheduler.tick(game.is_animating())
+    cpu = (time.process_time() - cpu_start) / (time.perf_counter() - start)
+    return game.scheduler.frame_rate(), cpu
+
+
+
+
+def main():
+    print("Idle match (waiting for input in the move phase)")
+    for dirty_rects in (False, True):
+        for throttle in (False, True):
+            game = start_match(Game(dirty_rects=dirty_rects, throttle=throttle))
+            fps, cpu = idle(game, 3)
+            mode = "dirty rectangles" if dirty_rects else "full flip"
+            state = "throttled" if throttle else "fixed 60 FPS"
+            print(f"  {mode:<18} {state:<14} {fps:6.1f} FPS   CPU {cpu:6.1%}")
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+MCTS computer player: rollouts per second and decision time for each number of worker processes
+(root parallelization), and results of a few matches against the scripted player.
+"""
+import contextlib
+import io
+import multiprocessing
+import random
+
+from engine import Match
+from policies import MCTSPolicy, ScriptedPolicy
+
+BUDGET_MS = 250
+DECISIONS = 6
+MATCH_BUDGET_MS = 100  # Smaller, so the matches finish quickly
+MATCHES = 2
+MAX_TURNS = 600
+
+
+
+
+def throughput(workers):
+    """(rollouts per second, mean decision time in s) over the first decisions of a match."""
+    rng = random.Random(0)
+    random.seed(0)
+    with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+        match = Match.new()
+    policy = MCTSPolicy(budget_ms=BUDGET_MS, workers=workers)
+    policy.choose(match, rng)  # Worker processes start on the first one
+    rollouts = elapsed = 0
+    for _ in range(DECISIONS):
+        action = policy.choose(match, rng)
+        rollouts += policy.rollouts
+        elapsed += policy.elapsed
+        with contextlib.redirect_stdout(io.StringIO()):
+            match.apply(action)
+    policy.close()
+    return rollouts / elapsed, elapsed / DECISIONS
+
+
+
+
+def play(seed, searcher_color):
+    """One match of the MCTS player (in this process) against the scripted one; returns (winner, turns)."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    other = "red" if searcher_color == "blue" else "blue"
+    policies = {searcher_color: MCTSPolicy(budget_ms=MATCH_BUDGET_MS, workers=1), other: ScriptedPolicy()}
+    with contextlib.redirect_stdout(io.StringIO()):
+        match = Match.new()
+        while match.current_turn <= MAX_TURNS and match.legal_actions():
+            match.apply(policies[match.current_unit.color].choose(match, rng))
+    return match.winner(), match.current_turn
+
+
+
+
+def main():
+    cores = multiprocessing.cpu_count()
+    print(f"MCTS player, {BUDGET_MS} ms per decision ({cores} CPU cores)")
+    for workers in sorted({1, 2, cores}):
+        rate, decision = throughput(workers)
+        print(f"  {workers} worker(s)  {rate:8.0f} rollouts/s   decision {decision * 1000:6.1f} ms")
+
+    print(f"Against the scripted player, {MATCH_BUDGET_MS} ms per decision, 1 worker")
+    for seed in range(MATCHES):
+        color = "blue" if seed % 2 == 0 else "red"
+        winner, turns = play(seed, color)
+        print(f"  match {seed}: MCTS {color:<4}  winner {winner or '-':<4}  {turns:4d} turns")
+
+
+
+
+if __name__ == "__main__":
+    main()
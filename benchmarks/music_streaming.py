@@ -0,0 +1,76 @@
+"""
+Background music: a fully decoded mixer.Sound with a blocking fade loop versus
+the streamed music player with a fade advanced once per frame.
+Memory is measured in fresh interpreters so decoded buffers do not carry over.
+"""
+import time
+
+from benchmarks.common import setup_display
+from benchmarks.sound_startup import measure
+
+import pygame
+
+
+DECODED = """
+sound = pygame.mixer.Sound("sounds/game_music.mp3")
+sound.play(loops=-1)
+pygame.time.delay(500)
+"""
+
+STREAMED = """
+from sounds import music_player
+music_player.play("game_music")
+pygame.time.delay(500)
+"""
+
+
+
+
+def blocking_fade():
+    """The fade show_menu used to run: 100 volume steps 10 ms apart, nothing drawn meanwhile."""
+    sound = pygame.mixer.Sound("sounds/game_music.mp3")
+    sound.play(loops=-1)
+    start = time.perf_counter()
+    for volume in reversed([x / 100 for x in range(1, 101)]):
+        sound.set_volume(volume)
+        pygame.time.delay(10)
+    sound.stop()
+    return (time.perf_counter() - start) * 1000
+
+
+
+
+def frame_driven_fade():
+    """Longest time a single frame spends advancing the same fade on the music player."""
+    from sounds import music_player
+    music_player.play("game_music")
+    music_player.fade(0.03, 1000)
+    longest = 0
+    while music_player.is_fading():
+        start = time.perf_counter()
+        music_player.update()
+        longest = max(longest, time.perf_counter() - start)
+        pygame.time.delay(16)  # Rest of a 60 FPS frame
+    music_player.stop()
+    return longest * 1000
+
+
+
+
+def main():
+    print("Music memory (peak RSS while playing)")
+    for label, code in (("before (decoded mixer.Sound)", DECODED), ("after (streamed mixer.music)", STREAMED)):
+        _, rss = measure(code)
+        print(f"  {label:<32} {rss:7.1f} MB")
+
+    setup_display(1, 1)
+    pygame.mixer.init()
+    print("Menu blocked by the music fade")
+    print(f"  {'before (blocking fade loop)':<32} {blocking_fade():8.3f} ms")
+    print(f"  {'after (longest frame update)':<32} {frame_driven_fade():8.3f} ms")
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Cell lookups of the rules engine: the unit under a cursor, the targets in range and the whole
+list of legal actions, on a normal match and on one crowded with extra monsters.
+"""
+import contextlib
+import io
+import random
+import time
+
+from engine import Match, UnitState, UNIT_IMAGES
+
+QUERIES = 20000
+
+
+
+
+def crowded_match(extra, seed=0):
+    """Standard 2v2 match plus `extra` monsters on free grass cells (placed before the bases, which stay last)."""
+    match = Match.new()
+    rng = random.Random(seed)
+    taken = {(unit.x, unit.y) for unit in match.units}
+    free = [(x, y) for x in range(match.grid.size) for y in range(match.grid.size)
+            if match.grid.tiles[x][y].traversable and (x, y) not in taken]
+    monsters = [UnitState(x, y, "BigBuff", 1000, 50, 0, 0, 0, UNIT_IMAGES["bigbuff"], "neutral", 3, 2, "monster")
+                for x, y in rng.sample(free, extra)]
+    units = match.units[:-2] + monsters + match.units[-2:]
+    match = Match(units)
+    match.pickup.initialize()
+    match.start()
+    return match
+
+
+
+
+def time_per_call(call, repeats=QUERIES):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        call()
+    return (time.perf_counter() - start) * 1e6 / repeats
+
+
+
+
+def main():
+    with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+        matches = [("2v2 match", Match.new()), ("2v2 + 60 monsters", crowded_match(60))]
+
+    for label, match in matches:
+        unit = match.current_unit
+        rng = random.Random(0)
+        cells = [(rng.randrange(match.grid.size), rng.randrange(match.grid.size)) for _ in range(QUERIES)]
+        cursor = iter(cells * 2)
+        print(f"{label} ({len(match.units)} units)")
+        print(f"  {'unit_at':<32} {time_per_call(lambda: match.unit_at(*next(cursor))):8.2f} us")
+        for radius in (2, 8):
+            print(f"  {f'targets_in_range, radius {radius}':<32} "
+                  f"{time_per_call(lambda: match.targets_in_range(unit, radius), QUERIES // 4):8.2f} us")
+
+        unit.state = "move"
+        print(f"  {'legal_actions, move phase':<32} {time_per_call(match.legal_actions, QUERIES // 20):8.2f} us")
+        unit.state = "attack"
+        print(f"  {'legal_actions, attack phase':<32} {time_per_call(match.legal_actions, QUERIES // 20):8.2f} us")
+        unit.state = "move"
+
+    print("Random play, 2v2 + 60 monsters")
+    random.seed(0)
+    rng = random.Random(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        match = crowded_match(60)
+        played = 0
+        start = time.perf_counter()
+        while played < 20000 and match.winner() is None:
+            match.apply(rng.choice(match.legal_actions()))
+            played += 1
+        elapsed = time.perf_counter() - start
+    print(f"  {'random actions per second':<32} {played / elapsed:8.0f}")
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Pondering: frame rate of the render loop while the red computer thinks during blue's turns,
+and how long red's decisions take with pondering against a plain MCTS player searching on its turn.
+Blue is played by the scripted player, with 1.5 s of frames before each of its actions.
+"""
+import contextlib
+import io
+import random
+import time
+
+from benchmarks.common import start_match
+from game import Game
+from policies import MCTSPolicy, ScriptedPolicy
+
+HUMAN_FRAMES = 90  # Frames rendered before each blue action (1.5 s at 60 FPS)
+ACTIONS = 36
+
+
+
+
+def session(seat):
+    """
+    Play ACTIONS actions with red on `seat` ("mcts": pondering, "plain": MCTSPolicy in the game process).
+    :return: (frames per second while blue thinks, decision times of red in ms).
+    """
+    with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+        game = start_match(Game(seats={"red": "mcts"} if seat == "mcts" else None, throttle=False))
+        if seat == "plain":
+            game.ai_players["red"] = MCTSPolicy(workers=1)
+        ai = game.ai_players["red"]
+        if seat == "mcts":
+            ai.ponder(game)
+        human = ScriptedPolicy()
+        rng = random.Random(0)
+        frames = elapsed = 0
+        decisions = []
+        for _ in range(ACTIONS):
+            if game.current_unit.color == "blue":
+                start = time.perf_counter()
+                for _ in range(HUMAN_FRAMES):
+                    game.run_frame()
+                    game.scheduler.tick(True)
+                elapsed += time.perf_counter() - start
+                frames += HUMAN_FRAMES
+                game.apply(human.choose(game, rng))
+            else:
+                actions = game.legal_actions()
+                start = time.perf_counter()
+                action = ai.choose(game, rng)
+                if len(actions) > 1:
+                    decisions.append((time.perf_counter() - start) * 1000)
+                game.apply(action)
+        if seat == "mcts":
+            ai.close()
+    return frames / elapsed, sorted(decisions)
+
+
+
+
+def main():
+    print(f"Red computer against a scripted blue, {ACTIONS} actions")
+    for seat, label in (("plain", "MCTS on its turn"), ("mcts", "MCTS pondering")):
+        fps, decisions = session(seat)
+        print(f"  {label:<18} {fps:5.1f} FPS during blue's turns   red decisions: "
+              f"median {decisions[len(decisions) // 2]:6.1f} ms, max {decisions[-1]:6.1f} ms")
+
+
+
+
+if __name__ == "__main__":
+    main()
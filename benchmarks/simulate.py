@@ -0,0 +1,30 @@
+"""
+Scaling of the batch simulator: matches per second against the number of worker processes.
+Each match is independent, so throughput should grow with the worker count up to the number of cores.
+"""
+import multiprocessing
+import time
+
+from simulate import simulate
+
+
+
+
+def main(matches=120):
+    cores = multiprocessing.cpu_count()
+    counts = sorted({1, 2, cores, cores * 2})
+    print(f"Batch simulator, {matches} scripted matches ({cores} CPU core(s))")
+
+    baseline = None
+    for workers in counts:
+        start = time.perf_counter()
+        simulate(matches, workers=workers)
+        rate = matches / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"  {f'{workers} worker(s)':<32} {rate:8.1f} matches/s   x{rate / baseline:.2f}")
+
+
+
+
+if __name__ == "__main__":
+    main()
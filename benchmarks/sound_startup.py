@@ -0,0 +1,86 @@
+"""
+Startup time and memory of Game(): eager per-object sound decoding versus the shared lazy sound bank.
+Each measurement runs in a fresh interpreter so decoded clips and caches do not carry over.
+"""
+import subprocess
+import sys
+
+
+LEGACY = """
+import pygame
+from sounds import SOUND_FILES, MUSIC_FILES
+from game import Game
+from benchmarks.common import start_match
+pygame.mixer.init()
+# Previous behaviour: Game and the Pickup manager each built a Sounds() decoding every file,
+# and each of the 12 units created per match decoded its two movement clips
+for owner in range(2):
+    for name, path in {**SOUND_FILES, **MUSIC_FILES}.items():
+        if name not in ("moving", "water"):
+            try:
+                pygame.mixer.Sound(path)
+            except FileNotFoundError:
+                pass
+for unit in range(12):
+    pygame.mixer.Sound("sounds/moving.mp3")
+    pygame.mixer.Sound("sounds/water.mp3")
+start_match(Game(preload_sounds=False))
+"""
+
+LAZY = """
+from game import Game
+from benchmarks.common import start_match
+start_match(Game(preload_sounds=False))
+"""
+
+LAZY_PRELOADED = """
+from game import Game
+from benchmarks.common import start_match
+from sounds import sound_bank
+start_match(Game())
+sound_bank.preload_thread.join()
+"""
+
+MEASURE = """
+import os, time, resource
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+import pygame
+pygame.init()
+pygame.display.set_mode((1, 1))
+start = time.perf_counter()
+exec(compile({code!r}, "<scenario>", "exec"))
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+
+
+def measure(code):
+    """Return (seconds, peak RSS in MB) of running `code` in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE.format(code=code)],
+        capture_output=True, text=True, check=True,
+    ).stdout.strip().splitlines()[-1]
+    seconds, max_rss_kb = output.split()
+    return float(seconds), int(max_rss_kb) / 1024
+
+
+
+
+def main():
+    print("Sound loading at startup (time to a playable match, peak RSS)")
+    for label, code in (
+        ("before (eager Sounds() x2, 24 unit clips)", LEGACY),
+        ("after (lazy shared sound bank)", LAZY),
+        ("after, effects preloaded in background", LAZY_PRELOADED),
+    ):
+        seconds, rss = measure(code)
+        print(f"  {label:<44} {seconds * 1000:8.1f} ms   {rss:7.1f} MB")
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Rescaling work per frame for unit sprites, pickups and HUD icons, with and without the surface cache."""
+import pygame
+from benchmarks.common import setup_display, time_frames, report
+from cache import surface_cache
+from game import GRID_SIZE, CELL_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT, load_unit_images, load_pickups
+from interface import Pickup
+from unit import Unit
+
+
+
+
+class UnitFactory:
+    """Minimal stand-in for Game, which is what Unit.create_units expects as `self`."""
+    unit_images = load_unit_images()
+
+
+
+
+class PickupManager:
+    """Just the state Pickup.draw_pickups reads, without the manager's sound setup."""
+    def __init__(self, textures_file):
+        self.textures_file = textures_file
+        self.all_pickups = [Pickup(2 * i + 1, 1, name, 0) for i, name in enumerate(textures_file)]
+
+
+
+
+def main():
+    screen = setup_display(SCREEN_WIDTH, SCREEN_HEIGHT)
+    units = Unit.create_units(UnitFactory())
+    pickup_textures = load_pickups()
+    pickups = PickupManager(pickup_textures)
+    visible_tiles = {(x, y) for x in range(GRID_SIZE) for y in range(GRID_SIZE)}
+
+    def uncached_frame():
+        # Previous behaviour: rescale every source image on every frame
+        for unit in units:
+            screen.blit(pygame.transform.scale(unit.image, (CELL_SIZE, CELL_SIZE)), (unit.x * CELL_SIZE, unit.y * CELL_SIZE))
+            screen.blit(pygame.transform.scale(unit.image, (80, 80)), (0, 0))
+        for p in pickups.all_pickups:
+            screen.blit(pygame.transform.scale(pickup_textures[p.overlay], (CELL_SIZE/2, CELL_SIZE/2)), (p.x * CELL_SIZE, p.y * CELL_SIZE))
+
+    def cached_frame():
+        for unit in units:
+            screen.blit(surface_cache.get_scaled(unit.image, (CELL_SIZE, CELL_SIZE)), (unit.x * CELL_SIZE, unit.y * CELL_SIZE))
+            screen.blit(surface_cache.get_scaled(unit.image, (80, 80)), (0, 0))
+        for p in pickups.all_pickups:
+            screen.blit(surface_cache.get_scaled(pickup_textures[p.overlay], (CELL_SIZE/2, CELL_SIZE/2)), (p.x * CELL_SIZE, p.y * CELL_SIZE))
+
+    def game_frame():
+        # The real draw paths that go through the cache
+        for unit in units:
+            unit.draw(screen, is_current_turn=False)
+        Pickup.draw_pickups(pickups, screen, visible_tiles)
+
+    report("Sprite rescaling", [
+        ("before (transform.scale per blit)", time_frames(uncached_frame)),
+        ("after (shared surface cache)", time_frames(cached_frame)),
+    ])
+
+    # Steady state: a frame after warm-up must not rescale anything
+    game_frame()
+    surface_cache.reset_stats()
+    game_frame()
+    print("Steady-state frame:", surface_cache.stats())
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Frame time of attack-range highlighting: per-cell overlays versus pre-rendered diamonds and indicator frames."""
+import pygame
+from benchmarks.common import setup_display, time_frames, report
+from game import GRID_SIZE, CELL_SIZE, load_indicators
+from grid_search import diamond_cells
+from interface import range_overlays
+
+
+
+
+def legacy_targeting(screen, indicators, x, y, attack_range, aoe_range):
+    """Previous attack branch of highlight_range."""
+    overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+    for dx in range(-attack_range, attack_range + 1):
+        for dy in range(-attack_range, attack_range + 1):
+            cx, cy = x + dx, y + dy
+            if 0 <= cx < GRID_SIZE and 0 <= cy < GRID_SIZE and abs(dx) + abs(dy) <= attack_range:
+                overlay.fill((250, 0, 250, 50))
+                screen.blit(overlay, pygame.Rect(cx * CELL_SIZE, cy * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+    for dx in range(-aoe_range, aoe_range + 1):
+        for dy in range(-aoe_range, aoe_range + 1):
+            cx, cy = x + dx, y + dy
+            if 0 <= cx < GRID_SIZE and 0 <= cy < GRID_SIZE and abs(dx) + abs(dy) <= aoe_range:
+                beat_alpha = 180 + 70 * (pygame.time.get_ticks() % 1000 / 500 - 1)
+                indicator_size = int(CELL_SIZE) * 1.2
+                indicator_image = pygame.transform.scale(indicators["redsquare"], (indicator_size, indicator_size))
+                indicator_image.set_alpha(beat_alpha)
+                offset = (CELL_SIZE - indicator_size) // 2
+                screen.blit(indicator_image, (cx * CELL_SIZE + offset, cy * CELL_SIZE + offset))
+
+
+
+
+def cached_targeting(screen, indicators, x, y, attack_range, aoe_range):
+    range_overlays.draw_range(screen, x, y, attack_range, (250, 0, 250, 50))
+    indicator_image, offset = range_overlays.indicator_frame(indicators["redsquare"], pygame.time.get_ticks())
+    for cx, cy in diamond_cells(x, y, aoe_range, GRID_SIZE, GRID_SIZE):
+        screen.blit(indicator_image, (cx * CELL_SIZE + offset, cy * CELL_SIZE + offset))
+
+
+
+
+def main():
+    screen = setup_display(CELL_SIZE * GRID_SIZE, CELL_SIZE * GRID_SIZE)
+    indicators = load_indicators()
+    center = GRID_SIZE // 2
+
+    for attack_range, aoe_range in ((2, 0), (4, 1), (8, 2)):
+        report(f"Attack range {attack_range}, area of effect {aoe_range}", [
+            ("before (per-cell overlays)", time_frames(lambda: legacy_targeting(screen, indicators, center, center, attack_range, aoe_range))),
+            ("after (stencils + frames)", time_frames(lambda: cached_targeting(screen, indicators, center, center, attack_range, aoe_range))),
+        ])
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Frame time of Grid.draw: per-tile scaling versus the cached terrain layer."""
+from benchmarks.common import setup_display, time_frames, report
+from game import GRID_SIZE, CELL_SIZE, load_textures
+from interface import Grid
+
+
+
+
+def main():
+    screen = setup_display(CELL_SIZE * GRID_SIZE, CELL_SIZE * GRID_SIZE)
+    grid = Grid(GRID_SIZE, load_textures())
+
+    def per_tile_frame():
+        # Previous behaviour: every tile rescales and blits its textures
+        for row in grid.tiles:
+            for tile in row:
+                tile.draw_tile(screen)
+
+    def layer_frame():
+        grid.draw(screen)
+
+    def dirty_layer_frame():
+        # Worst case: the layer is invalidated every frame
+        grid.terrain_layer.mark_dirty()
+        grid.draw(screen)
+
+    report("Grid.draw", [
+        ("before (Tile.draw_tile x441)", time_frames(per_tile_frame)),
+        ("after (cached terrain layer)", time_frames(layer_frame)),
+        ("after, rebuilt every frame", time_frames(dirty_layer_frame, frames=50)),
+    ])
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Whole-map terrain queries with per-tile attribute access versus the NumPy masks of TerrainMap,
+on the real 21x21 map and on larger generated maps.
+"""
+import random
+import time
+
+from engine import Board, PickupState
+from terrain_map import TerrainMap
+
+REPEATS = 200
+
+
+
+
+class GeneratedBoard(Board):
+    """Square board with random terrain: 60% grass, 10% water, 30% rock, and 5% of the cells in bushes."""
+    def __init__(self, size, seed=0):
+        self.rng = random.Random(seed)
+        super().__init__(size)
+
+
+
+
+    def create_grid(self):
+        terrains = self.rng.choices(["grass", "water", "rock"], [6, 1, 3], k=self.size * self.size)
+        grid = [[self.make_tile(x, y, terrains[x * self.size + y]) for y in range(self.size)] for x in range(self.size)]
+        for column in grid:
+            for tile in column:
+                if self.rng.random() < 0.05:
+                    tile.overlay = "bush"
+        self.barrier_positions = {"blue": [], "red": []}
+        return grid
+
+
+
+
+def legacy_fog_cells(visible_tiles, size):
+    """Previous fog classification: fogged and edge cells found with set lookups, cell by cell."""
+    fogged, dim = [], []
+    for x in range(size):
+        for y in range(size):
+            if (x, y) not in visible_tiles:
+                fogged.append((x, y))
+            elif any((x + dx, y + dy) not in visible_tiles for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]):
+                dim.append((x, y))
+    return fogged, dim
+
+
+
+
+def array_fog_cells(visible_mask):
+    return ~visible_mask, TerrainMap.edges(visible_mask)
+
+
+
+
+def legacy_spawn(grid, allowed):
+    """Previous spawn location: random cells until one has an allowed terrain."""
+    while True:
+        x = random.randint(0, len(grid.tiles) - 1)
+        y = random.randint(0, len(grid.tiles[0]) - 1)
+        if grid.tiles[x][y].terrain in allowed:
+            return x, y
+
+
+
+
+def time_per_call(call, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        call()
+    return (time.perf_counter() - start) * 1e6 / repeats
+
+
+
+
+def main():
+    random.seed(0)
+    for label, board in [("21x21 map", Board()), ("100x100 generated map", GeneratedBoard(100)),
+                         ("400x400 generated map", GeneratedBoard(400))]:
+        size = board.size
+        terrain_map = board.terrain_map
+        search = board.search
+
+        # Team vision of a dozen scattered units, as update_fog_visibility builds it
+        rng = random.Random(0)
+        visible = set()
+        for _ in range(12):
+            visible.update(search.visible_from(rng.randrange(size), rng.randrange(size), 6))
+        visible_tiles = {search.position(index) for index in visible}
+        visible_mask = terrain_map.mask(visible)
+        units = [(rng.randrange(size), rng.randrange(size)) for _ in range(50)]
+        repeats = max(5, REPEATS * 441 // (size * size))
+        pickup = PickupState()
+        shown = visible_mask & ~terrain_map.bush  # Built once per vision change
+
+        print(f"{label} ({len(visible_tiles)} visible cells)")
+        print(f"  {'fog and edge cells, sets':<36} {time_per_call(lambda: legacy_fog_cells(visible_tiles, size), repeats):10.1f} us")
+        print(f"  {'fog and edge cells, masks':<36} {time_per_call(lambda: array_fog_cells(visible_mask), repeats):10.1f} us")
+        print(f"  {'50 enemies shown, tile lookups':<36} "
+              f"{time_per_call(lambda: [p in visible_tiles and board.tiles[p[0]][p[1]].overlay != 'bush' for p in units]):10.1f} us")
+        print(f"  {'50 enemies shown, shown mask':<36} {time_per_call(lambda: [shown[p] for p in units]):10.1f} us")
+        print(f"  {'shown mask rebuild':<36} {time_per_call(lambda: visible_mask & ~terrain_map.bush):10.1f} us")
+        print(f"  {'pickup spawn cell, rejection':<36} "
+              f"{time_per_call(lambda: legacy_spawn(board, pickup.allowed_tile_types), 5000):10.1f} us")
+        print(f"  {'pickup spawn cell, candidates':<36} "
+              f"{time_per_call(lambda: pickup.get_random_spawn_location(board), 5000):10.1f} us")
+
+
+
+
+if __name__ == "__main__":
+    main()
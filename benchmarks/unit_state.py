@@ -0,0 +1,108 @@
+"""
+Footprint and speed of the unit state: memory held by one headless match, unit turns per second
+of the between-turns upkeep, and the regeneration loop against the same update on NumPy columns.
+"""
+import contextlib
+import io
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from engine import Match
+from benchmarks.headless import play_random_match
+
+
+
+
+def match_memory(matches=50):
+    """Bytes allocated per match set up with Match.new(), averaged over `matches` live matches."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [Match.new() for _ in range(matches)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(kept)
+
+
+
+
+def unit_bytes(match):
+    """Size of the unit and ability objects themselves (instance plus attribute dict, if any)."""
+    import sys
+    total = 0
+    for unit in match.units:
+        for owner in [unit] + unit.abilities:
+            total += sys.getsizeof(owner) + (sys.getsizeof(owner.__dict__) if hasattr(owner, "__dict__") else 0)
+    return total
+
+
+
+
+def turns_per_second(turns=20000):
+    """Unit turns through end_turn(): cooldowns, buffs, vision, pickups, keys, regeneration and respawns."""
+    match = Match.new()
+    start = time.perf_counter()
+    for _ in range(turns):
+        match.current_unit.state = "done"
+        match.end_turn()
+    return turns / (time.perf_counter() - start)
+
+
+
+
+def regen_loop(units, repeats):
+    for _ in range(repeats):
+        for unit in units:
+            if unit.unit_type=="player":
+                unit.health+=min(unit.max_health-unit.health,int(0.005*unit.max_health))
+                unit.mana +=min(unit.max_mana-unit.mana,int(0.01*unit.max_mana))
+
+
+
+
+def regen_columns(health, max_health, mana, max_mana, players, repeats):
+    for _ in range(repeats):
+        health += np.where(players, np.minimum(max_health - health, (0.005 * max_health).astype(np.int32)), 0)
+        mana += np.where(players, np.minimum(max_mana - mana, (0.01 * max_mana).astype(np.int32)), 0)
+
+
+
+
+def main(repeats=20000):
+    random.seed(0)
+    with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+        memory = match_memory()
+        match = Match.new()
+        size = unit_bytes(match)
+        turns = turns_per_second()
+        start = time.perf_counter()
+        played = sum(play_random_match(random.Random(seed))[1] for seed in range(20))
+        actions = played / (time.perf_counter() - start)
+
+    units = match.units
+    start = time.perf_counter()
+    regen_loop(units, repeats)
+    loop = (time.perf_counter() - start) * 1e6 / repeats
+
+    columns = [np.array([getattr(unit, name) for unit in units], dtype=np.int32)
+               for name in ("health", "max_health", "mana", "max_mana")]
+    players = np.array([unit.unit_type == "player" for unit in units])
+    start = time.perf_counter()
+    regen_columns(*columns, players, repeats)
+    batched = (time.perf_counter() - start) * 1e6 / repeats
+
+    print(f"Unit state ({len(units)} units, {sum(len(unit.abilities) for unit in units)} abilities per match)")
+    print(f"  {'memory per match':<32} {memory / 1024:8.1f} KB")
+    print(f"  {'unit and ability objects':<32} {size / 1024:8.1f} KB")
+    print(f"  {'unit turns per second':<32} {turns:8.0f}")
+    print(f"  {'random actions per second':<32} {actions:8.0f}")
+    print(f"  {'regeneration, object loop':<32} {loop:8.2f} us")
+    print(f"  {'regeneration, NumPy columns':<32} {batched:8.2f} us")
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Team vision (Highlight.update_fog_visibility) for a 2v2 match: the same positions again, and
+units moving to new cells every call. Also the cost and size of a fully filled vision table.
+"""
+import contextlib
+import io
+import random
+import sys
+import time
+
+from engine import Match
+from interface import Highlight
+from grid_search import GridSearch
+
+CALLS = 5000
+
+
+
+
+class VisionState:
+    """The attributes Highlight.update_fog_visibility reads and writes on the Game it is called on."""
+    def __init__(self, match):
+        self.grid = match.grid
+        self.units = match.units
+        self.visible_tiles = set()
+        self.visible_bits = 0
+        self.visible_mask = self.shown_mask = match.grid.terrain_map.mask(())
+        self.fog_surface = None
+
+
+
+
+def time_per_call(call, calls=CALLS):
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+
+
+def main():
+    with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+        match = Match.new()
+    state = VisionState(match)
+    search = match.grid.search
+    team = [unit for unit in match.units if unit.color == "blue"]
+    open_cells = [search.position(i) for i in range(search.size) if search.traversable[i]]
+
+    print(f"Team vision, {len(team)} blue units")
+    print(f"  {'same positions':<32} {time_per_call(lambda: Highlight.update_fog_visibility(state, 'blue')):8.1f} us")
+
+    rng = random.Random(0)
+    def move_and_update():
+        for unit in team:
+            unit.x, unit.y = rng.choice(open_cells)
+        Highlight.update_fog_visibility(state, "blue")
+    print(f"  {'units on new cells':<32} {time_per_call(move_and_update):8.1f} us")
+
+    if hasattr(GridSearch, "vision_bits"):
+        radii = sorted({unit.move_range + 2 for unit in match.units if unit.unit_type == "player"})
+        fresh = GridSearch(search.width, search.height, search.traversable, search.move_cost)
+        fresh.vision = {}  # Not shared with the board above
+        start = time.perf_counter()
+        for x, y in open_cells:
+            for radius in radii:
+                fresh.vision_bits(x, y, radius)
+        elapsed = (time.perf_counter() - start) * 1000
+        size = sum(sys.getsizeof(bits) for bits in fresh.vision.values())
+        print(f"Vision table, {len(open_cells)} open cells x radii {radii}")
+        print(f"  {'fill time':<32} {elapsed:8.1f} ms")
+        print(f"  {'size':<32} {size / 1024:8.1f} KB")
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Zobrist hashing: the incremental update after every action against hashing the match from scratch,
+checked equal on every position of random matches, how many hashes different positions share
+(the table's check key tells those apart), and the transposition table's store and probe.
+"""
+import contextlib
+import io
+import random
+import time
+
+from engine import Match
+from zobrist import ZobristHash, TranspositionTable, EXACT
+
+CALLS = 2000
+
+
+
+
+def time_per_call(call, calls=CALLS):
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+
+
+def play(matches=10, seed=0):
+    """
+    Random matches with an attached hash.
+    :return: (positions, mismatches with a from-scratch hash, distinct hashes,
+              hashes shared by different positions, time in apply in us per action)
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+    positions = mismatches = 0
+    seen = {}  # Hash -> check key of the first position with it
+    shared = set()
+    elapsed = 0.0
+    for _ in range(matches):
+        match = Match.new()
+        match.zobrist = ZobristHash(match)
+        for _ in range(1500):
+            actions = match.legal_actions()
+            if not actions:
+                break
+            action = rng.choice(actions)
+            start = time.perf_counter()
+            match.apply(action)
+            elapsed += time.perf_counter() - start
+            positions += 1
+            mismatches += match.zobrist.value != ZobristHash.of(match)
+            if seen.setdefault(match.zobrist.value, match.zobrist.check) != match.zobrist.check:
+                shared.add(match.zobrist.value)
+    return positions, mismatches, len(seen), len(shared), elapsed * 1e6 / positions
+
+
+
+
+def main():
+    with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+        positions, mismatches, distinct, shared, with_hash = play()
+        match = Match.new()
+    zobrist = ZobristHash(match)
+
+    print(f"Zobrist hash ({positions} positions from random matches)")
+    print(f"  {'mismatches with a full rehash':<32} {mismatches}")
+    print(f"  {'distinct hashes':<32} {distinct}")
+    print(f"  {'hashes shared by other positions':<32} {shared}")
+    print(f"  {'apply() with the hash attached':<32} {with_hash:8.1f} us")
+    print(f"  {'update, nothing changed':<32} {time_per_call(lambda: zobrist.update(match)):8.1f} us")
+    unit = match.units[0]
+    def move_and_update():
+        unit.x ^= 1
+        zobrist.update(match)
+    print(f"  {'update, one unit moved':<32} {time_per_call(move_and_update):8.1f} us")
+    print(f"  {'hash from scratch':<32} {time_per_call(lambda: ZobristHash.of(match)):8.1f} us")
+
+    table = TranspositionTable(1 << 12)
+    rng = random.Random(1)
+    keys = [rng.getrandbits(64) for _ in range(CALLS * 4)]
+    start = time.perf_counter()
+    for depth, key in enumerate(keys):
+        table.store(key, depth % 5, 0, EXACT)
+    store = (time.perf_counter() - start) * 1e6 / len(keys)
+    start = time.perf_counter()
+    for key in keys:
+        table.probe(key)
+    probe = (time.perf_counter() - start) * 1e6 / len(keys)
+    print(f"Transposition table, {table.size} slots, {len(keys)} stores")
+    print(f"  {'store':<32} {store:8.2f} us")
+    print(f"  {'probe':<32} {probe:8.2f} us")
+    print(f"  {'entries kept':<32} {len(table):8d}")
+
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Compact encoding of a match for AI search. The map, team vision and unit occupancy are Python int
+bitboards over the cells (bit x * height + y, the flat index used by GridSearch), and the changing
+stats of every unit are packed in a tuple. A MatchState is immutable, so copying one is free, and
+restore() writes it back into the objects of a Match built from the same roster.
+"""
+from operator import attrgetter
+
+from engine import Match, create_units, assign_teams
+from occupancy import Occupancy
+from terrain_map import TERRAIN_CODES
+
+
+# Unit attributes that change during a match, in the order they are packed
+UNIT_FIELDS = (
+    "color", "x", "y", "initial_x", "initial_y", "alive", "move_range", "state", "target_x", "target_y",
+    "health", "max_health", "mana", "max_mana", "damage", "physical_defense", "magical_defense", "crit_chance",
+    "barrier_status", "red_keys", "blue_keys", "death_timer",
+    "buffed_damage_increase", "buffed_defense_increase", "debuffed_attack_reduction", "debuffed_defense_reduction",
+    "buff_duration", "debuff_duration", "is_buffed", "is_debuffed",
+)
+unit_fields = attrgetter(*UNIT_FIELDS)
+
+# Board layouts by (width, height, traversable cells), shared like the vision tables
+LAYOUTS = {}
+
+
+
+
+# Board Layout Class
+class BoardLayout:
+    """Bitboards of the parts of a map that never change: terrain, bushes, barrier walls, board edges."""
+    def __init__(self, board):
+        search = board.search
+        terrain_map = board.terrain_map
+        self.width = search.width
+        self.height = search.height
+        self.size = search.size
+        self.full = (1 << self.size) - 1
+
+        self.traversable = self.bits(i for i in range(self.size) if search.traversable[i])
+        self.water = self.bits((terrain_map.terrain == TERRAIN_CODES["water"]).ravel().nonzero()[0].tolist())
+        self.grass = self.traversable & ~self.water
+        self.bush = self.bits(terrain_map.bush.ravel().nonzero()[0].tolist())
+        self.barriers = {color: self.bits(x * self.height + y for x, y in positions)
+                         for color, positions in board.barrier_positions.items()}
+
+        # Cells on the first and last row (y), which have no neighbour below and above
+        self.first_row = self.bits(x * self.height for x in range(self.width))
+        self.last_row = self.bits(x * self.height + self.height - 1 for x in range(self.width))
+        self.diamonds = {}  # (flat index, radius) -> bits within that Manhattan distance
+
+
+
+
+    @classmethod
+    def of(cls, board):
+        """The layout of `board`, built once per terrain layout."""
+        search = board.search
+        key = (search.width, search.height, bytes(search.traversable))
+        layout = LAYOUTS.get(key)
+        if layout is None:
+            layout = LAYOUTS[key] = cls(board)
+        return layout
+
+
+
+
+    @staticmethod
+    def bits(indices):
+        bits = 0
+        for i in indices:
+            bits |= 1 << i
+        return bits
+
+
+
+
+    def cells(self, bits):
+        """(x, y) of every set bit, in flat index order."""
+        cells = []
+        while bits:
+            low = bits & -bits
+            cells.append(divmod(low.bit_length() - 1, self.height))
+            bits ^= low
+        return cells
+
+
+
+
+    def neighbors(self, bits):
+        """Cells with a 4-neighbour in `bits`."""
+        return (
+            ((bits << 1) & ~self.first_row)
+            | ((bits >> 1) & ~self.last_row)
+            | (bits << self.height)
+            | (bits >> self.height)
+        ) & self.full
+
+
+
+
+    def reachable(self, x, y, budget):
+        """Cells whose cheapest path from (x, y) costs at most `budget`, like GridSearch.reachable_from."""
+        start = 1 << (x * self.height + y)
+        if not self.traversable & start:
+            return 0
+        within = [start]  # within[c]: cells reachable for a cost of at most c
+        for cost in range(1, budget + 1):
+            grown = self.neighbors(within[cost - 1]) & self.grass  # Grass costs 1 to enter
+            if cost >= 2:
+                grown |= self.neighbors(within[cost - 2]) & self.water  # Water costs 2
+            within.append(within[cost - 1] | grown)
+        return within[budget]
+
+
+
+
+    def diamond(self, x, y, radius):
+        """Cells within Manhattan distance `radius` of (x, y)."""
+        key = (x * self.height + y, radius)
+        bits = self.diamonds.get(key)
+        if bits is None:
+            bits = self.diamonds[key] = self.bits(
+                (x + dx) * self.height + y + dy
+                for dx in range(-radius, radius + 1)
+                for dy in range(abs(dx) - radius, radius - abs(dx) + 1)
+                if 0 <= x + dx < self.width and 0 <= y + dy < self.height
+            )
+        return bits
+
+
+
+
+# Match State Class
+class MatchState:
+    """
+    Snapshot of a match. `units` holds one tuple per unit, in the match's order:
+    the UNIT_FIELDS values, then the selected ability index and the remaining cooldowns.
+    `occupancy` and `vision` map a color ("blue", "red", "neutral") to the bitboard
+    of its alive units' cells and (teams only) of the cells its units see.
+    """
+    __slots__ = ("layout", "blue", "red", "units", "occupancy", "vision", "barrier",
+                 "current_unit_index", "current_turn", "blue_barrier", "red_barrier",
+                 "pickups", "next_spawn_turns", "turn_count")
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+
+
+    @classmethod
+    def from_match(cls, match):
+        layout = BoardLayout.of(match.grid)
+        height = layout.height
+        search = match.grid.search
+        units = []
+        occupancy = {"blue": 0, "red": 0, "neutral": 0}
+        vision = {"blue": 0, "red": 0}
+
+        for unit in match.units:
+            selected = None if unit.selected_ability is None else unit.abilities.index(unit.selected_ability)
+            units.append(unit_fields(unit) + (selected, tuple(ability.remaining_cooldown for ability in unit.abilities)))
+            if unit.alive:
+                occupancy[unit.color] |= 1 << (unit.x * height + unit.y)
+                if unit.color in vision:
+                    vision[unit.color] |= search.vision_bits(unit.x, unit.y, unit.move_range + 2)
+
+        pickup = match.pickup
+        return cls(
+            layout=layout,
+            blue=tuple(unit.name for unit in match.units[:2]),
+            red=tuple(unit.name for unit in match.units[2:4]),
+            units=tuple(units),
+            occupancy=occupancy,
+            vision=vision,
+            barrier=(layout.barriers["blue"] if match.blue_barrier == "Up" else 0)
+                    | (layout.barriers["red"] if match.red_barrier == "Up" else 0),
+            current_unit_index=match.current_unit_index,
+            current_turn=match.current_turn,
+            blue_barrier=match.blue_barrier,
+            red_barrier=match.red_barrier,
+            pickups=tuple((p.x, p.y, p.overlay, p.spawn_turn) for p in pickup.all_pickups),
+            next_spawn_turns=tuple(pickup.next_spawn_turns.items()),
+            turn_count=pickup.turn_count,
+        )
+
+
+
+
+    def restore(self, match):
+        """Write this state back into `match`, whose units must come from the same roster in the same order."""
+        for unit, packed in zip(match.units, self.units):
+            for name, value in zip(UNIT_FIELDS, packed):
+                setattr(unit, name, value)
+            selected, cooldowns = packed[-2:]
+            unit.selected_ability = None if selected is None else unit.abilities[selected]
+            for ability, remaining in zip(unit.abilities, cooldowns):
+                ability.remaining_cooldown = remaining
+            unit.reachable_origin = None  # Recomputed on the next query
+
+        match.current_unit_index = self.current_unit_index
+        match.current_turn = self.current_turn
+        match.keys_initialized = True
+        for color in ("blue", "red"):
+            if getattr(match, f"{color}_barrier") != getattr(self, f"{color}_barrier"):
+                overlay = "barrier" if getattr(self, f"{color}_barrier") == "Up" else None
+                for x, y in match.grid.barrier_positions[color]:
+                    match.grid.set_overlay(x, y, overlay)
+        match.blue_barrier = self.blue_barrier
+        match.red_barrier = self.red_barrier
+
+        pickup = match.pickup
+        pickup.all_pickups = [type(pickup)(*fields) for fields in self.pickups]
+        pickup.next_spawn_turns = dict(self.next_spawn_turns)
+        pickup.turn_count = self.turn_count
+        match.occupancy = Occupancy(match.units)
+        if match.zobrist is not None:
+            match.zobrist.update(match)
+        return match
+
+
+
+
+    def to_match(self, match_class=Match):
+        """A new headless match in this state."""
+        match = match_class(assign_teams(create_units(), self.blue, self.red))
+        return self.restore(match)
+
+
+
+
+    # Bit queries
+
+    def occupied(self):
+        return self.occupancy["blue"] | self.occupancy["red"] | self.occupancy["neutral"]
+
+
+
+
+    def moves(self):
+        """Cells the current unit can finalize its move on, as Match.legal_actions lists them."""
+        index = self.current_unit_index
+        packed = self.units[index]
+        color, x, y, initial_x, initial_y, alive, move_range = packed[:7]
+        reach = self.layout.reachable(initial_x, initial_y, move_range)
+
+        # Cells held by another unit, except those where an enemy hides in a bush
+        height = self.layout.height
+        others = enemies = 0
+        for i, other in enumerate(self.units):
+            if i != index and other[5]:  # alive
+                cell = 1 << (other[1] * height + other[2])
+                others |= cell
+                if other[0] != color:
+                    enemies |= cell
+        return reach & ~(others & ~(self.layout.bush & enemies))
+
+
+
+
+    def hits(self, x, y, radius, color):
+        """Bitboard of the cells within `radius` of (x, y) holding an alive unit of `color`."""
+        return self.layout.diamond(x, y, radius) & self.occupancy[color]
+
+
+
+
+    def sees(self, color, x, y):
+        return bool(self.vision[color] >> (x * self.layout.height + y) & 1)
@@ -0,0 +1,186 @@
+import pygame
+from collections import OrderedDict
+
+
+# Memory budget for all cached scaled surfaces (in bytes)
+SURFACE_CACHE_BUDGET = 64 * 1024 * 1024
+
+
+# Surface Cache Class
+class SurfaceCache:
+    """
+    Shared cache of rescaled images, keyed by (source image, size, alpha).
+    Least recently used surfaces are evicted once the memory budget is exceeded.
+    """
+    def __init__(self, max_bytes=SURFACE_CACHE_BUDGET):
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()  # key -> scaled surface, oldest first
+        self.used_bytes = 0
+
+        # Counters to check that steady-state frames never rescale
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+
+
+    def get_scaled(self, image, size, alpha=None):
+        """
+        Return `image` scaled to `size`, rescaling only on a cache miss.
+        :param image: Source surface (the same object must be passed every time).
+        :param size: (width, height) of the result, floats are truncated like pygame does.
+        :param alpha: Optional per-surface alpha applied to the cached copy.
+        """
+        size = (int(size[0]), int(size[1]))
+        key = (image, size, alpha)
+
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = pygame.transform.scale(image, size)
+        if alpha is not None:
+            surface.set_alpha(alpha)
+        self.put(image, size, surface, alpha)
+        return surface
+
+
+
+
+    def put(self, image, size, surface, alpha=None):
+        """Store an already scaled copy of `image`, e.g. one read from the asset bundle."""
+        key = (image, (int(size[0]), int(size[1])), alpha)
+        previous = self.surfaces.pop(key, None)
+        if previous is not None:
+            self.used_bytes -= self.surface_bytes(previous)
+        self.surfaces[key] = surface
+        self.used_bytes += self.surface_bytes(surface)
+        self.evict()
+
+
+
+
+    def evict(self):
+        """Drop least recently used surfaces until the cache fits its budget."""
+        while self.used_bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, surface = self.surfaces.popitem(last=False)
+            self.used_bytes -= self.surface_bytes(surface)
+            self.evictions += 1
+
+
+
+
+    def clear(self):
+        """Empty the cache (counters are kept)."""
+        self.surfaces.clear()
+        self.used_bytes = 0
+
+
+
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+
+
+    def stats(self):
+        """Return the hit/miss counters and current memory use."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.surfaces),
+            "used_bytes": self.used_bytes,
+        }
+
+
+
+
+    @staticmethod
+    def surface_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+
+
+# Cache shared by every draw path
+surface_cache = SurfaceCache()
+
+
+
+
+# Font Cache Class
+class FontCache:
+    """
+    Loads each (face, size) font once and keeps rendered text surfaces,
+    keyed by (font, text, color, antialias), so static labels are only rasterized once.
+    """
+    def __init__(self, max_texts=512):
+        self.fonts = {}  # (face, size) -> pygame.font.Font
+        self.texts = OrderedDict()  # (font, text, color, antialias) -> surface, oldest first
+        self.max_texts = max_texts
+
+        self.hits = 0
+        self.misses = 0
+
+
+
+
+    def get_font(self, face, size):
+        """
+        Return the font for `face` (a font file path, or None for pygame's default font) at `size`.
+        """
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(face, size)
+            self.fonts[key] = font
+        return font
+
+
+
+
+    def render(self, font, text, antialias, color):
+        """
+        Same as font.render(text, antialias, color) but cached.
+        The returned surface is shared: callers that call set_alpha on it must do so before every blit.
+        """
+        key = (font, text, tuple(color), antialias)
+
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.texts.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.texts[key] = surface
+        if len(self.texts) > self.max_texts:
+            self.texts.popitem(last=False)
+        return surface
+
+
+
+
+    def stats(self):
+        """Return the hit/miss counters and cache sizes."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "fonts": len(self.fonts),
+            "texts": len(self.texts),
+        }
+
+
+
+
+# Font and text cache shared by every draw path
+font_cache = FontCache()
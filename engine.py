@@ -0,0 +1,1125 @@
+"""
+Rules of League on Budget without pygame: the map, unit state, pickups and turn resolution.
+The pygame front end (Game, Grid, Unit, Pickup) builds on these classes and drives a Match
+through the same actions, so whole matches can also run headless.
+"""
+import random
+from grid_search import GridSearch
+from occupancy import Occupancy
+from terrain_map import TerrainMap
+
+
+# Constants
+GRID_SIZE = 21
+
+# Map layout
+LAKES = [
+    [(5, 5), (5, 6), (6, 5), (6, 6), (7, 6)],
+    [(10, 7), (11, 6), (11, 7), (12, 6),(12,7)],
+    [(8, 13),(9, 13), (8, 14), (9, 14), (10, 13)],
+    [(13, 14), (14, 14), (14, 15), (15, 14), (15, 15)],
+]
+HILLS = [
+    [(2, 4), (2, 5), (2, 6),(2,12), (3, 3),(3, 4), (3, 5),(3,6),(3,10),(3,11),(3,12),
+    (3,13),(3,14),(4, 3), (5, 3),(5,8),(5,10),(5,12),(6,3),(6, 8), (6, 9),
+    (6,10),(6,12),(6,13),(6,17),(7,8),(7,12),(7,16),(7,17),(8,11),(8,15),(8,16),(8,17),
+    (9, 3), (9, 8), (9, 12), (9, 16), (9, 17),(10,2),(10,3),(10,8),(10,12),(10,17),(10,18),
+    (11,3),(11,4),(11,8),(11,12),(11,17),(12,3),(12,4),(12,5),(12,9),(13,3),(13,4),(13,8),(13,12),
+    (14,3),(14,7),(14,8),(14,10),(14,11),(14,12),(14,17),(15,8),(15,10),(15,12),(15,17),(16,17),
+    (17,6),(17,7),(17,8),(17,9),(17,10),(17,14),(17,15),(17,16),(17,17),
+    (18,8),(18,14),(18,15),(18,16),
+    ]
+]
+BUSHES = [(0, 0), (1, 0), (0, 1), (20, 20), (19, 20), (20, 19), (3, 7), (3, 8), (8, 3), (17, 12), (17, 13), (12, 17)]
+
+# Barrier walls around each team's Nexus
+BARRIER_POSITIONS = {
+    "blue": [(0, 17), (1, 17), (2, 17), (3, 17), (3, 18), (3, 19), (3, 20)],
+    "red": [(17, 0), (17, 1), (17, 2), (17, 3), (18, 3), (19, 3), (20, 3)],
+}
+
+# Where the two players of each team start, and respawn, in selection order
+TEAM_POSITIONS = {"blue": [(3, 15), (4, 16)], "red": [(15, 2), (17, 4)]}
+
+# Image file of each unit, used by the front end
+UNIT_IMAGES = {
+    "ashe": "assets/ashe.png",
+    "garen": "assets/garen.png",
+    "darius": "assets/darius.png",
+    "soraka": "assets/soraka.png",
+    "rengar": "assets/rengar.png",
+    "bluebuff": "assets/BlueBuff.png",
+    "redbuff": "assets/RedBuff.png",
+    "bigbuff": "assets/BigBuff.png",
+    "baseblue": "assets/Nexus_Blue.png",
+    "basered": "assets/Nexus_Red.png"
+}
+
+
+
+
+# Tile State Class
+class TileState:
+    """Terrain of a single cell."""
+    __slots__ = ("x", "y", "terrain", "overlay", "traversable", "move_cost")  # 441 per board, no per-tile dict
+
+    def __init__(self, x, y, terrain, overlay=None):
+        self.x = x
+        self.y = y
+        self.terrain = terrain  # "grass", "water", or "rock"
+        self.overlay = overlay  # Optional overlay: "bush", "barrier"
+        self.traversable = terrain in ["grass", "water"]  # Grass and water are traversable
+
+        # Assign move cost based on terrain type
+        self.move_cost = {"grass": 1, "water": 2, "rock": float("inf")}[terrain]
+
+
+
+
+# Board Class
+class Board:
+    """The map: tiles, barrier walls and the search tables used for movement and vision."""
+    def __init__(self, size=GRID_SIZE):
+        self.size = size
+        self.tiles = self.create_grid()
+        self.search = GridSearch.from_grid(self)  # Flat-index BFS tables for vision and movement
+        self.terrain_map = TerrainMap.from_grid(self)  # NumPy masks for whole-map queries
+
+
+
+
+    def make_tile(self, x, y, terrain):
+        return TileState(x, y, terrain)
+
+
+
+
+    def create_grid(self):
+        """Create the grid with predefined terrain and overlays."""
+        grid = [[self.make_tile(x, y, "grass") for y in range(self.size)] for x in range(self.size)]
+
+        # Add water (lakes)
+        for lake in LAKES:
+            for x, y in lake:
+                grid[x][y] = self.make_tile(x, y, "water")
+
+        # Add rocks (hills)
+        for hill in HILLS:
+            for x, y in hill:
+                grid[x][y] = self.make_tile(x, y, "rock")
+
+        self.barrier_positions = {color: list(positions) for color, positions in BARRIER_POSITIONS.items()}
+
+        # Add overlays (bushes, barriers)
+        overlays = {
+            "bush": BUSHES,
+            "barrier": self.barrier_positions["blue"] + self.barrier_positions["red"],
+        }
+        for overlay_type, positions in overlays.items():
+            for x, y in positions:
+                grid[x][y].overlay = overlay_type
+
+        return grid
+
+
+
+
+    def set_overlay(self, x, y, overlay):
+        self.tiles[x][y].overlay = overlay
+        self.terrain_map.set_overlay(x, y, overlay)
+
+
+
+
+    def remove_barrier(self, team_color):
+        """Take down the barrier wall protecting the given team's Nexus."""
+        for x, y in self.barrier_positions[team_color]:
+            self.set_overlay(x, y, None)
+
+
+
+
+# Unit State Class
+class UnitState:
+    """Stats and rules of a single unit."""
+    # Fixed attribute layout: smaller units and faster attribute access than a per-instance dict
+    __slots__ = (
+        "x", "y", "initial_x", "initial_y", "name", "image_path", "color",
+        "health", "max_health", "physical_defense", "magical_defense", "damage", "crit_chance",
+        "mana", "max_mana", "move_range", "attack_range", "unit_type", "barrier_status",
+        "alive", "state", "reachable_tiles", "reachable_origin", "selected_ability", "target_x", "target_y", "abilities",
+        "buffed_damage_increase", "buffed_defense_increase", "debuffed_attack_reduction", "debuffed_defense_reduction",
+        "buff_duration", "debuff_duration", "is_buffed", "is_debuffed",
+        "red_keys", "blue_keys", "death_timer", "last_damage_time", "damage_taken", "damage_taken_type",
+    )
+
+    def __init__(self, x, y, name, health, damage,physical_defense,magical_defense,crit_chance,image_path, color, move_range, attack_range, unit_type, mana=100, abilities=None, barrier_status=None):
+        self.x = x
+        self.y = y
+        self.initial_x = x  # Initial position for movement range
+        self.initial_y = y
+        self.name = name
+        self.image_path = image_path  # Only read by the front end
+        self.color = color
+        self.health = health
+        self.max_health = health
+        self.physical_defense=physical_defense
+        self.magical_defense=magical_defense
+        self.damage=damage
+        self.crit_chance=crit_chance
+        self.mana = mana
+        self.max_mana = mana
+        self.move_range = move_range
+        self.attack_range = attack_range
+        self.unit_type=unit_type   #player or monster or base
+        self.barrier_status = barrier_status  # "Up" or "Down" for bases
+        self.alive = True
+        self.state = "move"  # "move", "attack" or "done"
+        self.reachable_tiles = set()  # Cells this unit can move to during its move phase
+        self.reachable_origin = None  # (initial_x, initial_y, move_range) reachable_tiles was computed for
+        self.selected_ability = None  # Currently selected ability
+
+        # Attack targeting cursor
+        self.target_x = x
+        self.target_y = y
+        self.abilities = abilities if abilities else []  # Default to an empty list if no abilities are provided
+
+
+        # Buff and debuff trackers
+        self.buffed_damage_increase = 0
+        self.buffed_defense_increase = 0
+        self.debuffed_attack_reduction = 0
+        self.debuffed_defense_reduction = 0
+        self.buff_duration = 0
+        self.debuff_duration = 0
+        self.is_buffed = False
+        self.is_debuffed = False
+
+        # Add key variables
+        self.red_keys = 0  # Number of red keys this unit holds
+        self.blue_keys = 0  # Number of blue keys this unit holds
+
+        self.death_timer = 0  # Tracks turns since death
+
+        # Last hit taken, for the damage numbers
+        self.last_damage_time = None
+        self.damage_taken = 0
+        self.damage_taken_type="physical"
+
+
+
+
+    def now(self):
+        """Timestamp stored with the last hit taken; the headless rules have no clock."""
+        return None
+
+
+
+
+    def in_range(self, target):
+        """Check if the target is within attack range."""
+        return abs(self.x - target.x) + abs(self.y - target.y) <= self.attack_range
+
+
+
+
+    def update_reachable_tiles(self, grid):
+        """
+        Return the cells reachable from the turn's starting position, weighted by terrain cost.
+        The set is computed once when the unit enters its move phase and reused until
+        its starting position or move range changes.
+        """
+        origin = (self.initial_x, self.initial_y, self.move_range)
+        if origin != self.reachable_origin:
+            search = grid.search
+            self.reachable_tiles = {
+                search.position(index)
+                for index in search.reachable_from(self.initial_x, self.initial_y, self.move_range)
+            }
+            self.reachable_origin = origin
+        return self.reachable_tiles
+
+
+
+
+    def move(self, dx, dy, grid):
+        """
+        Move the unit if the new cell is within its movement range for this turn.
+        :return: True if the unit moved.
+        """
+        new_x = self.x + dx
+        new_y = self.y + dy
+
+        # Check if the current position is within grid bounds
+        if 0 <= new_x < len(grid.tiles) and 0 <= new_y < len(grid.tiles[0]):
+
+            # Check if the target tile is reachable this turn
+            if (new_x, new_y) not in self.update_reachable_tiles(grid):
+                print(f"Cannot move to ({new_x}, {new_y}) because it's out of movement range.")
+                return False  # Can't move if the tile is not reachable
+
+            self.x, self.y = new_x, new_y
+            return True
+        return False
+
+
+
+
+    def react_to_attack(self, attacker):
+        """Neutral monsters strike back at attackers in their range."""
+        if self.unit_type == "monster" and self.alive:
+            if self.in_range(attacker):
+                self.attack(attacker,self.damage)
+
+
+
+
+    def attack(self, target,damage,damage_type="physical"):
+        multiplyer=1
+        #check if it's a damage ability a
+        if random.randint(1, 100) <= self.crit_chance and damage>0:
+            multiplyer = 2  # Double the damage for critical hit
+        print(f"{self.name} attacks {target.name}!")
+
+
+        if damage>0:
+            if damage_type=="physical":
+                damage_after_def=int(damage*multiplyer*(1-target.physical_defense/(target.physical_defense+100))) #reduce damage with defesnse
+            elif damage_type=="magical":
+                damage_after_def=int(damage*multiplyer*(1-target.magical_defense/(target.magical_defense+100))) #reduce damage with defesnse
+        else:
+            damage_after_def=damage
+
+        if target.unit_type=="base" and target.barrier_status=="Up":
+            damage_after_def=0
+        target.health -= damage_after_def
+        target.damage_taken = damage_after_def
+        target.damage_taken_type=damage_type
+        target.last_damage_time = target.now()
+        if target.health <= 0:
+            target.health = 0
+            target.alive = False
+        target.react_to_attack(self)  # Trigger monster reaction
+        return damage_after_def
+
+
+
+
+    def update_buffs_and_debuffs(self):
+            # Handle buffs
+            if self.buff_duration > 0:
+                self.buff_duration -= 1
+                if self.buff_duration == 0:
+                    print(f"{self.name}'s buff has expired.")
+                    self.revert_buff()
+
+            # Handle debuffs
+            if self.debuff_duration > 0:
+                self.debuff_duration -= 1
+                if self.debuff_duration == 0:
+                    print(f"{self.name}'s debuff has expired.")
+                    self.revert_debuff()
+
+
+
+
+    def revert_buff(self):
+        # Revert buff effects
+        self.damage -= self.buffed_damage_increase
+        self.physical_defense -= self.buffed_defense_increase
+        self.magical_defense -= self.buffed_defense_increase
+        self.buffed_damage_increase = 0
+        self.buffed_defense_increase = 0
+        self.is_buffed = False
+        print(f"{self.name}'s stats after buff ended: Damage: {self.damage}, Defense: {self.physical_defense } and {self.physical_defense} ")
+
+
+
+
+    def revert_debuff(self):
+        # Revert debuff effects
+        self.damage += self.debuffed_attack_reduction
+        self.physical_defense += self.debuffed_defense_reduction
+        self.magical_defense += self.debuffed_defense_reduction
+        self.debuffed_attack_reduction = 0
+        self.debuffed_defense_reduction = 0
+        self.is_debuffed = False
+        print(f"{self.name}'s stats after debuff ended: Damage: {self.damage}, Defense: {self.physical_defense } and {self.physical_defense} ")
+
+
+
+
+def create_units(unit_images=UNIT_IMAGES, unit_class=UnitState, monster_class=UnitState, base_class=UnitState):
+    """
+    Create every unit of a match: the five champions (not on a team yet), the neutral monsters and the two bases.
+    :param unit_class: Class of the champions, and likewise `monster_class` and `base_class`.
+    """
+    from abilities import DamageHealAbility,BuffAbility,DebuffAbility
+    return [
+        unit_class(3,15, "Garen", 900, 80,50,50,20, unit_images["garen"], None,3,2,"player", mana=220, abilities=[
+            DamageHealAbility("Slash", 30, 5, "damage", attack=90, description="A quick slash attack.",attack_radius=4,is_aoe=1,damage_type="magical"),
+            BuffAbility("Fortify", 20, 14, defense=50, description="Increases defense temporarily for 3 turns.",attack_radius=8),
+            DamageHealAbility("Charge", 40, 8, "damage", attack=300, description="A powerful charging attack that stuns the target.",attack_radius=2),
+        ]),
+        unit_class(4,16, "Ashe", 500, 120,10,30,50 ,unit_images["ashe"], None,4,3,"player", mana=150, abilities=[
+            DamageHealAbility("Arrow Shot", 20, 5, "damage", attack=150, description="Shoots an arrow at the target."),
+            DebuffAbility("Frost Arrow", 30, 10, attack=20, defense=10, description="Slows and weakens the target.",attack_radius=5),
+            BuffAbility("Healing Wind", 50, 15, defense=20, description="Restores health to an ally and grants temporary defense.",attack_radius=3),
+        ]),
+        unit_class(15,3, "Darius",700, 90,50,50,50,unit_images["darius"], None,3,2,"player", mana=120, abilities=[
+            DamageHealAbility("Decimate", 50, 7, "damage", attack=250, description="Spins his axe, dealing damage to nearby enemies."),
+            DebuffAbility("Crippling Strike", 40, 8, attack=30, defense=10, description="A heavy strike that slows and weakens the target."),
+            DamageHealAbility("Noxian Guillotine", 80, 15, "damage", attack=400, description="Executes an enemy with low health."),
+        ]),
+        unit_class(16,4, "Soraka",490, 50 ,50,33,50,unit_images["soraka"], None,4,3,"player", mana=250, abilities=[
+            DamageHealAbility("Starcall", 30, 5, "damage", attack=50, description="Calls a star down, dealing magic damage.",is_aoe=2,damage_type="magical"),
+            DamageHealAbility("Astral Infusion", 40, 8, "heal", attack=100, description="Sacrifices own health to heal an ally."),
+            BuffAbility("Wish", 100, 20, defense=30, description="Restores health to all allies and grants defense for 3 turns."),
+        ]),
+        unit_class(0,0, "Rengar",500, 190 ,0,0,50,unit_images["rengar"], None,4,1,"player", mana=150, abilities=[
+            DamageHealAbility("Savagery", 50, 5, "damage", attack=300, description="Empowered strike dealing extra damage.",attack_radius=4),
+            BuffAbility("Battle Roar", 40, 8, defense=40, description="Boosts defense and regenerates health."),
+            DebuffAbility("Thrill of the Hunt", 80, 20, attack=20, description="Tracks the enemy, reducing their attack temporarily."),
+        ]),
+
+
+        monster_class(11, 19, "BigBuff",1000, 50 ,0,0,0,unit_images["bigbuff"], "neutral",3,2,"monster"),  #neutral monster
+        monster_class(9, 1, "BigBuff",1000, 50 ,0,0,0,unit_images["bigbuff"], "neutral",3,2,"monster"),  #neutral monster
+        monster_class(10, 10, "BigBuff",1000, 50 ,0,0,0,unit_images["bigbuff"], "neutral",3,2,"monster"),  #neutral monster
+        monster_class(5 ,7, "BlueBuff",390, 150 ,20,30,0,unit_images["bluebuff"], "neutral",3,2,"monster"),  #neutral monster
+        monster_class(15, 13, "RedBuff",390, 150 ,30,0,0,unit_images["redbuff"], "neutral",3,2,"monster"), #neutral monster
+
+        base_class(1, 19, "NexusBlue",2500, 50,0 ,0,0,unit_images["baseblue"], "blue",0,0,"base",barrier_status="Up"),  #Blue team base
+        base_class(19, 1, "NexusRed",2500, 50,0 ,0,0,unit_images["basered"], "red",0,0,"base",barrier_status="Up"), #Red team base
+   ]
+
+
+
+
+def assign_teams(all_units, blue, red):
+    """
+    Put the named champions on their teams at their starting positions, the way the selection menu does.
+    :return: The match's units in turn order: blue team, red team, monsters, bases.
+    """
+    players = {unit.name: unit for unit in all_units if unit.unit_type == "player"}
+    teams = {"blue": [players[name] for name in blue], "red": [players[name] for name in red]}
+    for color, team in teams.items():
+        for unit, (x, y) in zip(team, TEAM_POSITIONS[color]):
+            unit.color = color
+            unit.x, unit.y = unit.initial_x, unit.initial_y = x, y
+
+    monsters = [unit for unit in all_units if unit.unit_type == "monster"]
+    bases = [unit for unit in all_units if unit.unit_type == "base"]
+    return teams["blue"] + teams["red"] + monsters + bases
+
+
+
+
+# Pickup State Class
+class PickupState:
+    """
+    Potions lying on the map. The instance held by the match is the manager
+    (created without arguments); every potion on the map is an instance too.
+    """
+    def __init__(self, x=None, y=None, overlay=None, spawn_turn=None):
+        if x is None and y is None and overlay is None and spawn_turn is None:
+            # This is the manager instance
+            self.all_pickups = []
+            self.turn_count = 0
+            self.allowed_tile_types = ["grass", "water"]
+
+            self.pickup_types = {
+                "red_potion":   {"rarity": 0.8},
+                "blue_potion":  {"rarity": 0.8},
+                "green_potion": {"rarity": 0.3},
+                "golden_potion":{"rarity": 0.2},
+                "black_potion": {"rarity": 0.2},
+            }
+
+            self.next_spawn_turns = {}
+        else:
+            # This is a pickup item instance
+            self.x = x
+            self.y = y
+            self.overlay = overlay
+            self.spawn_turn = spawn_turn
+            self.picked = False
+
+
+
+
+    def initialize(self):
+        """Set the first spawn attempt of each pickup type."""
+        for p_type in self.pickup_types:
+            self.next_spawn_turns[p_type] = random.randint(5, 8)
+
+
+
+
+    def update(self, turn_count, grid):
+        """Update all pickups and attempt spawns each turn (manager only)."""
+        self.turn_count = turn_count
+
+        # Remove pickups that have stayed 15 turns without being picked
+        for p in self.all_pickups[:]:
+            if not p.picked and (self.turn_count - p.spawn_turn >= 15):
+                self.remove_pickup(p)
+
+        # Attempt to spawn each pickup type if it's time
+        for p_type, config in self.pickup_types.items():
+            if self.turn_count >= self.next_spawn_turns[p_type]:
+                if len(self.all_pickups) < 10:
+                    # Check rarity
+                    if random.random() < config["rarity"]:
+                        x, y = self.get_random_spawn_location(grid)
+                        self.spawn_single_pickup(x, y, p_type, self.turn_count)
+                    else:
+                        # Not spawned this turn, try again soon
+                        self.next_spawn_turns[p_type] = self.turn_count + random.randint(1, 3)
+
+
+
+
+    def spawn_single_pickup(self, x, y, overlay, spawn_turn):
+        """Create and store a single pickup item instance."""
+        new_pickup = type(self)(x, y, overlay, spawn_turn)
+        self.all_pickups.append(new_pickup)
+
+
+
+
+    def picked_used(self, unit, pickup):
+        """Apply the effect of this pickup to the unit and remove it (manager only)."""
+        if not pickup.picked:
+            if pickup.overlay == "red_potion":    #heals 30% missing health
+                heal_amount = int((unit.max_health-unit.health )* 0.3)
+                unit.attack(unit, -heal_amount)
+            elif pickup.overlay == "blue_potion": #full mana regeneration
+                unit.mana = unit.max_mana
+            elif pickup.overlay == "green_potion": #100 increase of max health and heal for 33% missing health
+                increase = 100
+                unit.max_health += increase
+                heal_amount = (unit.max_health - unit.health)//3
+                unit.attack(unit, -heal_amount)
+            elif pickup.overlay == "golden_potion": #reduces remaining cooldowns by 50%
+                for ability in unit.abilities:
+                    ability.remaining_cooldown //= 2
+            elif pickup.overlay == "black_potion": # permanently increases the critical chance
+                for ability in unit.abilities:
+                    unit.crit_chance += 5
+
+        #mark as picked and remove
+        pickup.picked = True
+        self.remove_pickup(pickup)
+
+
+
+
+    def remove_pickup(self, pickup):
+        """Remove a pickup and schedule next spawn attempt (manager only)."""
+        if pickup in self.all_pickups:
+            self.all_pickups.remove(pickup)
+        delay = random.randint(15, 20)
+        self.next_spawn_turns[pickup.overlay] = self.turn_count + delay
+
+
+
+
+    def get_random_spawn_location(self, grid):
+        """Get a random allowed cell for spawning."""
+        index = random.choice(grid.terrain_map.cells_of(self.allowed_tile_types))
+        return divmod(int(index), grid.terrain_map.height)
+
+
+
+
+# Match Class
+class Match:
+    """
+    Turn resolution of one match. Players act through apply(action), with actions being tuples:
+
+    - ("step", dx, dy): move the unit one cell (move phase) or the target cursor (attack phase)
+    - ("confirm",): finalize the move, or fire the selected ability / basic attack at the cursor
+    - ("select", index) and ("cancel",): choose an ability or go back to the basic attack
+    - ("end_turn",): once the unit is done, hand over to the next unit
+    - ("move_to", x, y), ("attack", x, y), ("ability", index, x, y): a whole phase in one action
+
+    legal_actions() lists the whole-phase actions available to the current unit.
+    The hooks (log_event, play_sound, on_monster_killed, update_vision) do nothing here;
+    the pygame front end overrides them.
+    """
+    def __init__(self, units=None, grid=None, pickup=None):
+        self.grid = grid if grid is not None else Board()
+        self.units = units if units is not None else []
+        self.pickup = pickup if pickup is not None else PickupState()
+        self.occupancy = Occupancy(self.units)  # Units by cell, rebuilt by start()
+        self.current_unit_index = 0
+        self.current_turn=1
+        self.event_log = []
+        self.zobrist = None  # Optional ZobristHash (zobrist.py), kept up to date by apply()
+
+        #barrier status
+        self.blue_barrier="Up"
+        self.red_barrier="Up"
+        self.keys_initialized = False
+
+
+
+
+    @classmethod
+    def new(cls, blue=("Garen", "Ashe"), red=("Darius", "Soraka")):
+        """Headless 2v2 match between the named champions, ready for its first action."""
+        match = cls(assign_teams(create_units(), blue, red))
+        match.pickup.initialize()
+        match.start()
+        return match
+
+
+
+
+    def start(self):
+        """Hand out the starting keys and open the first unit's turn."""
+        self.occupancy = Occupancy(self.units)  # The front end picks its units after __init__
+        self.manage_keys()  # Initializes keys
+        self.units[self.current_unit_index].update_reachable_tiles(self.grid)
+        self.update_vision(self.units[self.current_unit_index].color)
+
+
+
+
+    # Hooks for the front end
+
+    def log_event(self, message):
+        """Add an event to the event log."""
+        self.event_log.append(message)
+        if len(self.event_log) > 10:  # Limit the log to the last 10 events
+            self.event_log.pop(0)
+
+
+
+
+    def play_sound(self, name):
+        return
+
+
+
+
+    def on_monster_killed(self, monster, message):
+        return
+
+
+
+
+    def update_vision(self, team_color):
+        return
+
+
+
+
+    # State
+
+    @property
+    def current_unit(self):
+        return self.units[self.current_unit_index]
+
+
+
+
+    def winner(self):
+        """Color of the team whose opponents' Nexus is destroyed, None while the match goes on."""
+        for unit in self.units:
+            if unit.unit_type=="base" and unit.health <= 0:
+                return "red" if unit.color == "blue" else "blue"
+        return None
+
+
+
+
+    def unit_at(self, x, y):
+        """The alive unit on (x, y), if any."""
+        return self.occupancy.at(x, y)
+
+
+
+
+    # Actions
+
+    def apply(self, action):
+        """
+        Play one action for the current unit.
+        :return: True if it was carried out.
+        """
+        done = self.play(action)
+        if self.zobrist is not None:  # Failed actions can still have moved the unit
+            self.zobrist.update(self)
+        return done
+
+
+
+
+    def play(self, action):
+        """Hand `action` to the method that carries it out."""
+        kind = action[0]
+        if kind == "step":
+            return self.step(action[1], action[2])
+        if kind == "confirm":
+            return self.confirm()
+        if kind == "select":
+            return self.select_ability(action[1])
+        if kind == "cancel":
+            return self.select_ability(None)
+        if kind == "end_turn":
+            return self.end_turn()
+        if kind == "move_to":
+            return self.move_to(action[1], action[2])
+        if kind == "attack":
+            return self.select_ability(None) and self.aim(action[1], action[2]) and self.confirm()
+        if kind == "ability":
+            return self.select_ability(action[1]) and self.aim(action[2], action[3]) and self.confirm()
+        raise ValueError(f"Unknown action {action!r}")
+
+
+
+
+    def phase_action(self, action):
+        """
+        The whole-phase action that `action` completes if it succeeds, as legal_actions() lists them:
+        a confirm is the move_to, attack or ability at the unit's cell or cursor. None for steps and selections.
+        """
+        kind = action[0]
+        if kind in ("move_to", "attack", "ability", "end_turn"):
+            return tuple(action)
+        current_unit = self.current_unit
+        if kind != "confirm" or current_unit.state not in ("move", "attack"):
+            return None
+        if current_unit.state == "move":
+            return ("move_to", current_unit.x, current_unit.y)
+        if current_unit.selected_ability is None:
+            return ("attack", current_unit.target_x, current_unit.target_y)
+        index = current_unit.abilities.index(current_unit.selected_ability)
+        return ("ability", index, current_unit.target_x, current_unit.target_y)
+
+
+
+
+    def step(self, dx, dy):
+        """Move the current unit (move phase) or its target cursor (attack phase) by one cell."""
+        current_unit = self.current_unit
+        if current_unit.state == "move":
+            moved = current_unit.move(dx, dy, self.grid)
+            if moved:
+                self.occupancy.place(current_unit)
+            return moved
+        if current_unit.state == "attack":
+            new_target_x = min(max(current_unit.target_x + dx, 0), self.grid.size - 1)
+            new_target_y = min(max(current_unit.target_y + dy, 0), self.grid.size - 1)
+            return self.aim(new_target_x, new_target_y)
+        return False
+
+
+
+
+    def attack_radius(self, unit):
+        """Range of the selected ability, or of the basic attack."""
+        if unit.selected_ability is not None:
+            return unit.selected_ability.attack_radius
+        return unit.attack_range
+
+
+
+
+    def aim(self, x, y):
+        """Put the target cursor on (x, y) if it is in range."""
+        current_unit = self.current_unit
+        if current_unit.state != "attack":
+            return False
+        # Enforce range restriction
+        if abs(current_unit.x - x) + abs(current_unit.y - y) <= self.attack_radius(current_unit):
+            current_unit.target_x, current_unit.target_y = x, y
+            return True
+        return False
+
+
+
+
+    def select_ability(self, index):
+        """Select the ability at `index` (None for the basic attack) and bring the cursor back on the unit."""
+        current_unit = self.current_unit
+        if current_unit.state != "attack":
+            return False
+        if index is not None:
+            if index >= len(current_unit.abilities):
+                return False
+            current_unit.selected_ability = current_unit.abilities[index]
+        else:
+            current_unit.selected_ability = None
+        current_unit.target_x, current_unit.target_y = current_unit.x, current_unit.y
+        return True
+
+
+
+
+    def move_to(self, x, y):
+        """Walk straight to a reachable cell and finalize the move there."""
+        current_unit = self.current_unit
+        if current_unit.state != "move" or (x, y) not in current_unit.update_reachable_tiles(self.grid):
+            return False
+        current_unit.x, current_unit.y = x, y
+        self.occupancy.place(current_unit)
+        return self.confirm()
+
+
+
+
+    def confirm(self):
+        """Finalize the move, or resolve the attack at the cursor."""
+        current_unit = self.current_unit
+        if current_unit.state == "move":
+            return self.finalize_move()
+        if current_unit.state == "attack":
+            return self.resolve_attack()
+        return False
+
+
+
+
+    def finalize_move(self):
+        current_unit = self.current_unit
+        others = [unit for unit in self.occupancy.units_at(current_unit.x, current_unit.y) if unit is not current_unit]
+        if not others:
+            self.log_event(f"{current_unit.name} finalized move at ({current_unit.x}, {current_unit.y}).")
+
+            for p in self.pickup.all_pickups[:]:
+                if p.x == current_unit.x and p.y == current_unit.y:
+                    self.pickup.picked_used(current_unit,p)
+
+            current_unit.state = "attack"
+            current_unit.target_x, current_unit.target_y = current_unit.x, current_unit.y  # Initialize cursor
+            self.update_vision(current_unit.color)
+            return True
+
+        #check if there is enemy in bush
+        enemy_unit = next((unit for unit in others if unit.color != current_unit.color), None)
+        if self.grid.tiles[current_unit.x][current_unit.y].overlay == "bush" and enemy_unit:
+            #in the presence of an enemy on this position but it's a bush u just get assassinated
+            self.log_event(f"{current_unit.name} got assassinated")
+            enemy_unit.attack(current_unit,9999)
+            current_unit.state="done"
+            self.manage_keys(dead_player=current_unit, killer=enemy_unit)
+            return True
+
+        #if it's another unit u just can't finalise movement
+        self.log_event("can't finalise movement , another unit is filling this position")
+        return False
+
+
+
+
+    def resolve_attack(self):
+        """Fire the selected ability, or the basic attack, at the cursor."""
+        current_unit = self.current_unit
+        target = self.unit_at(current_unit.target_x, current_unit.target_y)
+        ability = current_unit.selected_ability
+
+        if ability is not None:
+            if ability.is_aoe>0:   #logic when using aoe abilities
+                nearby = self.occupancy.in_range(current_unit.target_x, current_unit.target_y, ability.is_aoe)
+                targets = ability.get_targets_in_aoe(current_unit, nearby)
+                used = ability.use(current_unit, targets)
+            else : #logic when using none aoe abilities
+                if target is None:  # Ensure targets exist
+                    print("No valid target selected.")
+                    return False
+                targets = [target]
+                used = ability.use(current_unit, target)
+            if used:
+                self.play_sound(ability.name)
+                current_unit.state = "done"
+                current_unit.selected_ability = None  # Reset ability selection
+        else:
+            self.basic_attack(current_unit)  # Basic attack
+            # Jouer le son d'attaque de base si il y'a un target
+            if target is not None and target!=current_unit:
+                self.play_sound(f"{current_unit.name} Basic Attack")
+            targets = [target] if target is not None else []
+            used = True
+
+        for target in targets:
+            self.resolve_kill(target, current_unit)
+        return used
+
+
+
+
+    def resolve_kill(self, target, killer):
+        """Team buff when a monster dies, and key transfer on any death."""
+        if target.unit_type =="monster" and target.alive==False :
+            #if the buff dies the team gets a permanent buff
+            for unit in self.units:
+                if unit.color == killer.color:
+                    if unit.name=="BigBuff":
+                        unit.max_health = int(unit.max_health * 1.10)
+                        unit.damage = int(unit.damage * 1.15)
+                    else :
+                        unit.max_health = int(unit.max_health * 1.05)
+                        unit.damage = int(unit.damage * 1.05)
+
+            if target.red_keys==1:
+                self.on_monster_killed(target, "You won a red key + buff")
+            elif target.blue_keys==1:
+                self.on_monster_killed(target, "You won a blue key + buff")
+            else:
+                self.on_monster_killed(target, "You got the Buff ")
+
+        # managing the keys
+        if target.alive==False:
+            self.manage_keys(dead_player=target, killer=killer)
+
+
+
+
+    def basic_attack(self, unit):
+        """Resolve the attack at the current target location."""
+        target_hit = False
+
+        # Find a valid target at the attack cursor location
+        for other_unit in self.occupancy.units_at(unit.target_x, unit.target_y):
+            if other_unit.color != unit.color:
+                damage=unit.attack(other_unit,unit.damage)  # Use the Unit's attack method
+                if damage > 0:
+                    self.log_event(f"{unit.name} attacked {other_unit.name} for {damage} damage!")
+                    # Vérifier si l'unité est morte
+                    if not other_unit.alive:
+                        self.log_event(f"{other_unit.name} has been defeated!")
+                else:
+                    self.log_event(f"{unit.name} attacked {other_unit.name} but missed!")
+                target_hit = True
+                break
+        if not target_hit:
+            self.log_event(f"{unit.name} attacked but missed!")
+
+        unit.state = "done"  # Mark the unit as done after the attack
+
+
+
+
+    def end_turn(self):
+        """Close the current unit's turn once it is done and run the between-turns upkeep."""
+        current_unit = self.current_unit
+        if current_unit.state != "done":
+            return False
+        self.current_turn+=1
+
+        #each turn we reduce the cooldowns and reduce the duration remaaning on the buffs
+        for unit in self.units:
+            for ability in unit.abilities:
+                    ability.reduce_cooldown()
+        for unit in self.units:
+            unit.update_buffs_and_debuffs()
+
+
+        current_unit.state = "move"  # Reset state for the next turn
+        current_unit.initial_x, current_unit.initial_y = current_unit.x, current_unit.y  # Reset initial position
+        self.advance_to_next_unit()
+        self.units[self.current_unit_index].update_reachable_tiles(self.grid)  # Movement range for the new turn
+
+        self.update_vision(self.units[self.current_unit_index].color)
+        self.pickup.update(self.current_turn,self.grid)
+        self.manage_keys(current_turn=self.current_turn)
+
+        #health and mana regeneration each turn
+        for unit in self.units:
+            if unit.unit_type=="player":
+                unit.health+=min(unit.max_health-unit.health,int(0.005*unit.max_health))
+                unit.mana +=min(unit.max_mana-unit.mana,int(0.01*unit.max_mana))
+
+        #respawn logic
+        # Calculate respawn cap
+        respawn = min(self.current_turn // 8, 10)
+
+        # Update death timers and respawn dead units
+        for unit in self.units:
+            if not unit.alive and unit.unit_type=="player":
+                unit.death_timer += 1  # Increment death timer for dead units
+                print(f"{unit.death_timer}seconds of death for {unit.name}")
+                # Respawn logic
+                if unit.death_timer >= respawn :
+                    self.log_event(f"{unit.name} has respawned at base!")
+                    unit.alive = True
+                    unit.health = unit.max_health  # Restore health
+                    unit.state = "move"
+                    unit.initial_x, unit.initial_y = self.get_respawn_location(unit)  # Define respawn location logic
+                    unit.x,unit.y = unit.initial_x, unit.initial_y
+                    self.occupancy.place(unit)
+                    unit.death_timer = 0  # Reset death timer
+        return True
+
+
+
+
+    def advance_to_next_unit(self):
+        """Advance to the next unit, skipping dead ones."""
+        # Start from the current unit
+        start_index = self.current_unit_index
+
+        #we keep incrementing the index untill we fullfil the conditions
+        while True:
+            # Move to the next unit
+            self.current_unit_index = (self.current_unit_index + 1) % len(self.units)
+
+            # Check if the unit is alive and that is part of either team red or team blue
+            if (self.units[self.current_unit_index].alive
+                and self.units[self.current_unit_index].unit_type=="player"):
+                break
+
+            # If we've cycled through all units and come back to the start, stop (prevents infinite loops)
+            if self.current_unit_index == start_index:
+                self.log_event("No alive units remaining!")
+                return
+
+
+
+
+    def get_respawn_location(self, unit):
+        """Starting position of the unit's slot in the turn order."""
+        unit_index = self.units.index(unit)
+        positions = TEAM_POSITIONS["blue"] + TEAM_POSITIONS["red"]
+        if unit_index < len(positions):
+            return positions[unit_index]
+        return unit.x, unit.y
+
+
+
+
+    def manage_keys(self, dead_player=None, killer=None, current_turn=None):
+        """
+        Handles all key-related logic:
+        - Initializes keys at the start of the game.
+        - Transfers keys when a player dies.
+        - Spawns additional keys based on turn events.
+        - Tracks team progress on key collection.
+
+        :param dead_player: The unit that died (optional).
+        :param killer: The unit that killed the dead player (optional).
+        :param current_turn: The current turn number (optional).
+        """
+        # Initialize keys at the start of the game
+        if not self.keys_initialized:
+            self.units[0].blue_keys = 1  # Blue Player 1 starts with one Blue key
+            self.units[1].blue_keys = 1  # Blue Player 2 starts with one Blue key
+            self.units[2].red_keys = 1  # Red Player 1 starts with one Red key
+            self.units[3].red_keys = 1  # Red Player 2 starts with one Red key
+            self.keys_initialized = True
+            print(f"Initial keys have been assigned to players.")
+
+        # Handle key transfer on player death
+        if dead_player and killer:
+            if killer.unit_type == "player":
+                # Transfer keys to the killer
+                killer.red_keys += dead_player.red_keys
+                killer.blue_keys += dead_player.blue_keys
+                print(f"{killer.name} collected {dead_player.red_keys} Red key(s) and {dead_player.blue_keys} Blue key(s) from {dead_player.name}.")
+                dead_player.red_keys = 0
+                dead_player.blue_keys = 0
+            else:
+                # Keys are lost if the killer is not a player
+                print(f"{dead_player.name}'s {dead_player.red_keys} Red key(s) and {dead_player.blue_keys} Blue key(s) are not lost.")
+
+
+
+         #checking if the team got 3 keys or not and changing the barrier status
+        if self.units[0].red_keys + self.units[1].red_keys >=3:
+            print("blue team broke the red barrier")
+            self.units[-1].barrier_status="Down"
+            if self.red_barrier == "Up":
+                self.grid.remove_barrier("red")
+            self.red_barrier="Down"
+        if self.units[2].blue_keys + self.units[3].blue_keys >=3:
+            print("red team broke the blue barrier")
+            self.units[-2].barrier_status="Down"
+            if self.blue_barrier == "Up":
+                self.grid.remove_barrier("blue")
+            self.blue_barrier="Down"
+
+
+        # Spawn additional keys based on turn events
+        if current_turn:
+            if current_turn%20 == 0:
+                # Assign keys to a monster
+                for unit in self.units :
+                    if unit.unit_type == "monster" :
+                        if unit.alive==False:
+                            unit.health=unit.max_health
+                            unit.alive=True
+                            if unit.name=="BlueBuff":
+                                unit.blue_keys = 1
+                                print("BlueBuff now holds 1 Blue key")
+                            if unit.name=="RedBuff":
+                                unit.red_keys = 1
+                                print("RedBuff now holds 1 Red key.")
+
+
+
+
+    def legal_actions(self):
+        """Whole-phase actions open to the current unit (empty once the match is over)."""
+        if self.winner() is not None:
+            return []
+        current_unit = self.current_unit
+
+        if current_unit.state == "move":
+            actions = []
+            for x, y in current_unit.update_reachable_tiles(self.grid):
+                # Cells held by another unit cannot be finalized on, except an enemy hiding in a bush
+                # (a monster respawning on a champion leaves both on the same cell)
+                occupants = [unit for unit in self.occupancy.units_at(x, y) if unit is not current_unit]
+                if not occupants or (
+                    self.grid.tiles[x][y].overlay == "bush" and any(unit.color != current_unit.color for unit in occupants)
+                ):
+                    actions.append(("move_to", x, y))
+            return actions
+
+        if current_unit.state == "attack":
+            actions = [("attack", current_unit.x, current_unit.y)]  # Attacking nothing ends the phase
+            for target in self.targets_in_range(current_unit, current_unit.attack_range):
+                if target.color != current_unit.color:
+                    actions.append(("attack", target.x, target.y))
+
+            for index, ability in enumerate(current_unit.abilities):
+                if ability.remaining_cooldown > 0:
+                    continue
+                if ability.ability_type in ("damage", "heal") and current_unit.mana < ability.mana_cost:
+                    continue
+                for target in self.targets_in_range(current_unit, ability.attack_radius):
+                    if ability.is_aoe > 0:
+                        if target is not current_unit:  # The caster is never hit by its own area
+                            actions.append(("ability", index, target.x, target.y))
+                    elif self.has_effect(ability, current_unit, target):
+                        actions.append(("ability", index, target.x, target.y))
+            return actions
+
+        return [("end_turn",)]
+
+
+
+
+    def targets_in_range(self, unit, radius):
+        """
+        Alive units within Manhattan distance `radius` of `unit` (the unit itself included).
+        When units share a cell, only the one an action on that cell would hit is listed.
+        """
+        return self.occupancy.first_in_range(unit.x, unit.y, radius)
+
+
+
+
+    @staticmethod
+    def has_effect(ability, user, target):
+        """Whether a single-target ability would change anything on `target`."""
+        if ability.ability_type == "damage":
+            return target.color != user.color
+        if ability.ability_type == "heal":
+            return target.color == user.color
+        if ability.ability_type == "buff":
+            return target.color == user.color and not target.is_buffed
+        return target.color != user.color and not target.is_debuffed
@@ -1,15 +1,32 @@
 import pygame
 import random
+import sys
 from unit import Unit 
-from interface import Grid,Highlight,Pickup
-from sounds import Sounds
+from interface import Grid,Highlight,Pickup,DirtyRegions,range_overlays
+from sounds import sound_bank, music_player
+from cache import surface_cache, font_cache
+from scheduler import FrameScheduler
+from assets import assets, BUNDLE_FILE
+from engine import Match, UNIT_IMAGES
+from ponder import PonderingPolicy, BackgroundPolicy
 
 
 # Constants
 GRID_SIZE = 21
 CELL_SIZE = 43
-SCREEN_WIDTH, SCREEN_HEIGHT = CELL_SIZE * GRID_SIZE + 300, CELL_SIZE * GRID_SIZE + 100
+INFO_PANEL_WIDTH = 300
+INFO_PANEL_PADDING = 10
+SCREEN_WIDTH, SCREEN_HEIGHT = CELL_SIZE * GRID_SIZE + INFO_PANEL_WIDTH, CELL_SIZE * GRID_SIZE + 100
 FPS = 60
+AI_ACTION_DELAY = 400  # Milliseconds between two actions of a computer player, so they can be followed
+SEATS = {"player": "Player", "alphabeta": "Computer (alpha-beta)", "mcts": "Computer (MCTS)"}  # In the order A cycles them
+# Both decide in a background process; MCTS also thinks during the other turns
+SEAT_POLICIES = {"alphabeta": lambda: BackgroundPolicy("alphabeta"), "mcts": PonderingPolicy}
+
+# Screen regions used by the dirty-rectangle rendering mode
+MAP_RECT = pygame.Rect(0, 0, CELL_SIZE * GRID_SIZE, CELL_SIZE * GRID_SIZE)
+SIDEBAR_RECT = pygame.Rect(CELL_SIZE * GRID_SIZE, 0, INFO_PANEL_WIDTH, SCREEN_HEIGHT)
+HUD_RECT = pygame.Rect(0, SCREEN_HEIGHT - 100, SCREEN_WIDTH, 100)
 
 # Load assets
 
@@ -17,95 +34,156 @@ def load_textures():
     """Load textures for different terrain and overlays."""
     return {
         #grid 
-        "grass": pygame.image.load("assets/grass_new.png"),
-        "water": pygame.image.load("assets/water.jpg"),
-        "rock": pygame.image.load("assets/new_rock.png"),
+        "grass": assets.image("assets/grass_new.png"),
+        "water": assets.image("assets/water.jpg"),
+        "rock": assets.image("assets/new_rock.png"),
         #overlays
-        "bush": pygame.image.load("assets/bush.png"),
-        "barrier": pygame.image.load("assets/inhibetor.png"),
+        "bush": assets.image("assets/bush.png"),
+        "barrier": assets.image("assets/inhibetor.png"),
     }
 
 def load_unit_images():
-    return {
-        "ashe": "assets/ashe.png",
-        "garen": "assets/garen.png",
-        "darius": "assets/darius.png",
-        "soraka": "assets/soraka.png",
-        "rengar": "assets/rengar.png",
-        "bluebuff": "assets/BlueBuff.png",
-        "redbuff": "assets/Redbuff.png",
-        "bigbuff": "assets/BigBuff.png",
-        "baseblue": "assets/Nexus_Blue.png",
-        "basered": "assets/Nexus_Red.png"
-    }
+    return dict(UNIT_IMAGES)
 
 def load_indicators():
     return {
-        "indicator": pygame.image.load("assets/indicator.png"),
-        "indicator1": pygame.image.load("assets/indicator1.jpg"),
-        "redsquare": pygame.image.load("assets/redsquare.png"),
+        "indicator": assets.image("assets/indicator.png"),
+        "indicator1": assets.image("assets/indicator1.jpg"),
+        "redsquare": assets.image("assets/redsquare.png"),
     }
 
 def load_pickups():
     """Load the different potion types"""
     return{
         #pick ups
-        "red_potion": pygame.image.load("assets/red_potion.png"),
-        "blue_potion": pygame.image.load("assets/blue_potion.png"),
-        "green_potion": pygame.image.load("assets/green_potion.png"),
-        "golden_potion": pygame.image.load("assets/golden_potion.png"),
-        "black_potion": pygame.image.load("assets/black_potion.png"),
+        "red_potion": assets.image("assets/red_potion.png"),
+        "blue_potion": assets.image("assets/blue_potion.png"),
+        "green_potion": assets.image("assets/green_potion.png"),
+        "golden_potion": assets.image("assets/golden_potion.png"),
+        "black_potion": assets.image("assets/black_potion.png"),
 
     }
 
 
 
 # Game class
-class Game:
-    def __init__(self):
+class Game(Match):
+    """The pygame front end: menus, drawing and keyboard input driving the match rules."""
+    def __init__(self, dirty_rects=False, throttle=True, show_stats=False, preload_sounds=True, asset_bundle=BUNDLE_FILE, seats=None):
+        """
+        :param dirty_rects: Opt-in rendering mode that only redraws and pushes the screen regions that changed.
+        :param throttle: Drop to a low frame rate while nothing is animating and no key is held.
+        :param show_stats: Show the measured frame rate and CPU use in the window title.
+        :param preload_sounds: Decode the sound effects on a background thread instead of on first play.
+        :param asset_bundle: Packed images built by pack_assets.py, None to always read the loose files.
+        :param seats: Who plays each team at first ("player", "alphabeta" or "mcts" by color); A cycles them in the selection menu.
+        """
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("League on Budget")
         self.clock = pygame.time.Clock()
+        self.scheduler = FrameScheduler(self.clock, FPS, throttle=throttle)
+        self.show_stats = show_stats
+        self.show_loading_screen(asset_bundle)  # Images decode on a worker thread meanwhile
         self.unit_images = load_unit_images()
         self.indicators = load_indicators()
         self.textures_file=load_textures()
         self.pickup=Pickup()
-        self.sound=Sounds()
+        self.sound=sound_bank
+        if preload_sounds:
+            self.sound.preload()  # Effects decode in the background
+        self.music=music_player  # Music is streamed, never decoded ahead
         self.pickup_textures=load_pickups()
         self.grid = Grid(GRID_SIZE, self.textures_file)
-        self.units = [] 
+        super().__init__(grid=self.grid, pickup=self.pickup)  # Units, turn, keys and barriers
         self.pickups=[]
 
         self.pickup.initialize(self.pickup_textures)  
-        self.current_unit_index = 0
         self.last_move_time = 0  # Timestamp of the last movement
         self.visible_tiles = set()
-        self.event_log = [] # Initialize event log
+        self.visible_bits = 0  # Team vision as a bitset, see update_fog_visibility
+        self.visible_mask = self.shown_mask = self.grid.terrain_map.mask(())  # Arrays of the visible cells, see update_fog_visibility
+        self.fog_surface = None  # Cached fog of war, rebuilt when visible_tiles changes
+        self.event_log_lines = []  # Pre-rendered wrapped lines, one list per event
+        self.info_panel_surface = None  # Cached info panel, rebuilt when the log changes
+
+        # Dirty-rectangle rendering mode
+        self.dirty_rects = dirty_rects
+        self.dirty_regions = DirtyRegions()
 
 
         
         #initilizing main menu
-        self.font_title = pygame.font.Font("assets/League.otf", 65)
-        self.font_small = pygame.font.Font("assets/RussoOne.ttf", 36)
-        self.menu_image = pygame.image.load("assets/main_screen.jpg")  # Load main menu background
-        self.background_image = pygame.image.load("assets/lol_background.jpg")  # Load main menu background
-        self.champ_select_image = pygame.image.load("assets/champ_select.jpg")  # Load champion selection background
-        self.game_over_image = pygame.image.load("assets/game_over_image.jpg")  # Load champion selection background
+        self.font_title = font_cache.get_font("assets/League.otf", 65)
+        self.font_small = font_cache.get_font("assets/RussoOne.ttf", 36)
+        self.menu_image = assets.image("assets/main_screen.jpg")  # Load main menu background
+        self.background_image = assets.image("assets/lol_background.jpg")  # Load main menu background
+        self.champ_select_image = assets.image("assets/champ_select.jpg")  # Load champion selection background
+        self.game_over_image = assets.image("assets/game_over_image.jpg")  # Load champion selection background
 
         #intializing key menu
-        self.red_key_img = pygame.image.load("assets/red_key.png")
-        self.blue_key_img = pygame.image.load("assets/blue_key.png")
-        self.font = pygame.font.Font(None, 24)  # Use a small font size for clarity
+        self.red_key_img = assets.image("assets/red_key.png")
+        self.blue_key_img = assets.image("assets/blue_key.png")
+        self.font = font_cache.get_font(None, 24)  # Use a small font size for clarity
         
         
         self.key_last_state = {} # prevent repeated actions
-        self.current_turn=1
 
-        #barrier status
-        self.blue_barrier="Up"
-        self.red_barrier="Up"
+        # Computer players by team color
+        self.seats = {"blue": "player", "red": "player"}
+        self.ai_players = {}
+        self.ai_rng = random.Random()
+        self.last_ai_player = None  # Whose last decision the stats show
+        self.ai_deciding = None  # Computer player whose decision is being searched
+        for color, seat in (seats or {}).items():
+            self.set_seat(color, seat)
+
+
+
+
+
+    def set_seat(self, color, seat):
+        """Have `color` played by a person ("player") or by a computer policy ("alphabeta", "mcts")."""
+        previous = self.ai_players.pop(color, None)
+        if previous is not None and hasattr(previous, "close"):
+            previous.close()  # Background process
+        if previous is self.ai_deciding:
+            self.ai_deciding = None
+        self.seats[color] = seat
+        if seat != "player":
+            self.ai_players[color] = SEAT_POLICIES[seat]()
+
+
+
+
+    def show_loading_screen(self, asset_bundle=BUNDLE_FILE):
+        """
+        Load the images from the asset bundle when it is up to date, and preload the rest
+        on a worker thread, converting them as they arrive, behind a progress bar.
+        """
+        if asset_bundle is not None:
+            assets.load_bundle(asset_bundle)
+        assets.preload()  # Only what the bundle did not provide
+        font = font_cache.get_font("assets/RussoOne.ttf", 36)
+        bar = pygame.Rect(SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2, SCREEN_WIDTH // 2, 30)
+
+        while assets.is_loading():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    exit()
+
+            assets.collect()
 
+            self.screen.fill((0, 0, 0))
+            loading_text = font_cache.render(font, "Loading...", True, (200, 156, 56))
+            self.screen.blit(loading_text, loading_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40)))
+            pygame.draw.rect(self.screen, (200, 156, 56), bar, 2)
+            filled = bar.inflate(-8, -8)
+            filled.width = int(filled.width * assets.progress())
+            pygame.draw.rect(self.screen, (200, 156, 56), filled)
+            pygame.display.flip()
+            self.clock.tick(FPS)
 
 
 
@@ -114,17 +192,20 @@ class Game:
         """Display the main menu with options to start or quit."""
         menu_running = True
 
-        # Start menu sound
-        self.sound.play("game_music")
+        # Start menu music, or bring it back up after a match
+        if self.music.is_playing("game_music"):
+            self.music.fade(1.0, 1000)
+        else:
+            self.music.play("game_music")
 
         while menu_running:
             rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
-            self.screen.blit(pygame.transform.scale(self.background_image, (SCREEN_WIDTH, SCREEN_HEIGHT)), rect)
+            self.screen.blit(surface_cache.get_scaled(self.background_image, (SCREEN_WIDTH, SCREEN_HEIGHT)), rect)
 
             # Render game title
-            title_text = self.font_title.render("League on Budget", True, (200, 156, 56))
+            title_text = font_cache.render(self.font_title, "League on Budget", True, (200, 156, 56))
             title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2  , SCREEN_HEIGHT // 4  ))
-            title_text1 = self.font_title.render("League on Budget", True, (0,0,0))
+            title_text1 = font_cache.render(self.font_title, "League on Budget", True, (0,0,0))
             title_rect1 = title_text1.get_rect(center=(SCREEN_WIDTH // 2 +2, SCREEN_HEIGHT // 4+ 2))
 
             self.screen.blit(title_text1, title_rect1)
@@ -132,8 +213,8 @@ class Game:
             
             
             # Render instructions
-            start_text = self.font_small.render("Press ENTER to Play", True, (200, 200, 200))
-            quit_text = self.font_small.render("Press ESC to Quit", True, (200, 200, 200))
+            start_text = font_cache.render(self.font_small, "Press ENTER to Play", True, (200, 200, 200))
+            quit_text = font_cache.render(self.font_small, "Press ESC to Quit", True, (200, 200, 200))
 
             start_rect = start_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             quit_rect = quit_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
@@ -142,6 +223,8 @@ class Game:
             self.screen.blit(quit_text, quit_rect)
 
             pygame.display.flip()
+            self.music.update()
+            self.scheduler.tick(active=self.music.is_fading())  # Nothing moves on the main menu, keep the fade smooth
 
             # Handle events
             for event in pygame.event.get():
@@ -183,7 +266,7 @@ class Game:
 
         while menu_running:
             rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
-            self.screen.blit(pygame.transform.scale(self.champ_select_image, (SCREEN_WIDTH, SCREEN_HEIGHT)), rect)
+            self.screen.blit(surface_cache.get_scaled(self.champ_select_image, (SCREEN_WIDTH, SCREEN_HEIGHT)), rect)
 
             # Render the middle section with available units
             y_offset = SCREEN_HEIGHT // 3
@@ -194,7 +277,7 @@ class Game:
                     (255, 255, 255)
                 )
 
-                unit_text = small_font.render(f"{i + 1}: {unit.name}", True, color)
+                unit_text = font_cache.render(small_font, f"{i + 1}: {unit.name}", True, color)
                 self.screen.blit(unit_text, (SCREEN_WIDTH // 2 - 50, y_offset))
                 y_offset += 40
 
@@ -207,36 +290,43 @@ class Game:
                 ]
                 y_offset = SCREEN_HEIGHT // 3
                 for line in attributes_text:
-                    attr_text = small_font.render(line, True, (255, 255, 255))
+                    attr_text = font_cache.render(small_font, line, True, (255, 255, 255))
                     self.screen.blit(attr_text, (SCREEN_WIDTH // 2 + 200, y_offset))
                     y_offset += 40
                      # Show the selected champion's image larger
-                selected_image = pygame.transform.scale(selected_unit_info.image, (150, 150))
+                selected_image = surface_cache.get_scaled(selected_unit_info.image, (150, 150))
                 self.screen.blit(selected_image, (SCREEN_WIDTH - 420, y_offset+30))
 
             # Render team rosters
-            blue_text = font.render("Blue Team", True, (0, 0, 255))
-            red_text = font.render("Red Team", True, (255, 0, 0))
+            blue_text = font_cache.render(font, "Blue Team", True, (0, 0, 255))
+            red_text = font_cache.render(font, "Red Team", True, (255, 0, 0))
             self.screen.blit(blue_text, (50, 50))
             self.screen.blit(red_text, (SCREEN_WIDTH-400, 50))
 
+            # Who plays each team, A switches the team picking now
+            for color, x in (("blue", 50), ("red", SCREEN_WIDTH-400)):
+                marker = " (A)" if color == current_team else ""
+                seat_text = font_cache.render(small_font, SEATS[self.seats[color]] + marker, True, (255, 255, 255))
+                self.screen.blit(seat_text, (x, 130))
+
             y_offset_blue = 200
             for unit in blue_team:
-                unit_text = small_font.render(unit.name, True, (0, 0, 255))
+                unit_text = font_cache.render(small_font, unit.name, True, (0, 0, 255))
                 self.screen.blit(unit_text, (100, y_offset_blue))
-                selected_image = pygame.transform.scale(unit.image, (50, 50))
+                selected_image = surface_cache.get_scaled(unit.image, (50, 50))
                 self.screen.blit(selected_image, (250, y_offset_blue-10))
                 y_offset_blue += 60
 
             y_offset_red = 200
             for unit in red_team:
-                unit_text = small_font.render(unit.name, True, (255, 0, 0))
+                unit_text = font_cache.render(small_font, unit.name, True, (255, 0, 0))
                 self.screen.blit(unit_text, (SCREEN_WIDTH-400+50, y_offset_red))
-                selected_image = pygame.transform.scale(unit.image, (50, 50))
+                selected_image = surface_cache.get_scaled(unit.image, (50, 50))
                 self.screen.blit(selected_image, (SCREEN_WIDTH-200, y_offset_red-10))
                 y_offset_red += 60
 
             pygame.display.flip()
+            self.scheduler.tick(active=False)  # Nothing moves on the selection screen
 
             # Handle menu events
             for event in pygame.event.get():
@@ -244,7 +334,10 @@ class Game:
                     pygame.quit()
                     exit()
                 elif event.type == pygame.KEYDOWN:
-                    if pygame.K_1 <= event.key <= pygame.K_9:
+                    if event.key == pygame.K_a:  # Next seat kind for the picking team: player, computers
+                        seats = list(SEATS)
+                        self.set_seat(current_team, seats[(seats.index(self.seats[current_team]) + 1) % len(seats)])
+                    elif pygame.K_1 <= event.key <= pygame.K_9:
                         index = event.key - pygame.K_1
                         if 0 <= index < len(available_units):
                             selected_unit_info = available_units[index]  # Show attributes for this unit
@@ -275,18 +368,16 @@ class Game:
                             if len(blue_team) == 2 and len(red_team) == 2 :
                                 for i in range(3, 0, -1):  # Countdown from 3 to 1
                                     rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
-                                    self.screen.blit(pygame.transform.scale(self.background_image, (SCREEN_WIDTH, SCREEN_HEIGHT)), rect)
+                                    self.screen.blit(surface_cache.get_scaled(self.background_image, (SCREEN_WIDTH, SCREEN_HEIGHT)), rect)
                                     countdown_text = small_font.render(f"Starting in {i}...", True, (55, 255, 55))
                                     countdown_rect = countdown_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
                                     self.screen.blit(countdown_text, countdown_rect)
                                     pygame.display.flip()
                                     pygame.time.delay(1000)  # Delay for 1 second
-                                    # Play game music
-                                for volume in reversed([x / 100 for x in range(1, 101)]):  # De 1.0 à 0.01
-                                    self.sound.set_volume("game_music", volume)  
-                                    pygame.time.delay(10) 
-                                self.sound.set_volume("game_music", 0.03)  
-                                self.sound.sounds["game_music"].play(loops=-1)
+                                # Lower the music to background level, the game loop drives the fade
+                                if not self.music.is_playing("game_music"):
+                                    self.music.play("game_music")
+                                self.music.fade(0.03, 1000)
                                 menu_running = False
 
         # Build self.units in the required order: blue team → red team → monsters
@@ -302,8 +393,34 @@ class Game:
     def log_event(self, message):
         """Add an event to the event log."""
         self.event_log.append(message)
+        self.event_log_lines.append(self.layout_event(message))  # Wrap and render once
         if len(self.event_log) > 10:  # Limit the log to the last 10 events
             self.event_log.pop(0)
+            self.event_log_lines.pop(0)
+        self.info_panel_surface = None  # Re-composite the panel on the next draw
+
+
+
+
+    def layout_event(self, message):
+        """Word-wrap an event to the info panel width and return its pre-rendered lines."""
+        font = font_cache.get_font(None, 24)
+        max_line_width = INFO_PANEL_WIDTH - 2 * INFO_PANEL_PADDING
+
+        # Measure with font metrics, only the final lines get rasterized
+        lines = []
+        current_line = ""
+        for word in message.split(" "):
+            test_line = f"{current_line} {word}".strip()
+            if current_line and font.size(test_line)[0] > max_line_width:
+                lines.append(current_line)
+                current_line = word
+            else:
+                current_line = test_line
+        if current_line:
+            lines.append(current_line)
+
+        return [font.render(line, True, (255, 255, 255)) for line in lines]
 
 
 
@@ -311,44 +428,36 @@ class Game:
     def draw_info_panel(self):
         """Draw the information panel with word wrapping for long text."""
         panel_x = CELL_SIZE * GRID_SIZE
-        panel_width = 300  # Width of the info panel
+
+        if self.info_panel_surface is None:
+            self.info_panel_surface = self.compose_info_panel()
+        self.screen.blit(self.info_panel_surface, (panel_x, 0))
+
+
+
+
+    def compose_info_panel(self):
+        """Build the info panel surface from the pre-rendered event log lines."""
         panel_height = SCREEN_HEIGHT
-        padding = 10  # Padding inside the panel
+        padding = INFO_PANEL_PADDING
+        line_spacing = 5  # Spacing between lines
 
         # Draw panel background
-        pygame.draw.rect(self.screen, (30, 30, 30), (panel_x, 0, panel_width, panel_height))
+        panel = pygame.Surface((INFO_PANEL_WIDTH, panel_height))
+        panel.fill((30, 30, 30))
 
-        # Render event log with word wrapping
-        font = pygame.font.Font(None, 24)
         y_offset = padding
-        line_spacing = 5  # Spacing between lines
-        max_line_width = panel_width - 2 * padding
-
-        for event in reversed(self.event_log):  # Display from newest to oldest
-            # Split the text into multiple lines if necessary
-            words = event.split(" ")
-            current_line = ""
-            for word in words:
-                test_line = f"{current_line} {word}".strip()
-                text_surface = font.render(test_line, True, (255, 255, 255))
-                if text_surface.get_width() > max_line_width:
-                    # Render the current line and move to the next
-                    rendered_surface = font.render(current_line, True, (255, 255, 255))
-                    self.screen.blit(rendered_surface, (panel_x + padding, y_offset))
-                    y_offset += rendered_surface.get_height() + line_spacing
-                    current_line = word
-                else:
-                    current_line = test_line
-            # Render the last line of the current event
-            if current_line:
-                rendered_surface = font.render(current_line, True, (255, 255, 255))
-                self.screen.blit(rendered_surface, (panel_x + padding, y_offset))
+        for lines in reversed(self.event_log_lines):  # Display from newest to oldest
+            for rendered_surface in lines:
+                panel.blit(rendered_surface, (padding, y_offset))
                 y_offset += rendered_surface.get_height() + line_spacing
 
             # Stop rendering if we've filled the panel
             if y_offset > panel_height - padding:
                 break
 
+        return panel
+
 
 #space for the abilities abr
 
@@ -367,12 +476,12 @@ class Game:
         current_unit = self.units[self.current_unit_index]
 
         # Define fonts
-        font_large = pygame.font.Font(None, 24)
-        font_small = pygame.font.Font(None, 16)
+        font_large = font_cache.get_font(None, 24)
+        font_small = font_cache.get_font(None, 16)
 
         # Champion icon
         if current_unit.image:
-            icon = pygame.transform.scale(current_unit.image, (icon_size, icon_size))
+            icon = surface_cache.get_scaled(current_unit.image, (icon_size, icon_size))
             self.screen.blit(
                 icon, (padding, bar_y + (bar_height - icon_size) // 2)
             )
@@ -382,7 +491,7 @@ class Game:
         stats_y = bar_y + padding
 
         # Unit name
-        name_surface = font_large.render(current_unit.name, True, (255, 255, 255))
+        name_surface = font_cache.render(font_large, current_unit.name, True, (255, 255, 255))
         self.screen.blit(name_surface, (stats_x, stats_y))
 
         # HP Bar
@@ -398,7 +507,7 @@ class Game:
             self.screen, (0, 255, 0), (hp_x, hp_y, hp_fill_width, hp_bar_height)
         )
         hp_text = f"{current_unit.health}/{current_unit.max_health}"
-        hp_text_surface = font_small.render(hp_text, True, (0, 0, 0))
+        hp_text_surface = font_cache.render(font_small, hp_text, True, (0, 0, 0))
         self.screen.blit(
             hp_text_surface,
             (hp_x + (hp_bar_width - hp_text_surface.get_width()) // 2, hp_y),
@@ -440,13 +549,13 @@ class Game:
 
                     # Ability name and mana cost
                     ability_text = f"{i + 1}: {ability.name} (Mana: {ability.mana_cost})"
-                    text_surface = font_small.render(ability_text, True, (255, 255, 255))
+                    text_surface = font_cache.render(font_small, ability_text, True, (255, 255, 255))
                     text_x = ability_x + (ability_width - text_surface.get_width()) // 2
                     self.screen.blit(text_surface, (text_x, bar_y + padding + 10))
 
                     # Cooldown display
                     cooldown_text = f"CD: {ability.remaining_cooldown}s"
-                    cooldown_surface = font_small.render(cooldown_text, True, (255, 0, 0))
+                    cooldown_surface = font_cache.render(font_small, cooldown_text, True, (255, 0, 0))
                     cooldown_x = ability_x + (ability_width - cooldown_surface.get_width()) // 2
                     self.screen.blit(
                         cooldown_surface, (cooldown_x, bar_y + padding + 30)
@@ -472,8 +581,8 @@ class Game:
             else:
                 # No abilities available
                 no_abilities_text = "No abilities available"
-                no_abilities_surface = font_small.render(
-                    no_abilities_text, True, (255, 255, 255)
+                no_abilities_surface = font_cache.render(
+                    font_small, no_abilities_text, True, (255, 255, 255)
                 )
                 no_abilities_x = stats_x + hp_bar_width + padding
                 self.screen.blit(
@@ -490,432 +599,117 @@ class Game:
             if unit.alive:
                 is_current_turn = (index == self.current_unit_index)  # Check if it's the current unit's turn
                 # Draw units only if they belong to the current team or are in visible tiles
-                if unit.color == current_team_color or (unit.x, unit.y) in self.visible_tiles and self.grid.tiles[unit.x][unit.y].overlay != "bush":
+                if unit.color == current_team_color or self.shown_mask[unit.x, unit.y]:
                     unit.draw(self.screen, is_current_turn=is_current_turn)
                     
 
 
 
-    def basic_attack(self, unit):
-        """Resolve the attack at the current target location."""
-        target_hit = False
-
-        # Find a valid target at the attack cursor location
-        for other_unit in self.units:
-            if (
-                other_unit.alive
-                and other_unit.x == unit.target_x
-                and other_unit.y == unit.target_y
-                and other_unit.color != unit.color
-            ):
-                damage=unit.attack(other_unit,unit.damage)  # Use the Unit's attack method
-                if damage > 0:
-                    self.log_event(f"{unit.name} attacked {other_unit.name} for {damage} damage!")
-                    # Vérifier si l'unité est morte
-                    if not other_unit.alive:
-                        self.log_event(f"{other_unit.name} has been defeated!")
-                else:
-                    self.log_event(f"{unit.name} attacked {other_unit.name} but missed!")
-                target_hit = True
-                break
-        if not target_hit:
-            self.log_event(f"{unit.name} attacked but missed!")
+    def play_sound(self, name):
+        self.sound.play(name)
 
-        unit.state = "done"  # Mark the unit as done after the attack
-        
 
 
 
-    def advance_to_next_unit(self):
-        """Advance to the next unit, skipping dead ones."""
-        # Start from the current unit
-        start_index = self.current_unit_index
+    def on_monster_killed(self, monster, message):
+        Highlight.show_buff_animation(self,self.screen,monster.image,message)
 
-        #we keep incrementing the index untill we fullfil the conditions
-        while True:
-            # Move to the next unit
-            self.current_unit_index = (self.current_unit_index + 1) % len(self.units)
 
-            # Check if the unit is alive and that is part of either team red or team blue
-            if (self.units[self.current_unit_index].alive 
-                and self.units[self.current_unit_index].unit_type=="player"):
-                break
 
-            # If we've cycled through all units and come back to the start, stop (prevents infinite loops)
-            if self.current_unit_index == start_index:
-                self.log_event("No alive units remaining!")
-                return
+
+    def update_vision(self, team_color):
+        Highlight.update_fog_visibility(self,team_color)
+
+
+
+
+    def apply(self, action):
+        """Play an action, and tell the pondering computer players which phase it completed."""
+        phase = self.phase_action(action)
+        done = super().apply(action)
+        if done and phase is not None:
+            for player in self.ai_players.values():
+                if hasattr(player, "observe"):
+                    player.observe(self, phase)
+        return done
+
 
 
-#add a mana and health regen for each round (2% mana ,1%hp)   
 
     def handle_turn(self):
-        """Handle movement and attacks for the current unit."""
+        """Turn the keys held this frame into actions for the current unit."""
         current_time = pygame.time.get_ticks()
         current_unit = self.units[self.current_unit_index]
+
+        # Computer seat: the action is searched in a background process, polled for once per frame
+        ai_player = self.ai_players.get(current_unit.color)
+        if ai_player is not None:
+            if self.ai_deciding is not ai_player:
+                ai_player.request(self, self.ai_rng)  # Searches during the delay below
+                self.ai_deciding = ai_player
+            if current_time - self.last_move_time > AI_ACTION_DELAY:
+                action = ai_player.result()
+                if action is not None:
+                    self.ai_deciding = None
+                    self.apply(action)
+                    self.last_move_time = pygame.time.get_ticks()
+                    self.last_ai_player = ai_player
+            return
+
         keys = pygame.key.get_pressed()
 
         action_key = pygame.K_SPACE
 
         # debounce mechanism to avoid repeated triggers.
-        if not hasattr(self, "key_last_state"):
-            self.key_last_state = {}
-
         key_just_pressed = keys[action_key] and not self.key_last_state.get(action_key, False)
         self.key_last_state[action_key] = keys[action_key]
 
+        # Arrow held this frame, as a one-cell step
+        step = (
+            (0, -1) if keys[pygame.K_UP] else
+            (0, 1) if keys[pygame.K_DOWN] else
+            (-1, 0) if keys[pygame.K_LEFT] else
+            (1, 0) if keys[pygame.K_RIGHT] else
+            None
+        )
+
         # Movement Phase
         if current_unit.state == "move":
             if current_time - self.last_move_time > 100:  # Delay of 100ms between movements
-                if keys[pygame.K_UP]:
-                    current_unit.move(0, -1, self.grid)
-                    self.last_move_time = current_time
-                elif keys[pygame.K_DOWN]:
-                    current_unit.move(0, 1, self.grid)
-                    self.last_move_time = current_time
-                elif keys[pygame.K_LEFT]:
-                    current_unit.move(-1, 0, self.grid)
-                    self.last_move_time = current_time
-                elif keys[pygame.K_RIGHT]:
-                    current_unit.move(1, 0, self.grid)
+                if step:
+                    self.apply(("step", *step))
                     self.last_move_time = current_time
                 elif key_just_pressed:
-                    if not any(
-                        unit.x == current_unit.x and unit.y == current_unit.y and unit != current_unit
-                        and unit.alive for unit in self.units 
-                    ):  
-                        self.log_event(f"{current_unit.name} finalized move at ({current_unit.x}, {current_unit.y}).")
-
-                        for p in self.pickup.all_pickups:
-                            if p.x == current_unit.x and p.y == current_unit.y:
-                                self.pickup.picked_used(current_unit,p)
-
-
-                        current_unit.state = "attack"
-                        
-                        current_unit.target_x, current_unit.target_y = current_unit.x, current_unit.y  # Initialize cursor
-
-                        next_team_color = self.units[self.current_unit_index].color
-                        Highlight.update_fog_visibility(self,next_team_color)
-
-
-
-                            #check if there is enemy in bush
-                    elif self.grid.tiles[current_unit.x][current_unit.y].overlay == "bush" and any(
-                            unit.x == current_unit.x and unit.y == current_unit.y 
-                            and unit.alive and unit.color != current_unit.color for unit in self.units
-                        ) :   #in the presence of an enemy on this position but it's a bush u just get assassinated
-                        enemy_unit = next(
-                            (unit for unit in self.units if unit.x == current_unit.x and unit.y == current_unit.y 
-                            and unit.alive and unit.color != current_unit.color), 
-                            None
-                        )
-                        if enemy_unit:
-                            self.log_event(f"{current_unit.name} got assassinated")
-                            
-                            enemy_unit.attack(current_unit,9999)
-                            current_unit.state="done"
-                            self.manage_keys(dead_player=current_unit, killer=enemy_unit)
-
-
+                    self.apply(("confirm",))
 
-                    else :      #if it's another unit u just can't finalise movement
-                        self.log_event("can't finalise movement , another unit is filling this position")
-                    
         # Attack Phase
         elif current_unit.state == "attack":
             if current_time - self.last_move_time > 100:  # Delay of 100ms between movements
-                new_target_x, new_target_y = current_unit.target_x, current_unit.target_y
-
-                # Determine current range restriction
-                if hasattr(current_unit, "selected_ability") and current_unit.selected_ability is not None:
-                    current_range = current_unit.selected_ability.attack_radius
-                else:
-                    current_range = current_unit.attack_range
-
-                # Move the attack cursor
-                if keys[pygame.K_UP]:
-                    new_target_y = max(0, current_unit.target_y - 1)
-                elif keys[pygame.K_DOWN]:
-                    new_target_y = min(GRID_SIZE - 1, current_unit.target_y + 1)
-                elif keys[pygame.K_LEFT]:
-                    new_target_x = max(0, current_unit.target_x - 1)
-                elif keys[pygame.K_RIGHT]:
-                    new_target_x = min(GRID_SIZE - 1, current_unit.target_x + 1)
-
-                # Enforce range restriction
-                if abs(current_unit.x - new_target_x) + abs(current_unit.y - new_target_y) <= current_range:
-                    current_unit.target_x, current_unit.target_y = new_target_x, new_target_y
+                # Move the attack cursor, within the range of the selected ability or basic attack
+                if self.apply(("step", *(step or (0, 0)))):
                     self.last_move_time = current_time
 
             # Ability Selection
-            if hasattr(current_unit, "abilities"):
-                if keys[pygame.K_1] and len(current_unit.abilities) > 0:
-                    current_unit.selected_ability = current_unit.abilities[0]
-                    current_unit.target_x, current_unit.target_y = current_unit.x, current_unit.y
-                   
-                elif keys[pygame.K_2] and len(current_unit.abilities) > 1:
-                    current_unit.selected_ability = current_unit.abilities[1]
-                    current_unit.target_x, current_unit.target_y = current_unit.x, current_unit.y
-
-                elif keys[pygame.K_3] and len(current_unit.abilities) > 2:
-                    current_unit.selected_ability = current_unit.abilities[2]
-                    current_unit.target_x, current_unit.target_y = current_unit.x, current_unit.y
-                   
-                elif keys[pygame.K_c]:  # Cancel ability selection
-                    current_unit.selected_ability = None
-                    current_unit.target_x, current_unit.target_y = current_unit.x, current_unit.y
-
+            if keys[pygame.K_1]:
+                self.apply(("select", 0))
+            elif keys[pygame.K_2]:
+                self.apply(("select", 1))
+            elif keys[pygame.K_3]:
+                self.apply(("select", 2))
+            elif keys[pygame.K_c]:  # Cancel ability selection
+                self.apply(("cancel",))
 
             # Execute Selected Ability or Basic Attack
-            target = next(
-                (unit for unit in self.units if unit.alive and unit.x == current_unit.target_x and unit.y == current_unit.target_y),
-                None,
-            )
-            if current_unit.selected_ability is not None :
-                if key_just_pressed:  # Confirm ability usage
-
-                    if current_unit.selected_ability.is_aoe>0:   #logic when using aoe abilities
-
-                        aoe_targets = current_unit.selected_ability.get_targets_in_aoe(current_unit, self.units)
-                        if aoe_targets is not None:  # Ensure targets exist
-                            if current_unit.selected_ability.use(current_unit, aoe_targets):
-                                self.sound.play(current_unit.selected_ability.name)
-                                current_unit.state = "done"
-                                current_unit.selected_ability = None  # Reset ability selection
-                        
-                        else:
-                            print("No valid target selected.")
-
-                        #manage after using aoe abilitities
-                        for targets in aoe_targets:
-                            #manage the mssg to show when buff is killed 
-                            if targets !=None and targets.unit_type =="monster" and targets.alive==False :
-                                #if the buff dies the team gets a permanent buff
-                                for unit in self.units:
-                                        if unit.color == current_unit.color:
-                                            if unit.name=="BigBuff":
-                                                unit.max_health = int(unit.max_health * 1.10)
-                                                unit.damage = int(unit.damage * 1.15)
-                                            else :
-                                                unit.max_health = int(unit.max_health * 1.05)
-                                                unit.damage = int(unit.damage * 1.05)
-                                
-                                if targets.red_keys==1:
-                                    Highlight.show_buff_animation(self,self.screen,targets.image,"You won a red key + buff")
-                                elif targets.blue_keys==1:
-                                    Highlight.show_buff_animation(self,self.screen,targets.image,"You won a blue key + buff")
-                                else:
-                                    Highlight.show_buff_animation(self,self.screen,targets.image,"You got the Buff ")
-
-                                # managing the keys
-                            if targets !=None and targets.alive==False:
-                                self.manage_keys(dead_player=targets, killer=current_unit)
-
-                    else : #logic when using none aoe abilities
-                        if target is not None:  # Ensure targets exist
-                            if current_unit.selected_ability.use(current_unit, target):
-                                self.sound.play(current_unit.selected_ability.name)
-                                current_unit.state = "done"
-                                current_unit.selected_ability = None  # Reset ability selection
-                        
-                        else:
-                            print("No valid target selected.")
-                        #manage after using none aoe abilities
-                        #manage the mssg to show when buff is killed 
-                        if target !=None and target.unit_type =="monster" and target.alive==False :
-                            #if the buff dies the team gets a permanent buff
-                            for unit in self.units:
-                                if unit.color == current_unit.color:
-                                    if unit.name=="BigBuff":
-                                        unit.max_health = int(unit.max_health * 1.10)
-                                        unit.damage = int(unit.damage * 1.15)
-                                    else :
-                                        unit.max_health = int(unit.max_health * 1.05)
-                                        unit.damage = int(unit.damage * 1.05)
-                            
-                            if target.red_keys==1:
-                                Highlight.show_buff_animation(self,self.screen,target.image,"You won a red key + buff")
-                            elif target.blue_keys==1:
-                                Highlight.show_buff_animation(self,self.screen,target.image,"You won a blue key + buff")
-                            else:
-                                Highlight.show_buff_animation(self,self.screen,target.image,"You got the Buff ")
-
-                            # managing the keys
-                        if target !=None and target.alive==False:
-                            self.manage_keys(dead_player=target, killer=current_unit)
-
-
-
-            elif  key_just_pressed:
-                self.basic_attack(current_unit)  # Basic attack
-                current_unit.state = "done"
-
-                # Jouer le son d'attaque de base si il y'a un target
-                basic_attack_sound = f"{current_unit.name} Basic Attack"
-                if target is not None and target!=current_unit:
-                    if basic_attack_sound in self.sound.sounds:
-                        self.sound.play(basic_attack_sound)
-            
-                
-                #manage after using basic attack 
-                #manage the mssg to show when buff is killed 
-                if target !=None and target.unit_type =="monster" and target.alive==False :
-                    #if the buff dies the team gets a permanent buff
-                    for unit in self.units:
-                        if unit.color == current_unit.color:
-                            if unit.name=="BigBuff":
-                                unit.max_health = int(unit.max_health * 1.10)
-                                unit.damage = int(unit.damage * 1.15)
-                            else :
-                                unit.max_health = int(unit.max_health * 1.05)
-                                unit.damage = int(unit.damage * 1.05)
-                    
-                    if target.red_keys==1:
-                        Highlight.show_buff_animation(self,self.screen,target.image,"You won a red key + buff")
-                    elif target.blue_keys==1:
-                        Highlight.show_buff_animation(self,self.screen,target.image,"You won a blue key + buff")
-                    else:
-                        Highlight.show_buff_animation(self,self.screen,target.image,"You got the Buff ")
-
-                    # managing the keys
-                if target !=None and target.alive==False:
-                    self.manage_keys(dead_player=target, killer=current_unit)
-
-            
+            if key_just_pressed:
+                self.apply(("confirm",))
 
         # End Turn
         if  keys[pygame.K_r] and current_unit.state == "done" :
-            self.current_turn+=1
-
-            #each turn we reduce the cooldowns and reduce the duration remaaning on the buffs
-            for unit in self.units:
-                for ability in unit.abilities:
-                        ability.reduce_cooldown()
-            for unit in self.units:
-                unit.update_buffs_and_debuffs()
-
-
-            current_unit.state = "move"  # Reset state for the next turn
-            current_unit.initial_x, current_unit.initial_y = current_unit.x, current_unit.y  # Reset initial position
-            self.advance_to_next_unit()
-
-            next_team_color = self.units[self.current_unit_index].color
-            Highlight.update_fog_visibility(self,next_team_color)
-            self.pickup.update(self.current_turn,self.grid)
-            self.manage_keys(current_turn=self.current_turn)
-
-            #health and mana regeneration each turn
-            for unit in self.units:
-                if unit.unit_type=="player":
-                    unit.health+=min(unit.max_health-unit.health,int(0.005*unit.max_health))
-                    unit.mana +=min(unit.max_mana-unit.mana,int(0.01*unit.max_mana))
-
-            #respawn logic
-            # Calculate respawn cap  
-            respawn = min(self.current_turn // 8, 10)
-
-            # Update death timers and respawn dead units
-            for unit in self.units:
-                if not unit.alive and unit.unit_type=="player":
-                    unit.death_timer += 1  # Increment death timer for dead units
-                    print(f"{unit.death_timer}seconds of death for {unit.name}")
-                    # Respawn logic
-                    if unit.death_timer >= respawn :
-                        self.log_event(f"{unit.name} has respawned at base!")
-                        unit.alive = True
-                        unit.health = unit.max_health  # Restore health
-                        unit.state = "move"
-                        unit.initial_x, unit.initial_y = self.get_respawn_location(unit)  # Define respawn location logic
-                        unit.x,unit.y = unit.initial_x, unit.initial_y
-                        unit.death_timer = 0  # Reset death timer
-
-            
-
-
-    def get_respawn_location(self, unit):
-    # Example: respawn at a fixed position or base location
-        unit_index = self.units.index(unit)
-        # Determine the respawn location based on the index
-        if unit_index == 0:
-            return (3, 15)  # Respawn point for the first unit
-        elif unit_index == 1:
-            return (4, 16)  # Respawn point for the second unit
-        elif unit_index == 2:
-            return (15, 2)  # Respawn point for the third unit
-        elif unit_index == 3:
-            return (17, 4)
-        # Add more conditions as needed for additional indices
+            self.apply(("end_turn",))
 
 
 
-    
-    def manage_keys(self, dead_player=None, killer=None, current_turn=None):
-        """
-        Handles all key-related logic:
-        - Initializes keys at the start of the game.
-        - Transfers keys when a player dies.
-        - Spawns additional keys based on turn events.
-        - Tracks team progress on key collection.
-
-        :param dead_player: The unit that died (optional).
-        :param killer: The unit that killed the dead player (optional).
-        :param current_turn: The current turn number (optional).
-        """
-        # Initialize keys at the start of the game
-        if not hasattr(self, "keys_initialized") or not self.keys_initialized:
-            self.units[0].blue_keys = 1  # Blue Player 1 starts with one Blue key
-            self.units[1].blue_keys = 1  # Blue Player 2 starts with one Blue key
-            self.units[2].red_keys = 1  # Red Player 1 starts with one Red key
-            self.units[3].red_keys = 1  # Red Player 2 starts with one Red key
-            self.keys_initialized = True
-            print(f"Initial keys have been assigned to players.")
-
-        # Handle key transfer on player death
-        if dead_player and killer:
-            if killer.unit_type == "player":
-                # Transfer keys to the killer
-                killer.red_keys += dead_player.red_keys
-                killer.blue_keys += dead_player.blue_keys
-                print(f"{killer.name} collected {dead_player.red_keys} Red key(s) and {dead_player.blue_keys} Blue key(s) from {dead_player.name}.")
-                dead_player.red_keys = 0
-                dead_player.blue_keys = 0
-            else:
-                # Keys are lost if the killer is not a player
-                print(f"{dead_player.name}'s {dead_player.red_keys} Red key(s) and {dead_player.blue_keys} Blue key(s) are not lost.")
 
-            
-
-         #checking if the team got 3 keys or not and changing the barrier status
-        if self.units[0].red_keys + self.units[1].red_keys >=3:
-            print("blue team broke the red barrier")
-            self.units[-1].barrier_status="Down"
-            self.red_barrier="Down"
-        if self.units[2].blue_keys + self.units[3].blue_keys >=3:
-            print("red team broke the blue barrier")
-            self.units[-2].barrier_status="Down"
-            self.blue_barrier="Down"
-
-
-        # Spawn additional keys based on turn events
-        if current_turn:
-            if current_turn%20 == 0:
-                # Assign keys to a monster
-                for unit in self.units :
-                    if unit.unit_type == "monster" :
-                        if unit.alive==False:
-                            unit.health=unit.max_health
-                            unit.alive=True
-                            if unit.name=="BlueBuff":
-                                unit.blue_keys = 1
-                                print("BlueBuff now holds 1 Blue key")
-                            if unit.name=="RedBuff":
-                                unit.red_keys = 1
-                                print("RedBuff now holds 1 Red key.")
-                    
-
-
-                    
     def draw_key_counts(self):
         """
         Draws the number of red and blue keys each player and team has,
@@ -929,7 +723,7 @@ class Game:
         spacing = 50  # Increased space between rows for larger elements
 
         # Create a larger font for the key counts
-        larger_font = pygame.font.Font(None, 32)  # Use size 32 for even larger text
+        larger_font = font_cache.get_font(None, 32)  # Use size 32 for even larger text
 
         # Draw individual player key counts
         for i, unit in enumerate(self.units):
@@ -939,23 +733,23 @@ class Game:
 
                 # Draw unit image
                 self.screen.blit(
-                    pygame.transform.scale(unit.image, (unit_icon_size, unit_icon_size)),
+                    surface_cache.get_scaled(unit.image, (unit_icon_size, unit_icon_size)),
                     (x_offset, player_y)
                 )
 
                 # Draw key images and counts
                 self.screen.blit(
-                    pygame.transform.scale(self.red_key_img, (key_icon_size, key_icon_size)),
+                    surface_cache.get_scaled(self.red_key_img, (key_icon_size, key_icon_size)),
                     (x_offset + unit_icon_size + 110, player_y)
                 )
                 self.screen.blit(
-                    pygame.transform.scale(self.blue_key_img, (key_icon_size, key_icon_size)),
+                    surface_cache.get_scaled(self.blue_key_img, (key_icon_size, key_icon_size)),
                     (x_offset + unit_icon_size + 20, player_y)
                 )  # More space between key images
 
                 # Draw key count texts with updated font size and white color
-                red_key_count_text = larger_font.render(str(unit.red_keys), True, (200, 156, 56))
-                blue_key_count_text = larger_font.render(str(unit.blue_keys), True, (200, 156, 56))
+                red_key_count_text = font_cache.render(larger_font, str(unit.red_keys), True, (200, 156, 56))
+                blue_key_count_text = font_cache.render(larger_font, str(unit.blue_keys), True, (200, 156, 56))
                 self.screen.blit(
                     red_key_count_text,
                     (x_offset + unit_icon_size + 110 + key_icon_size + 10, player_y)
@@ -965,8 +759,8 @@ class Game:
                     (x_offset + unit_icon_size + 20 + key_icon_size + 10, player_y)
                 )
     # Draw barrier statuses below key counts
-        red_barrier_text = larger_font.render(f"Red Barrier: {self.red_barrier}", True, (200, 156, 56))
-        blue_barrier_text = larger_font.render(f"Blue Barreir: {self.blue_barrier}", True, (200, 156, 56))
+        red_barrier_text = font_cache.render(larger_font, f"Red Barrier: {self.red_barrier}", True, (200, 156, 56))
+        blue_barrier_text = font_cache.render(larger_font, f"Blue Barreir: {self.blue_barrier}", True, (200, 156, 56))
         self.screen.blit(
             red_barrier_text,
             (x_offset-10 , player_y + key_icon_size + 10)
@@ -984,14 +778,11 @@ class Game:
         Checks if either Nexus is dead and triggers the Game Over screen.
         Returns True if the game is over, False otherwise.
         """
-        for unit in self.units:
-            if unit.unit_type=="base" and unit.health <= 0:
-                # Determine the winner based on the color of the dead Nexus
-                winner_team = "red" if unit.color == "blue" else "blue"
-
-                # Call the game over handler to display the screen and stop further game logic
-                self.game_over_screen(winner_team)
-                return True  # Indicate that the game is over
+        winner_team = self.winner()  # The team whose opponents' Nexus is dead
+        if winner_team is not None:
+            # Call the game over handler to display the screen and stop further game logic
+            self.game_over_screen(winner_team)
+            return True  # Indicate that the game is over
 
         return False  # Continue the game if no Nexus is dead
 
@@ -1003,11 +794,11 @@ class Game:
         Displays a 'Game Over' screen indicating which team won.
         """
         rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
-        self.screen.blit(pygame.transform.scale(self.game_over_image, (SCREEN_WIDTH, SCREEN_HEIGHT)), rect)
+        self.screen.blit(surface_cache.get_scaled(self.game_over_image, (SCREEN_WIDTH, SCREEN_HEIGHT)), rect)
 
         # Set up fonts
-        game_over_font = pygame.font.Font("assets/RussoOne.ttf", 80)  # Large font for "Game Over"
-        winner_font = pygame.font.Font("assets/RussoOne.ttf", 50)     # Smaller font for the winner message
+        game_over_font = font_cache.get_font("assets/RussoOne.ttf", 80)  # Large font for "Game Over"
+        winner_font = font_cache.get_font("assets/RussoOne.ttf", 50)     # Smaller font for the winner message
 
         # Render text surfaces
         game_over_text = game_over_font.render("GAME OVER", True, (255, 255, 255))  # White text
@@ -1036,14 +827,16 @@ class Game:
         while True:  # Allow restarting the game after game over
             self.main_menu()  # Display main menu
             self.units = self.show_menu()
-            self.manage_keys()  # Initializes keys
+            self.start()  # Hands out the keys and opens the first turn
+            self.ai_deciding = None  # A decision left over from the last match is dropped
+            for player in self.ai_players.values():
+                if hasattr(player, "ponder"):
+                    player.ponder(self)  # Think from the first turn on, even when a person starts
 
-            starting_team_color = self.units[self.current_unit_index].color
-            Highlight.update_fog_visibility(self, starting_team_color)
+            self.dirty_regions.invalidate()  # Nothing of the new match is on screen yet
 
             running = True
             while running:
-                self.screen.fill((0, 0, 0))  # Clear the screen
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         pygame.quit()
@@ -1054,40 +847,239 @@ class Game:
                     running = False  # Exit the game loop but go back to the main menu
                     break
 
-                # Draw grid and units
-                self.grid.draw(self.screen)
+                if self.dirty_rects:
+                    self.run_dirty_frame()
+                else:
+                    self.run_frame()
+                self.music.update()
+                self.scheduler.tick(self.is_animating() or self.music.is_fading())  # Full rate keeps fades smooth
+
+                if self.show_stats:
+                    search = f", {self.last_ai_player.report()}" if self.last_ai_player is not None else ""
+                    pygame.display.set_caption(
+                        f"League on Budget - {self.scheduler.frame_rate():.0f} FPS, CPU {self.scheduler.cpu_usage:.0%}{search}"
+                    )
+
+
+
+
+    def is_animating(self):
+        """True while the screen changes on its own or the player holds a key."""
+        # Held keys are polled by handle_turn (arrow repeat, ability keys, space debounce)
+        if any(pygame.key.get_pressed()):
+            return True
+
+        # A computer player is on turn
+        if self.units[self.current_unit_index].color in self.ai_players:
+            return True
+
+        # Pulsing target indicator
+        if self.units[self.current_unit_index].state == "attack":
+            return True
+
+        # Damage numbers fading out
+        current_time = pygame.time.get_ticks()
+        return any(
+            unit.damage_taken != 0 and unit.last_damage_time is not None
+            and current_time - unit.last_damage_time < 1000
+            for unit in self.units
+        )
+
+
+
+
+    def draw_map(self):
+        """Draw the grid, range highlights, fog, pickups and units."""
+        # Draw grid and units
+        self.grid.draw(self.screen)
+
+        # Highlight range for the active unit
+        current_unit = self.units[self.current_unit_index]
+        Highlight.highlight_range(self, current_unit)
+
+        # Render fog of war
+        Highlight.draw_fog(self, self.screen)
+
+        # Display pickups
+        self.pickup.draw_pickups(self.screen, self.visible_tiles)
+
+        # Display units
+        self.draw_units()
+
 
-                # Highlight range for the active unit
-                current_unit = self.units[self.current_unit_index]
-                Highlight.highlight_range(self, current_unit)
 
-                # Render fog of war
-                Highlight.draw_fog(self, self.screen)
 
-                # Display pickups
-                self.pickup.draw_pickups(self.screen, self.visible_tiles)
+    def run_frame(self):
+        """Handle the current turn and redraw the whole screen."""
+        self.screen.fill((0, 0, 0))  # Clear the screen
+        self.draw_map()
 
-                # Display units
-                self.draw_units()
+        # Handle current unit's turn
+        self.handle_turn()
 
-                # Handle current unit's turn
-                self.handle_turn()
+        # Show Info panel
+        self.draw_info_panel()
 
-                # Show Info panel
-                self.draw_info_panel()
+        # Draw HUD
+        self.draw_abilities_bar()
 
-                # Draw HUD
-                self.draw_abilities_bar()
+        # Draw keys
+        self.draw_key_counts()
+
+        pygame.display.flip()
+
+
+
+
+    def run_dirty_frame(self):
+        """
+        Handle the current turn, then redraw and push to the display only the
+        regions that changed since the previous frame (opt-in rendering mode).
+        """
+        self.handle_turn()
+
+        map_rects = self.dirty_map_rects()
+        sidebar_rects, hud_rects = self.dirty_panel_rects()
+
+        if self.dirty_regions.full_redraw:
+            self.dirty_regions.full_redraw = False
+            self.run_frame_without_turn()
+            return
+
+        rects = []
+        if map_rects:
+            # One clipped redraw pass over the union of the changed map areas
+            area = map_rects[0].unionall(map_rects[1:]).clip(MAP_RECT)
+            self.screen.set_clip(area)
+            self.screen.fill((0, 0, 0), area)
+            self.draw_map()
+            self.screen.set_clip(None)
+            rects.append(area)
+
+        # The HUD is drawn over the bottom of the info panel, so it follows it
+        if sidebar_rects:
+            self.draw_info_panel()
+            rects.append(SIDEBAR_RECT)
+        if sidebar_rects or hud_rects:
+            self.draw_abilities_bar()
+            rects.append(HUD_RECT)
+        if sidebar_rects:
+            self.draw_key_counts()
+
+        if rects:
+            pygame.display.update(rects)
+
+
+
+
+    def run_frame_without_turn(self):
+        """Full redraw used by the dirty-rectangle mode when the whole screen is stale."""
+        self.screen.fill((0, 0, 0))
+        self.draw_map()
+        self.draw_info_panel()
+        self.draw_abilities_bar()
+        self.draw_key_counts()
+        pygame.display.flip()
 
-                # Draw keys
-                self.draw_key_counts()
 
-                pygame.display.flip()
-                self.clock.tick(FPS)
+
+
+    def dirty_map_rects(self):
+        """Return the map areas whose content changed since the previous frame."""
+        dirty = self.dirty_regions
+        current_unit = self.units[self.current_unit_index]
+        current_team_color = current_unit.color
+        current_time = pygame.time.get_ticks()
+
+        # Turn, phase, ability, fog, terrain or pickup changes repaint the whole map
+        rects = dirty.track("map", (
+            self.current_unit_index,
+            current_unit.state,
+            current_unit.selected_ability,
+            current_unit.initial_x,
+            current_unit.initial_y,
+            self.visible_tiles,
+            self.grid.terrain_layer.rebuild_count,
+            tuple((p.x, p.y, p.overlay) for p in self.pickup.all_pickups),
+        ), MAP_RECT)
+        if rects:
+            return rects
+
+        # Attack cursor: its area of effect, redrawn when it moves or the indicator pulses
+        if current_unit.state == "attack":
+            aoe_range = current_unit.selected_ability.is_aoe if current_unit.selected_ability else 0
+            pulse = (current_time % 1000) * range_overlays.indicator_frames // 1000
+            margin = CELL_SIZE // 4  # The indicator is larger than a cell
+            cursor_rect = pygame.Rect(
+                (current_unit.target_x - aoe_range) * CELL_SIZE - margin,
+                (current_unit.target_y - aoe_range) * CELL_SIZE - margin,
+                (2 * aoe_range + 1) * CELL_SIZE + 2 * margin,
+                (2 * aoe_range + 1) * CELL_SIZE + 2 * margin,
+            )
+            rects += dirty.track("cursor", (pulse, tuple(cursor_rect)), cursor_rect)  # Moving the cursor repaints both areas
+
+        # Units: position, health bar, status arrows, visibility and damage text animation
+        for index, unit in enumerate(self.units):
+            visible = unit.alive and (
+                unit.color == current_team_color
+                or bool(self.shown_mask[unit.x, unit.y])
+            )
+            animating = (
+                unit.damage_taken != 0 and unit.last_damage_time is not None
+                and current_time - unit.last_damage_time < 1000
+            )
+            signature = (
+                visible, unit.x, unit.y, unit.health, unit.max_health,
+                unit.buff_duration > 0, unit.debuff_duration > 0,
+                getattr(unit, "barrier_status", None),
+                current_time if animating else unit.damage_taken != 0,
+            )
+            # Damage text and the Nexus barrier label overflow the cell
+            footprint = pygame.Rect(unit.x * CELL_SIZE - 30, unit.y * CELL_SIZE - 22, CELL_SIZE + 60, CELL_SIZE + 22)
+            rects += dirty.track(("unit", index), signature, footprint)
+
+        return rects
+
+
+
+
+    def dirty_panel_rects(self):
+        """Return the (info panel and key counts, HUD) rects that need repainting."""
+        dirty = self.dirty_regions
+        current_unit = self.units[self.current_unit_index]
+
+        if self.info_panel_surface is None:
+            self.info_panel_surface = self.compose_info_panel()
+        sidebar_rects = dirty.track("sidebar", (
+            self.info_panel_surface,
+            tuple((unit.red_keys, unit.blue_keys) for unit in self.units if unit.unit_type == "player"),
+            self.red_barrier,
+            self.blue_barrier,
+        ), SIDEBAR_RECT)
+
+        hud_rects = dirty.track("hud", (
+            self.current_unit_index,
+            current_unit.health,
+            current_unit.max_health,
+            current_unit.mana,
+            current_unit.max_mana,
+            current_unit.selected_ability,
+            tuple(ability.remaining_cooldown for ability in current_unit.abilities),
+        ), HUD_RECT)
+
+        return sidebar_rects, hud_rects
 
 # Run the game
 if __name__ == "__main__":
-    Game().run()
+    Game(
+        dirty_rects="--dirty-rects" in sys.argv,
+        throttle="--no-throttle" not in sys.argv,
+        show_stats="--stats" in sys.argv,
+        asset_bundle=None if "--loose-assets" in sys.argv else BUNDLE_FILE,
+        # --ai-red plays red with alpha-beta, --ai-red=mcts with MCTS (likewise for blue)
+        seats={arg[len("--ai-"):].partition("=")[0]: arg.partition("=")[2] or "alphabeta"
+               for arg in sys.argv if arg.startswith(("--ai-blue", "--ai-red"))},
+    ).run()
 
 
 
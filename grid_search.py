@@ -0,0 +1,204 @@
+from array import array
+from collections import deque
+from heapq import heappop, heappush
+
+
+# 4-connected neighbourhood used by every search (left, right, up, down)
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# Neighbour table of each grid shape (width, height); it never changes, so boards share it
+NEIGHBORS = {}
+
+# Vision tables by (width, height, traversable cells): (flat index, radius) -> bitset of the visible cells.
+# Vision only depends on the terrain, so every board with the same layout fills and reads the same table.
+VISION_TABLES = {}
+
+
+# Grid Search Class
+class GridSearch:
+    """
+    Breadth-first and weighted (Dijkstra) searches over a rectangular grid.
+    Cells are flat indices (index = x * height + y, matching grid.tiles[x][y]),
+    the queue is a deque and the visited buffer is preallocated once per grid.
+    """
+    def __init__(self, width, height, traversable, move_cost):
+        """
+        :param width: Number of columns (x).
+        :param height: Number of rows (y).
+        :param traversable: Flat sequence of booleans, one per cell.
+        :param move_cost: Flat sequence of movement costs, one per cell.
+        """
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.traversable = bytearray(1 if t else 0 for t in traversable)
+        self.move_cost = list(move_cost)
+
+        # Neighbour indices of every cell, computed once per grid shape and shared by every search on it
+        self.neighbors = NEIGHBORS.get((width, height))
+        if self.neighbors is None:
+            self.neighbors = NEIGHBORS[width, height] = tuple(
+                tuple(
+                    (x + dx) * height + y + dy
+                    for dx, dy in DIRECTIONS
+                    if 0 <= x + dx < width and 0 <= y + dy < height
+                )
+                for x, y in (divmod(i, height) for i in range(self.size))
+            )
+
+        # Visited marks: a cell is visited when its mark equals the current search stamp,
+        # so the buffer never has to be cleared between searches
+        self.visited = array("I", bytes(4 * self.size))
+        self.stamp = 0
+        self.queue = deque()
+        self.vision = VISION_TABLES.setdefault((width, height, bytes(self.traversable)), {})
+
+
+
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Build the search tables from a Grid's tiles."""
+        tiles = [tile for column in grid.tiles for tile in column]
+        return cls(
+            len(grid.tiles),
+            len(grid.tiles[0]),
+            [tile.traversable for tile in tiles],
+            [tile.move_cost for tile in tiles],
+        )
+
+
+
+
+    def index(self, x, y):
+        return x * self.height + y
+
+
+
+
+    def position(self, index):
+        return divmod(index, self.height)
+
+
+
+
+    def next_stamp(self):
+        """Start a new search, invalidating every previous visited mark."""
+        self.stamp += 1
+        if self.stamp >= 0xFFFFFFFF:  # Wrap around before the marks overflow
+            self.visited = array("I", bytes(4 * self.size))
+            self.stamp = 1
+        return self.stamp
+
+
+
+
+    def visible_from(self, x, y, radius):
+        """
+        Cells lit from (x, y) within `radius` steps. Light spreads through traversable cells;
+        a blocking cell is lit but stops the propagation.
+        :return: List of flat indices.
+        """
+        stamp = self.next_stamp()
+        visited = self.visited
+        traversable = self.traversable
+        neighbors = self.neighbors
+        queue = self.queue
+        queue.clear()
+
+        start = x * self.height + y
+        visited[start] = stamp
+        visible = [start]
+        queue.append((start, 0))
+
+        while queue:
+            i, distance = queue.popleft()
+            if distance == radius:
+                continue
+            for n in neighbors[i]:
+                if visited[n] != stamp:
+                    visited[n] = stamp
+                    visible.append(n)
+                    if traversable[n]:
+                        queue.append((n, distance + 1))
+
+        return visible
+
+
+
+
+    def vision_bits(self, x, y, radius):
+        """
+        visible_from(x, y, radius) as an int bitset, bit i standing for flat index i.
+        Computed on first use and kept in the layout's vision table; a team's vision is the OR of its units' bitsets.
+        """
+        key = (x * self.height + y, radius)
+        bits = self.vision.get(key)
+        if bits is None:
+            bits = 0
+            for i in self.visible_from(x, y, radius):
+                bits |= 1 << i
+            self.vision[key] = bits
+        return bits
+
+
+
+
+    def reachable_from(self, x, y, budget):
+        """
+        Traversable cells whose cheapest path from (x, y) costs at most `budget` (Dijkstra).
+        :return: Dict of flat index -> cheapest path cost.
+        """
+        start = x * self.height + y
+        if not self.traversable[start]:
+            return {}
+
+        move_cost = self.move_cost
+        neighbors = self.neighbors
+        best = {start: 0}
+        heap = [(0, start)]
+
+        while heap:
+            cost, i = heappop(heap)
+            if cost > best[i]:
+                continue  # Stale entry, a cheaper path was already expanded
+            for n in neighbors[i]:
+                next_cost = cost + move_cost[n]
+                if next_cost <= budget and next_cost < best.get(n, next_cost + 1):
+                    best[n] = next_cost
+                    heappush(heap, (next_cost, n))
+
+        return best
+
+
+
+
+# Manhattan-diamond stencils, one list of (dx, dy) offsets per radius
+diamond_stencils = {}
+
+
+
+
+def diamond_offsets(radius):
+    """Offsets within Manhattan distance `radius` of the centre, computed once per radius."""
+    offsets = diamond_stencils.get(radius)
+    if offsets is None:
+        offsets = [
+            (dx, dy)
+            for dx in range(-radius, radius + 1)
+            for dy in range(-radius, radius + 1)
+            if abs(dx) + abs(dy) <= radius
+        ]
+        diamond_stencils[radius] = offsets
+    return offsets
+
+
+
+
+def diamond_cells(x, y, radius, width, height):
+    """Cells within Manhattan distance `radius` of (x, y), clipped to a width x height grid."""
+    return [
+        (x + dx, y + dy)
+        for dx, dy in diamond_offsets(radius)
+        if 0 <= x + dx < width and 0 <= y + dy < height
+    ]
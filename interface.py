@@ -1,30 +1,27 @@
 import pygame
-import random 
+import numpy as np
 from sounds import *
+from cache import surface_cache, font_cache
+from grid_search import diamond_offsets, diamond_cells
+from engine import TileState, Board, PickupState, GRID_SIZE
+from terrain_map import TerrainMap
 
 # Constants
-GRID_SIZE = 21
 CELL_SIZE = 43
 
 ##addign the types of potions 
 
 
 # Tile Class
-class Tile:
+class Tile(TileState):
     """Represents a single tile in the grid."""
+    __slots__ = ("textures_file", "texture")  # Keeps the tiles free of a per-instance dict, like TileState
+
     def __init__(self, x, y, terrain, textures_file, overlay=None):
-        self.x = x
-        self.y = y
-        self.terrain = terrain  # "grass", "water", or "rock"
-        self.overlay = overlay  # Optional overlay: "bush", "barrier"
+        super().__init__(x, y, terrain, overlay)
         self.textures_file = textures_file
-        self.traversable = terrain in ["grass", "water"]  # Grass and water are traversable
-        self.highlighted = False  
-                
-        # Assign move cost based on terrain type
-        self.move_cost = {"grass": 1, "water": 2, "rock": float("inf")}[terrain]
-        
-        
+
+
 
 
     def draw_tile(self, screen):
@@ -46,32 +43,14 @@ class Tile:
 
 
 
-class Pickup:
+class Pickup(PickupState):
+    """Potions on the map, drawn and with their sound (the rules are in PickupState)."""
     def __init__(self, x=None, y=None, overlay=None, spawn_turn=None):
+        super().__init__(x, y, overlay, spawn_turn)
         if x is None and y is None and overlay is None and spawn_turn is None:
             # This is the manager instance
-            self.all_pickups = []
             self.textures_file = None
-            self.turn_count = 0
-            self.allowed_tile_types = ["grass", "water"]
-
-            self.pickup_types = {
-                "red_potion":   {"rarity": 0.8},
-                "blue_potion":  {"rarity": 0.8},
-                "green_potion": {"rarity": 0.3},
-                "golden_potion":{"rarity": 0.2},
-                "black_potion": {"rarity": 0.2},
-            }
-
-            self.next_spawn_turns = {}
-            self.sound = Sounds() 
-        else:
-            # This is a pickup item instance
-            self.x = x
-            self.y = y
-            self.overlay = overlay
-            self.spawn_turn = spawn_turn
-            self.picked = False
+            self.sound = sound_bank
 
 
 
@@ -79,40 +58,7 @@ class Pickup:
     def initialize(self, textures_file):
         """Initialize the pickup system and set initial next spawn attempts."""
         self.textures_file = textures_file
-        for p_type in self.pickup_types:
-            self.next_spawn_turns[p_type] = random.randint(5, 8)
-
-
-
-
-    def update(self, turn_count, grid):
-        """Update all pickups and attempt spawns each turn (manager only)."""
-        self.turn_count = turn_count
-
-        # Remove pickups that have stayed 15 turns without being picked
-        for p in self.all_pickups[:]:
-            if not p.picked and (self.turn_count - p.spawn_turn >= 15):
-                self.remove_pickup(p)
-
-        # Attempt to spawn each pickup type if it's time
-        for p_type, config in self.pickup_types.items():
-            if self.turn_count >= self.next_spawn_turns[p_type]:
-                if len(self.all_pickups) < 10:
-                    # Check rarity
-                    if random.random() < config["rarity"]:
-                        x, y = self.get_random_spawn_location(grid)
-                        self.spawn_single_pickup(x, y, p_type, self.turn_count)
-                    else:
-                        # Not spawned this turn, try again soon
-                        self.next_spawn_turns[p_type] = self.turn_count + random.randint(1, 3)
-
-
-
-
-    def spawn_single_pickup(self, x, y, overlay, spawn_turn):
-        """Create and store a single pickup item instance."""
-        new_pickup = Pickup(x, y, overlay, spawn_turn)
-        self.all_pickups.append(new_pickup)
+        super().initialize()
 
 
 
@@ -125,132 +71,170 @@ class Pickup:
             if not p.picked and (p.x, p.y) in visible_tiles:
                 texture = self.textures_file[p.overlay]
                 rect = pygame.Rect(p.x * CELL_SIZE+CELL_SIZE/4, p.y * CELL_SIZE+CELL_SIZE/4, CELL_SIZE/2, CELL_SIZE/2)
-                screen.blit(pygame.transform.scale(texture, (CELL_SIZE/2, CELL_SIZE/2)), rect)
+                screen.blit(surface_cache.get_scaled(texture, (CELL_SIZE/2, CELL_SIZE/2)), rect)
 
 
 
 
     def picked_used(self, unit, pickup):
         """Apply the effect of this pickup to the unit and remove it (manager only)."""
-        if not pickup.picked:
-            if pickup.overlay == "red_potion":    #heals 30% missing health
-                heal_amount = int((unit.max_health-unit.health )* 0.3)
-                unit.attack(unit, -heal_amount)
-            elif pickup.overlay == "blue_potion": #full mana regeneration
-                unit.mana = unit.max_mana
-            elif pickup.overlay == "green_potion": #100 increase of max health and heal for 33% missing health 
-                increase = 100
-                unit.max_health += increase
-                heal_amount = (unit.max_health - unit.health)//3  
-                unit.attack(unit, -heal_amount)
-            elif pickup.overlay == "golden_potion": #reduces remaining cooldowns by 50%
-                for ability in unit.abilities:
-                    ability.remaining_cooldown //= 2
-            elif pickup.overlay == "black_potion": #reduces remaining cooldowns by 50%
-                for ability in unit.abilities:
-                    unit.crit_chance += 5
+        super().picked_used(unit, pickup)
 
         # Play the potion sound
         self.sound.play("potion")
 
-        #mark as picked and remove
-        pickup.picked = True
-        self.remove_pickup(pickup)
 
 
+# permanently increases the critical chance by 10%        
 
 
-    def remove_pickup(self, pickup):
-        """Remove a pickup and schedule next spawn attempt (manager only)."""
-        if pickup in self.all_pickups:
-            self.all_pickups.remove(pickup)
-        delay = random.randint(15, 20)
-        self.next_spawn_turns[pickup.overlay] = self.turn_count + delay
+# Terrain Layer Class
+class TerrainLayer:
+    """Pre-composited surface of the static map, rebuilt only when marked dirty."""
+    def __init__(self, grid):
+        self.grid = grid
+        self.surface = None
+        self.dirty = True
+        self.rebuild_count = 0  # How many times the map was re-composited
 
 
 
 
-    def get_random_spawn_location(self, grid):
-        """Get a random allowed cell for spawning."""
-        while True:
-            x = random.randint(0, GRID_SIZE - 1)
-            y = random.randint(0, GRID_SIZE - 1)
-            tile_type = grid.tiles[x][y].terrain
-            if tile_type in self.allowed_tile_types :
-                return x, y
-            # If not allowed, loop again until we find a suitable tile
+    def mark_dirty(self):
+        """Request a rebuild on the next draw (e.g. after an overlay change)."""
+        self.dirty = True
+
+
+
+
+    def rebuild(self):
+        """Render every tile once into the cached surface."""
+        size = self.grid.size * CELL_SIZE
+        self.surface = pygame.Surface((size, size))
+
+        # Scale each texture once instead of once per tile
+        scaled = {
+            name: surface_cache.get_scaled(texture, (CELL_SIZE, CELL_SIZE))
+            for name, texture in self.grid.textures_file.items()
+        }
+        for row in self.grid.tiles:
+            for tile in row:
+                rect = pygame.Rect(tile.x * CELL_SIZE, tile.y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                self.surface.blit(scaled[tile.terrain], rect)
+                if tile.overlay:
+                    self.surface.blit(scaled[tile.overlay], rect)
+
+        self.dirty = False
+        self.rebuild_count += 1
+
+
+
+
+    def draw(self, screen):
+        """Blit the whole map in a single call, rebuilding it first if needed."""
+        if self.dirty or self.surface is None:
+            self.rebuild()
+        screen.blit(self.surface, (0, 0))
 
 
 
-# permanently increases the critical chance by 10%        
 
 
 # Grid Class
-class Grid:
+class Grid(Board):
     """Manages the entire grid."""
     def __init__(self, size, textures_file):
-        self.size = size
         self.textures_file = textures_file
-        self.tiles = self.create_grid()
+        super().__init__(size)
         self.highlight=Highlight(self.textures_file)
-        
+        self.terrain_layer = TerrainLayer(self)
 
 
 
-    def create_grid(self):
-        """Create the grid with predefined terrain and overlays."""
-        grid = [[Tile(x, y, "grass", self.textures_file) for y in range(self.size)] for x in range(self.size)]
-
-        # Add water (lakes)
-        lakes = [
-            [(5, 5), (5, 6), (6, 5), (6, 6), (7, 6)],  
-            [(10, 7), (11, 6), (11, 7), (12, 6),(12,7)],  
-            [(8, 13),(9, 13), (8, 14), (9, 14), (10, 13)], 
-            [(13, 14), (14, 14), (14, 15), (15, 14), (15, 15)],  
-        ]
-        for lake in lakes:
-            for x, y in lake:
-                grid[x][y] = Tile(x, y, "water", self.textures_file)
-
-        # Add rocks (hills)
-        hills = [
-    
-            [(2, 4), (2, 5), (2, 6),(2,12), (3, 3),(3, 4), (3, 5),(3,6),(3,10),(3,11),(3,12),
-            (3,13),(3,14),(4, 3), (5, 3),(5,8),(5,10),(5,12),(6,3),(6, 8), (6, 9),
-            (6,10),(6,12),(6,13),(6,17),(7,8),(7,12),(7,16),(7,17),(8,11),(8,15),(8,16),(8,17),
-            (9, 3), (9, 8), (9, 12), (9, 16), (9, 17),(10,2),(10,3),(10,8),(10,12),(10,17),(10,18),
-            (11,3),(11,4),(11,8),(11,12),(11,17),(12,3),(12,4),(12,5),(12,9),(13,3),(13,4),(13,8),(13,12),
-            (14,3),(14,7),(14,8),(14,10),(14,11),(14,12),(14,17),(15,8),(15,10),(15,12),(15,17),(16,17),
-            (17,6),(17,7),(17,8),(17,9),(17,10),(17,14),(17,15),(17,16),(17,17),
-            (18,8),(18,14),(18,15),(18,16),
-            ]
-            ]
-        for hill in hills:
-            for x, y in hill:
-                grid[x][y] = Tile(x, y, "rock", self.textures_file)
-
-        # Add overlays (bushes, barriers)
-        overlays = {
-            "bush": [(0, 0), (1, 0), (0, 1), (20, 20), (19, 20), (20, 19), (3, 7), (3, 8), (8, 3), (17, 12), (17, 13), (12, 17)],
-            "barrier": [(0, 17), (1, 17), (2, 17), (3, 17), (3, 18), (3, 19), (3, 20), (17, 0), (17, 1), (17, 2), (17, 3), (18, 3), (19, 3), (20, 3)],
 
-            
-        }
-        for overlay_type, positions in overlays.items():
-            for x, y in positions:
-                grid[x][y].overlay = overlay_type
+    def make_tile(self, x, y, terrain):
+        return Tile(x, y, terrain, self.textures_file)
+
+
+
 
-        return grid
+    def set_overlay(self, x, y, overlay):
+        """Change the overlay of a tile and invalidate the cached terrain layer."""
+        if self.tiles[x][y].overlay != overlay:
+            super().set_overlay(x, y, overlay)
+            self.terrain_layer.mark_dirty()
 
 
 
 
     def draw(self, screen):
-        """Draw all tiles in the grid."""
-        for row in self.tiles:
-            for tile in row:
-                tile.draw_tile(screen)
+        """Draw all tiles in the grid from the cached terrain layer."""
+        self.terrain_layer.draw(screen)
+
+
+
+
+
+# Range Overlays Class
+class RangeOverlays:
+    """Pre-rendered attack range diamonds and pulsing target indicator frames."""
+    def __init__(self, indicator_frames=20):
+        self.diamonds = {}  # (radius, color) -> surface covering the whole diamond
+        self.indicator_frames = indicator_frames  # Alpha steps per one-second pulse
+        self.grid_rect = pygame.Rect(0, 0, GRID_SIZE * CELL_SIZE, GRID_SIZE * CELL_SIZE)
+
+
+
+
+    def get_diamond(self, radius, color):
+        """Return the overlay for every cell within Manhattan distance `radius`, rendered once."""
+        key = (radius, color)
+        surface = self.diamonds.get(key)
+        if surface is None:
+            side = (2 * radius + 1) * CELL_SIZE
+            surface = pygame.Surface((side, side), pygame.SRCALPHA)
+            surface.fill((0, 0, 0, 0))
+            for dx, dy in diamond_offsets(radius):
+                rect = pygame.Rect((dx + radius) * CELL_SIZE, (dy + radius) * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                surface.fill(color, rect)
+            self.diamonds[key] = surface
+        return surface
+
+
+
 
+    def draw_range(self, screen, x, y, radius, color):
+        """Blit the range diamond centred on (x, y), clipped to the grid."""
+        surface = self.get_diamond(radius, color)
+        left, top = (x - radius) * CELL_SIZE, (y - radius) * CELL_SIZE
+        visible = pygame.Rect(left, top, surface.get_width(), surface.get_height()).clip(self.grid_rect)
+        screen.blit(surface, visible.topleft, visible.move(-left, -top))
+
+
+
+
+    def indicator_frame(self, image, ticks):
+        """
+        Return the indicator for the current point of its pulse and its offset inside a cell.
+        The alpha is quantized so only `indicator_frames` surfaces are ever scaled.
+        """
+        frame = (ticks % 1000) * self.indicator_frames // 1000
+        indicator_size = CELL_SIZE * 1.2  # Slightly larger than a cell
+        offset = int((CELL_SIZE - indicator_size) // 2)  # Center the indicator within the target tile
+        return surface_cache.get_scaled(image, (indicator_size, indicator_size), self.frame_alpha(frame)), offset
+
+
+
+
+    def frame_alpha(self, frame):
+        """Alpha of the indicator at step `frame` of its pulse."""
+        return int(180 + 70 * (frame * 1000 / self.indicator_frames / 500 - 1))  # Smoother alpha transition
+
+
+
+
+# Shared by every highlight_range call
+range_overlays = RangeOverlays()
 
 
 
@@ -261,6 +245,10 @@ class Highlight:
     def __init__(self,textures_file):
         
         self.visible_tiles = set()
+        self.visible_bits = 0  # visible_tiles as a bitset of flat indices
+        self.visible_mask = np.zeros((GRID_SIZE, GRID_SIZE), dtype=bool)  # visible_tiles as an array
+        self.shown_mask = self.visible_mask  # Cells where enemies are drawn: visible and not in a bush
+        self.fog_surface = None  # Cached fog of war, rebuilt when visible_tiles changes
         self.textures_file=textures_file
         
 
@@ -270,33 +258,11 @@ class Highlight:
         """Highlight movement or attack range based on the unit's state."""
         overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)  # Transparent overlay
 
-        for row in self.grid.tiles:
-            for tile in row:
-                tile.highlighted = False 
-
         if unit.state == "move":
-            visited = set()
-            queue = [(unit.initial_x, unit.initial_y, 0)]  # (x, y, current_distance)
-            
-            while queue:
-                x, y, cost = queue.pop(0)
-                if (x, y) in visited or cost > unit.move_range:  # Skip already visited or out-of-range tiles
-                    continue
-                visited.add((x, y))
-
-                if self.grid.tiles[x][y].traversable:
-                    self.grid.tiles[x][y].highlighted = True
-                    overlay.fill((50, 150, 255, 100))  # Blue with transparency
-                    rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                    self.screen.blit(overlay, rect)  # Highlight this tile
-
-                    # Check cardinal directions for next tiles
-                    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                        nx, ny = x + dx, y + dy
-                        if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:  # Ensure within bounds
-                            next_cost = cost + self.grid.tiles[nx][ny].move_cost
-                            if next_cost <= unit.move_range and (nx, ny) not in visited:
-                                queue.append((nx, ny, next_cost))
+            overlay.fill((50, 150, 255, 100))  # Blue with transparency
+            for x, y in unit.update_reachable_tiles(self.grid):
+                rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                self.screen.blit(overlay, rect)  # Highlight this tile
 
                         
         elif unit.state == "attack":
@@ -308,36 +274,14 @@ class Highlight:
                 attack_range = unit.attack_range
                 aoe_range = 0
 
-            # Highlight the attack range
-            for dx in range(-attack_range, attack_range + 1):
-                for dy in range(-attack_range, attack_range + 1):
-                    x, y = unit.x + dx, unit.y + dy
-                    if (0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE and
-                            abs(dx) + abs(dy) <= attack_range):  # Manhattan distance restriction
-                        overlay.fill((250, 0, 250, 50) if unit.selected_ability else (250, 0, 0, 50))  
-                        # Green for ability, red for normal attack
-                        rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                        self.screen.blit(overlay, rect)
-
+            # Highlight the attack range with a single pre-rendered diamond
+            range_color = (250, 0, 250, 50) if unit.selected_ability else (250, 0, 0, 50)  # Purple for ability, red for normal attack
+            range_overlays.draw_range(self.screen, unit.x, unit.y, attack_range, range_color)
 
-            for dx in range(-aoe_range,aoe_range+1):
-                for dy in range(-aoe_range,aoe_range+1):
-                    x, y = unit.target_x + dx, unit.target_y + dy
-
-                    if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE and abs(dx) + abs(dy) <= aoe_range:
-                    # Highlight the target cursor
-                        target_rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                        beat_scale = 100  # Indicator scale percentage
-                        beat_alpha = 180 + 70 * (pygame.time.get_ticks() % 1000 / 500 - 1)  # Smoother alpha transition
-                        indicator_size = int(CELL_SIZE * beat_scale / 100)*1.2  # Scale the indicator image
-                        indicator_image = pygame.transform.scale(self.indicators["redsquare"], (indicator_size, indicator_size))
-                        indicator_image.set_alpha(beat_alpha)
-
-                        # Center the scaled indicator within the target tile
-                        indicator_x = target_rect.x + (CELL_SIZE - indicator_size) // 2
-                        indicator_y = target_rect.y + (CELL_SIZE - indicator_size) // 2
-
-                        self.screen.blit(indicator_image, (indicator_x, indicator_y))
+            # Highlight the target cursor (and its area of effect) with the pulsing indicator
+            indicator_image, offset = range_overlays.indicator_frame(self.indicators["redsquare"], pygame.time.get_ticks())
+            for x, y in diamond_cells(unit.target_x, unit.target_y, aoe_range, GRID_SIZE, GRID_SIZE):
+                self.screen.blit(indicator_image, (x * CELL_SIZE + offset, y * CELL_SIZE + offset))
 
 
 
@@ -347,79 +291,55 @@ class Highlight:
         Update the set of visible tiles based on all members of the team.
         :param team_color: Color of the current team.
         """
-        self.visible_tiles = set()  # Reset visible tiles
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Light propagation directions
+        search = self.grid.search
+        visible = 0
 
-        # Process visibility for each unit on the team
+        # Combine the precomputed vision of each unit on the team
         for unit in self.units:
             if unit.color == team_color and unit.alive:
+                # Visibility range slightly larger than movement
+                visible |= search.vision_bits(unit.x, unit.y, unit.move_range + 2)
 
-                # BFS for this unit's visibility
-                queue = [(unit.x, unit.y, 0)]  # BFS queue: (x, y, distance)
-                max_visibility = unit.move_range + 2  # Visibility range slightly larger than movement
-
-                # Local set to track tiles visible by this unit
-                unit_visible_tiles = set()
-
-                while queue:
-                    x, y, distance = queue.pop(0)
-
-                    # Stop propagation if the distance exceeds the visibility range
-                    if distance > max_visibility:
-                        continue
-
-                    # Mark tile as visible for this unit
-                    unit_visible_tiles.add((x, y))
-
-                    # Propagate light in all directions
-                    for dx, dy in directions:
-                        nx, ny = x + dx, y + dy
-                        if (
-                            0 <= nx < GRID_SIZE
-                            and 0 <= ny < GRID_SIZE
-                            and (nx, ny) not in unit_visible_tiles
-                            and distance + 1 <= max_visibility
-                        ):
-                            # If the tile is non-traversable, stop propagation in this direction
-                            if not self.grid.tiles[nx][ny].traversable:
-                                unit_visible_tiles.add((nx, ny))  # Add for visual accuracy
-                                continue
-
-                            # Add to queue to continue propagation
-                            queue.append((nx, ny, distance + 1))
-
-                # Add this unit's visibility to the team's visibility
-                self.visible_tiles.update(unit_visible_tiles)
-                
-                
-
-        # Final combined visible tiles
-    def draw_fog(self,screen):
- 
-        """Draw the fog of war and dim lighting based on the visible tiles."""
-        
-        fog_overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
-        fog_overlay.fill((0, 0, 0, 170))  # Dark fog (alpha = 200)
+        # The visible tiles and the fog surface are only rebuilt if the vision changed
+        if visible != self.visible_bits:
+            self.visible_bits = visible
+            self.visible_mask = self.grid.terrain_map.mask_from_bits(visible)
+            self.shown_mask = self.visible_mask & ~self.grid.terrain_map.bush
+            self.visible_tiles = set(zip(*(axis.tolist() for axis in np.nonzero(self.visible_mask))))
+            self.fog_surface = None
 
-        dim_overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
-        dim_overlay.fill((50, 50, 50, 85))  # Dim lighting (alpha = 100)
 
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Light propagation directions
 
-        for x in range(GRID_SIZE):
-            for y in range(GRID_SIZE):
-                rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                if (x, y) not in self.visible_tiles:
-                    # Fully fogged areas
-                    screen.blit(fog_overlay, rect)   
-                elif (x, y) in self.visible_tiles and any(
-                    (x + dx, y + dy) not in self.visible_tiles for dx, dy in directions
-                ):
-                    # Dim lighting at the edges of visibility
-                    screen.blit(dim_overlay, rect)
+
+    def build_fog_surface(self):
+        """Render the fog and the dim edges of the visible area into one full-map surface."""
+        # One pixel per cell, scaled up (nearest neighbour) to the map size in a single call
+        cells = pygame.Surface(self.visible_mask.shape, pygame.SRCALPHA)
+        cells.fill((0, 0, 0, 0))
+
+        fogged = ~self.visible_mask  # Fully fogged areas: dark fog
+        dim = TerrainMap.edges(self.visible_mask)  # Dim lighting at the edges of visibility
+        colors = pygame.surfarray.pixels3d(cells)
+        colors[dim] = (50, 50, 50)
+        del colors  # Release the surface lock
+        alpha = pygame.surfarray.pixels_alpha(cells)
+        alpha[fogged] = 170
+        alpha[dim] = 85
+        del alpha
+
+        return pygame.transform.scale(cells, (GRID_SIZE * CELL_SIZE, GRID_SIZE * CELL_SIZE))
+
+
+
+
+    def draw_fog(self,screen):
+        """Draw the fog of war and dim lighting based on the visible tiles."""
+        if self.fog_surface is None:
+            self.fog_surface = Highlight.build_fog_surface(self)
+        screen.blit(self.fog_surface, (0, 0))
+
 
 
-                    
 
     def show_buff_animation(self, screen, buff_image, key_message="You won a key"):
         """Displays a buff animation after a monster is defeated."""
@@ -463,15 +383,55 @@ class Highlight:
 
             
             if time_elapsed > duration - 1500:
-                font = pygame.font.Font("assets/RussoOne.ttf", 50)
-                text_surface = font.render(key_message, True, (0,0,0))
+                font = font_cache.get_font("assets/RussoOne.ttf", 50)
+                text_surface = font_cache.render(font, key_message, True, (0,0,0))
                 text_rect = text_surface.get_rect(center=(center_x, center_y + 100))
                 screen.blit(text_surface, text_rect)
-                text_surface1 = font.render(key_message, True, (0, 255,0))
+                text_surface1 = font_cache.render(font, key_message, True, (0, 255,0))
                 text_rect1 = text_surface1.get_rect(center=(center_x + 2, center_y + 102))
                 screen.blit(text_surface1, text_rect1)
 
             pygame.display.flip()
             clock.tick(60)
 
+        # The animation drew over the whole screen
+        self.dirty_regions.invalidate()
+
+
 
+
+
+
+# Dirty Regions Class
+class DirtyRegions:
+    """
+    Remembers what each screen region showed on the previous frame, for the opt-in
+    dirty-rectangle rendering mode. A region is repainted only when its signature changes.
+    """
+    def __init__(self):
+        self.regions = {}  # key -> (signature, rect) as drawn on the previous frame
+        self.full_redraw = True  # Repaint and flip the whole screen on the next frame
+
+
+
+
+    def invalidate(self):
+        """Forget everything, e.g. after another screen (animation, menu) was drawn over the game."""
+        self.regions.clear()
+        self.full_redraw = True
+
+
+
+
+    def track(self, key, signature, rect):
+        """
+        Record what region `key` shows this frame.
+        :return: The rects to repaint (previous and current area) if the signature changed, else [].
+        """
+        previous = self.regions.get(key)
+        if previous is not None and previous[0] == signature:
+            return []
+        self.regions[key] = (signature, rect)
+        if previous is None or previous[1] == rect:
+            return [rect]
+        return [previous[1], rect]
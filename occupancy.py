@@ -0,0 +1,114 @@
+"""
+Position index of the units of a match: which units stand on a cell, and which cells of a
+Manhattan diamond are occupied, without scanning the whole unit list.
+"""
+
+
+
+
+# Occupancy Class
+class Occupancy:
+    """
+    Units by cell. Every unit is filed under the cell it stood on when last placed, dead ones
+    included (queries skip them), so only position changes have to be reported through place().
+    Units sharing a cell are kept in turn order, the order the unit list would find them in.
+    """
+    def __init__(self, units=()):
+        self.cells = {}  # (x, y) -> units filed there, in turn order
+        self.cell_of = {}  # unit -> (x, y) it is filed under
+        self.order = {}  # unit -> position in the turn order
+        for unit in units:
+            self.add(unit)
+
+
+
+
+    def add(self, unit):
+        self.order[unit] = len(self.order)
+        self.file(unit)
+
+
+
+
+    def file(self, unit):
+        cell = (unit.x, unit.y)
+        units = self.cells.setdefault(cell, [])
+        units.append(unit)
+        if len(units) > 1:
+            units.sort(key=self.order.__getitem__)
+        self.cell_of[unit] = cell
+
+
+
+
+    def place(self, unit):
+        """Re-file `unit` after its x, y changed (move, respawn)."""
+        cell = self.cell_of[unit]
+        if cell == (unit.x, unit.y):
+            return
+        units = self.cells[cell]
+        units.remove(unit)
+        if not units:
+            del self.cells[cell]  # Only occupied cells are kept, see cells_in_range()
+        self.file(unit)
+
+
+
+
+    def units_at(self, x, y):
+        """Alive units on (x, y), in turn order."""
+        units = self.cells.get((x, y))
+        if not units:
+            return []
+        return [unit for unit in units if unit.alive]
+
+
+
+
+    def at(self, x, y):
+        """First alive unit on (x, y), or None."""
+        for unit in self.cells.get((x, y), ()):
+            if unit.alive:
+                return unit
+        return None
+
+
+
+
+    def cells_in_range(self, x, y, radius):
+        """Units filed on the occupied cells within Manhattan distance `radius` of (x, y), one list per cell."""
+        cells = self.cells
+        if len(cells) <= 2 * radius * (radius + 1) + 1:  # Fewer occupied cells than cells in the diamond
+            return [units for (cx, cy), units in cells.items() if abs(cx - x) + abs(cy - y) <= radius]
+        found = []
+        for dx in range(-radius, radius + 1):
+            span = radius - abs(dx)
+            for dy in range(-span, span + 1):
+                units = cells.get((x + dx, y + dy))
+                if units:
+                    found.append(units)
+        return found
+
+
+
+
+    def in_range(self, x, y, radius):
+        """Alive units within Manhattan distance `radius` of (x, y), in turn order."""
+        found = [unit for units in self.cells_in_range(x, y, radius) for unit in units if unit.alive]
+        found.sort(key=self.order.__getitem__)
+        return found
+
+
+
+
+    def first_in_range(self, x, y, radius):
+        """First alive unit of every occupied cell within `radius` of (x, y), in turn order."""
+        found = []
+        for units in self.cells_in_range(x, y, radius):
+            for unit in units:
+                if unit.alive:
+                    found.append(unit)
+                    break
+        if len(found) > 1:
+            found.sort(key=self.order.__getitem__)
+        return found
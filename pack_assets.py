@@ -0,0 +1,118 @@
+"""
+Build the asset bundle read at startup by AssetManager.load_bundle: every image of the game,
+at its own size and pre-scaled to the sizes it is drawn at, stored as raw pixels in a single file.
+Sounds are not bundled: pygame.mixer decodes the compressed files itself, so raw samples would only be larger.
+
+    python pack_assets.py [--output assets/bundle.bin]
+
+Rebuild it after changing an image; a stale bundle is ignored and the loose files are used instead.
+"""
+import argparse
+import json
+import os
+import pygame
+from assets import IMAGE_FILES, BUNDLE_FILE, BUNDLE_MAGIC, BUNDLE_HEADER
+from game import CELL_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT
+from interface import range_overlays
+
+# Sizes each image is drawn at, seeded into the surface cache next to the file's own pixels.
+# A (size, alphas) pair stores one copy that is cached under every alpha it is drawn with.
+SCREEN = (SCREEN_WIDTH, SCREEN_HEIGHT)
+CELL = (CELL_SIZE, CELL_SIZE)
+POTION = (CELL_SIZE // 2, CELL_SIZE // 2)
+INDICATOR = (
+    (int(CELL_SIZE * 1.2), int(CELL_SIZE * 1.2)),
+    [range_overlays.frame_alpha(frame) for frame in range(range_overlays.indicator_frames)],  # Pulse steps
+)
+UNIT_SIZES = [(150, 150), CELL, (80, 80), (50, 50), (int(CELL_SIZE * 3 / 4),) * 2]  # Selection, map, HUD, rosters, key panel
+
+BUNDLE_SIZES = {
+    # terrain and overlays
+    "assets/grass_new.png": [CELL],
+    "assets/water.jpg": [CELL],
+    "assets/new_rock.png": [CELL],
+    "assets/bush.png": [CELL],
+    "assets/inhibetor.png": [CELL],
+    # units
+    "assets/ashe.png": UNIT_SIZES,
+    "assets/garen.png": UNIT_SIZES,
+    "assets/darius.png": UNIT_SIZES,
+    "assets/soraka.png": UNIT_SIZES,
+    "assets/rengar.png": UNIT_SIZES,
+    "assets/BlueBuff.png": UNIT_SIZES,
+    "assets/RedBuff.png": UNIT_SIZES,
+    "assets/BigBuff.png": UNIT_SIZES,
+    "assets/Nexus_Blue.png": UNIT_SIZES,
+    "assets/Nexus_Red.png": UNIT_SIZES,
+    # indicators
+    "assets/indicator.png": [INDICATOR],
+    "assets/indicator1.jpg": [INDICATOR],
+    "assets/redsquare.png": [INDICATOR],
+    # pickups
+    "assets/red_potion.png": [POTION],
+    "assets/blue_potion.png": [POTION],
+    "assets/green_potion.png": [POTION],
+    "assets/golden_potion.png": [POTION],
+    "assets/black_potion.png": [POTION],
+    # menus
+    "assets/main_screen.jpg": [SCREEN],
+    "assets/lol_background.jpg": [SCREEN],
+    "assets/champ_select.jpg": [SCREEN],
+    "assets/game_over_image.jpg": [SCREEN],
+    "assets/red_key.png": [(30, 30)],
+    "assets/blue_key.png": [(30, 30)],
+}
+
+
+
+
+def variants(path):
+    """(size, alphas) of every surface stored for `path`: the file itself first, then its scaled copies."""
+    yield None, [None]
+    for size in BUNDLE_SIZES.get(path, []):
+        yield size if isinstance(size[1], list) else (size, [None])
+
+
+
+
+def pack(output=BUNDLE_FILE):
+    """
+    Write the bundle to `output`.
+    :return: (number of images, number of surfaces, size in bytes).
+    """
+    index = {"sources": {}, "images": {}}
+    blobs = []
+    offset = 0
+
+    for path in IMAGE_FILES:
+        image = pygame.image.load(path)
+        pixel_format = "RGBA" if image.get_flags() & pygame.SRCALPHA else "RGB"
+        index["sources"][path] = os.path.getmtime(path)
+        index["images"][path] = []
+
+        for size, alphas in variants(path):
+            surface = image if size is None else pygame.transform.scale(image, size)
+            pixels = pygame.image.tobytes(surface, pixel_format)
+            index["images"][path].append([surface.get_width(), surface.get_height(), pixel_format, offset, alphas])
+            blobs.append(pixels)
+            offset += len(pixels)
+
+    header = json.dumps(index).encode()
+    with open(output, "wb") as bundle:
+        bundle.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, len(header)))
+        bundle.write(header)
+        for pixels in blobs:
+            bundle.write(pixels)
+
+    return len(index["images"]), len(blobs), BUNDLE_HEADER.size + len(header) + offset
+
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack the game's images into a single pre-scaled bundle.")
+    parser.add_argument("--output", default=BUNDLE_FILE, help=f"Bundle file to write (default: {BUNDLE_FILE})")
+    args = parser.parse_args()
+
+    images, surfaces, size = pack(args.output)
+    print(f"Packed {images} images ({surfaces} surfaces, {size / 1024 / 1024:.1f} MB) into {args.output}")
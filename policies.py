@@ -0,0 +1,528 @@
+"""
+Computer players, for headless matches and for the computer seats of the game.
+A policy picks the next action of the current unit: policy.choose(match, rng) returns one of match.legal_actions().
+"""
+import contextlib
+import io
+import math
+import multiprocessing
+import random
+import time
+
+from bitboard import MatchState
+from zobrist import ZobristHash, TranspositionTable, EXACT, LOWER, UPPER
+
+
+
+
+# Random Policy Class
+class RandomPolicy:
+    """Plays any legal action, uniformly."""
+    def choose(self, match, rng):
+        return rng.choice(match.legal_actions())
+
+
+
+
+# Scripted Policy Class
+class ScriptedPolicy:
+    """Greedy player: walks towards the closest objective and hits whatever pays off most right now."""
+
+    # Weight of damage dealt, by kind of target
+    TARGET_WEIGHTS = {"player": 1.0, "base": 1.5, "monster": 0.5}
+    KILL_BONUS = 200  # Extra score for a hit that kills
+    STATUS_SCORE = 40  # Score of a buff or debuff that lands
+
+    def choose(self, match, rng):
+        actions = match.legal_actions()
+        unit = match.current_unit
+        if unit.state == "move":
+            goal = self.objective(match, unit)
+            if goal is None:
+                return rng.choice(actions)
+            return min(actions, key=lambda action: (abs(action[1] - goal[0]) + abs(action[2] - goal[1]), rng.random()))
+        if unit.state == "attack":
+            return max(actions, key=lambda action: (self.score(match, unit, action), rng.random()))
+        return actions[0]
+
+
+
+
+    def objective(self, match, unit):
+        """The enemy Nexus once its barrier is down, else the closest enemy champion or monster holding a key."""
+        enemy_barrier = match.red_barrier if unit.color == "blue" else match.blue_barrier
+        targets = []
+        for other in match.units:
+            if not other.alive or other.color == unit.color:
+                continue
+            if other.unit_type == "base" and enemy_barrier == "Down":
+                return other.x, other.y
+            if other.unit_type == "player" or (other.unit_type == "monster" and (other.red_keys or other.blue_keys)):
+                targets.append(other)
+        if not targets:
+            return None
+        closest = min(targets, key=lambda other: abs(other.x - unit.x) + abs(other.y - unit.y))
+        return closest.x, closest.y
+
+
+
+
+    def score(self, match, unit, action):
+        """Rough value of an attack-phase action."""
+        if action[0] == "attack":
+            return self.hit_score(unit, match.unit_at(action[1], action[2]), unit.damage)
+
+        ability = unit.abilities[action[1]]
+        x, y = action[2], action[3]
+        if ability.ability_type == "damage":
+            if ability.is_aoe > 0:
+                targets = [other for other in match.units
+                           if other.alive and other is not unit and abs(other.x - x) + abs(other.y - y) <= ability.is_aoe]
+            else:
+                targets = [match.unit_at(x, y)]
+            return sum(self.hit_score(unit, target, ability.attack + unit.damage) for target in targets)
+        if ability.ability_type == "heal":
+            target = match.unit_at(x, y)
+            return min(target.max_health - target.health, ability.attack)
+        return self.STATUS_SCORE
+
+
+
+
+    def hit_score(self, unit, target, damage):
+        if target is None or target.color == unit.color:
+            return 0
+        if target.unit_type == "base" and target.barrier_status == "Up":
+            return 0
+        score = min(damage, target.health) * self.TARGET_WEIGHTS[target.unit_type]
+        if damage >= target.health:
+            score += self.KILL_BONUS
+        return score
+
+
+
+
+class SearchTimeout(Exception):
+    """The time budget of a search ran out."""
+
+
+
+
+# Alpha-Beta Policy Class
+class AlphaBetaPolicy(ScriptedPolicy):
+    """
+    Looks ahead with alpha-beta search over whole-phase actions (a move, an attack or ability
+    and its target, the end of the turn), deepening one action at a time until the time budget runs out.
+    The search plays on a headless copy of the match, with the dice seeded, so the real match and
+    its random stream are left untouched. Values are from blue's side: blue maximizes, red minimizes.
+    """
+
+    WIN = 1_000_000
+    ALIVE_SCORE = 300  # A champion on the board rather than waiting to respawn
+    KEY_SCORE = 250  # Each key of the enemy color
+    BARRIER_SCORE = 1500  # The enemy barrier being down
+    NEXUS_WEIGHT = 2.0  # Per point of Nexus health
+    DAMAGE_WEIGHT = 0.5  # Per point of champion damage (monster buffs)
+    DISTANCE_WEIGHT = 4.0  # Per cell between a champion and its objective
+    HASH_BUCKETS = 1024  # Health resolution of the position hashes, fine enough to tell two hits apart
+
+    def __init__(self, budget_ms=250, max_depth=8, move_width=12, table=None):
+        """
+        :param budget_ms: Time allowed per decision, in milliseconds.
+        :param max_depth: Deepest search, in actions (ends of turn are free).
+        :param move_width: Number of move cells searched per move phase, the most promising first.
+        :param table: Transposition table, shared between searches (a new one by default).
+        """
+        self.budget = budget_ms / 1000
+        self.max_depth = max_depth
+        self.move_width = move_width
+        self.table = table if table is not None else TranspositionTable()
+        self.simulation = None  # Headless copy of the match the search plays on
+        self.roster = None
+        self.deadline = 0
+        self.nodes = self.depth_reached = 0
+
+
+
+
+    def choose(self, match, rng):
+        actions = match.legal_actions()
+        if len(actions) == 1:
+            return actions[0]
+        best = self.ordered(match, actions, None)[0]
+
+        self.deadline = time.perf_counter() + self.budget
+        self.nodes = self.depth_reached = 0
+        self.table.new_search()
+        dice = random.getstate()
+        random.seed(rng.random())
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+                self.copy(match)
+                for depth in range(1, self.max_depth + 1):
+                    value, action = self.search(depth, -math.inf, math.inf)
+                    if action in actions:
+                        best = action
+                    self.depth_reached = depth
+                    if abs(value) >= self.WIN:
+                        break  # The outcome is decided
+        except SearchTimeout:
+            pass  # Keep the choice of the last finished depth
+        finally:
+            random.setstate(dice)
+        return best
+
+
+
+
+    def copy(self, match):
+        """Bring the search's headless match to the state of `match`."""
+        self.load(MatchState.from_match(match))
+
+
+
+
+    def load(self, state):
+        """Bring the search's headless match to a MatchState."""
+        if self.simulation is None or self.roster != (state.blue, state.red):
+            self.simulation = state.to_match()
+            if self.table is not None:  # Only the alpha-beta search looks positions up
+                self.simulation.zobrist = ZobristHash(self.simulation, self.HASH_BUCKETS)
+            self.roster = (state.blue, state.red)
+        else:
+            state.restore(self.simulation)
+
+
+
+
+    def search(self, depth, alpha, beta):
+        """
+        Alpha-beta on the search's match, which it leaves as it found it.
+        :return: (value, best action), the action being None at the leaves.
+        """
+        self.nodes += 1
+        if time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        match = self.simulation
+        key, check = match.zobrist.value, match.zobrist.check
+        entry = self.table.probe(key, check)
+        remembered = None
+        if entry is not None:
+            if entry.depth >= depth:
+                if entry.bound == EXACT:
+                    return entry.value, entry.action
+                if entry.bound == LOWER:
+                    alpha = max(alpha, entry.value)
+                else:
+                    beta = min(beta, entry.value)
+                if alpha >= beta:
+                    return entry.value, entry.action
+            remembered = entry.action
+
+        actions = match.legal_actions()
+        if depth == 0 or not actions:
+            return self.evaluate(match), None
+
+        maximizing = match.current_unit.color == "blue"
+        start_alpha, start_beta = alpha, beta
+        best_value = -math.inf if maximizing else math.inf
+        best_action = None
+        state = MatchState.from_match(match)
+        for action in self.ordered(match, actions, remembered):
+            match.apply(action)
+            # Ending the turn is forced, it does not use up depth
+            value, _ = self.search(depth if action[0] == "end_turn" else depth - 1, alpha, beta)
+            state.restore(match)
+            if maximizing and value > best_value or not maximizing and value < best_value:
+                best_value, best_action = value, action
+            if maximizing:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        bound = UPPER if best_value <= start_alpha else LOWER if best_value >= start_beta else EXACT
+        self.table.store(key, depth, best_value, bound, best_action, check)
+        return best_value, best_action
+
+
+
+
+    def ordered(self, match, actions, first):
+        """
+        Most promising actions first: the best action found before for this position, then
+        move cells closest to the unit's objective (only the first move_width), or the highest-scoring hits.
+        """
+        unit = match.current_unit
+        if unit.state == "move":
+            goal = self.objective(match, unit)
+            if goal is not None:
+                actions = sorted(actions, key=lambda action: abs(action[1] - goal[0]) + abs(action[2] - goal[1]))
+            actions = actions[:self.move_width]
+        elif unit.state == "attack":
+            actions = sorted(actions, key=lambda action: self.score(match, unit, action), reverse=True)
+        if first is not None and first in actions:
+            actions.remove(first)
+            actions.insert(0, first)
+        return actions
+
+
+
+
+    def evaluate(self, match):
+        """Value of a position for blue: champions, keys, barriers and Nexus health, blue's minus red's."""
+        winner = match.winner()
+        if winner is not None:
+            return self.WIN if winner == "blue" else -self.WIN
+        value = 0.0
+        for unit in match.units:
+            if unit.color not in ("blue", "red"):
+                continue
+            side = 1 if unit.color == "blue" else -1
+            if unit.unit_type == "base":
+                value += side * self.NEXUS_WEIGHT * unit.health
+                if unit.barrier_status == "Down":
+                    value -= side * self.BARRIER_SCORE
+                continue
+            value += side * self.KEY_SCORE * (unit.red_keys if unit.color == "blue" else unit.blue_keys)
+            value += side * self.DAMAGE_WEIGHT * unit.damage
+            if unit.alive:
+                value += side * (self.ALIVE_SCORE + unit.health)
+                goal = self.objective(match, unit)
+                if goal is not None:
+                    value -= side * self.DISTANCE_WEIGHT * (abs(unit.x - goal[0]) + abs(unit.y - goal[1]))
+        return value
+
+
+
+
+    def report(self):
+        """Summary of the last decision, for the stats display."""
+        return f"alpha-beta depth {self.depth_reached}, {self.nodes} nodes"
+
+
+
+
+# Tree Node Class
+class TreeNode:
+    """Statistics of an action sequence from the root, over all the dice rolls it was played with."""
+    __slots__ = ("visits", "reward", "children")
+
+    def __init__(self):
+        self.visits = 0
+        self.reward = 0.0  # Sum of the rewards of the team that chose the action leading here
+        self.children = {}  # Action -> TreeNode
+
+
+
+
+# MCTS Policy Class
+class MCTSPolicy(AlphaBetaPolicy):
+    """
+    Monte Carlo tree search. Every iteration replays the tree from the root with fresh dice, so crits,
+    misses and potion spawns are sampled instead of assumed (the tree holds action sequences, not positions),
+    then finishes with a short scripted rollout scored by the alpha-beta evaluation.
+    With several workers, each process grows its own tree for the whole budget and the root visits
+    are added up (root parallelization).
+    """
+
+    EXPLORATION = 0.4  # UCB1 exploration constant, rewards being in [0, 1]
+    REWARD_SCALE = 150.0  # Gain over the root position's evaluation that makes a reward of about 0.73
+
+    def __init__(self, budget_ms=250, workers=None, rollout_actions=8, move_width=8):
+        """
+        :param budget_ms: Time allowed per decision, in milliseconds.
+        :param workers: Processes growing trees, all CPU cores by default (1 searches in this process).
+                        The processes start on the first decision and are shared by every MCTSPolicy.
+        :param rollout_actions: Actions played by the scripted player after leaving the tree.
+        :param move_width: Number of move cells tried per move phase, the most promising first.
+        """
+        # Not AlphaBetaPolicy.__init__: the tree needs no transposition table nor position hashes
+        self.budget = budget_ms / 1000
+        self.move_width = move_width
+        self.table = None
+        self.simulation = None  # Headless copy of the match the search plays on
+        self.roster = None
+        self.rollout_actions = rollout_actions
+        self.rollout_policy = ScriptedPolicy()
+        self.workers = workers or multiprocessing.cpu_count()
+        if multiprocessing.current_process().daemon:
+            self.workers = 1  # Inside a pool already (simulate.py), pool workers cannot have their own
+        self.rollouts = 0
+        self.elapsed = 0.0
+        self.baseline = 0.0  # Evaluation of the root position
+
+
+
+
+    def choose(self, match, rng):
+        actions = match.legal_actions()
+        if len(actions) == 1:
+            return actions[0]
+
+        start = time.perf_counter()
+        state = MatchState.from_match(match)
+        settings = (self.budget, self.rollout_actions, self.move_width)
+        tasks = [(state, rng.getrandbits(32), settings) for _ in range(self.workers)]
+        if self.workers == 1:
+            results = [self.grow(state, tasks[0][1])]
+        else:
+            results = worker_pool(self.workers).map(grow_tree, tasks)
+
+        visits = {}
+        self.rollouts = 0
+        for root, rollouts in results:
+            self.rollouts += rollouts
+            for action, (count, _) in root.items():
+                visits[action] = visits.get(action, 0) + count
+        self.elapsed = time.perf_counter() - start
+
+        legal = [action for action in visits if action in actions]
+        if not legal:
+            return self.ordered(match, actions, None)[0]
+        return max(legal, key=lambda action: (visits[action], rng.random()))
+
+
+
+
+    def grow(self, state, seed):
+        """
+        Grow one tree from `state` until the budget runs out.
+        :return: ({root action: (visits, reward)}, rollouts played).
+        """
+        deadline = time.perf_counter() + self.budget
+        root = TreeNode()
+        rng = random.Random(seed)
+        dice = random.getstate()
+        rollouts = 0
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+                self.load(state)
+                self.baseline = self.evaluate(self.simulation)
+                while time.perf_counter() < deadline:
+                    random.seed(rng.getrandbits(32))  # The dice of this iteration
+                    self.iterate(root, rng)
+                    state.restore(self.simulation)
+                    rollouts += 1
+        finally:
+            random.setstate(dice)
+        return {action: (child.visits, child.reward) for action, child in root.children.items()}, rollouts
+
+
+
+
+    def iterate(self, root, rng):
+        """One selection, expansion, rollout and backup from the root, on the search's match."""
+        match = self.simulation
+        node = root
+        path = []  # (node, color of the team that chose the action leading to it)
+        while match.winner() is None:
+            actions = match.legal_actions()
+            if not actions:
+                break
+            color = match.current_unit.color
+            candidates = self.ordered(match, actions, None)
+            untried = [action for action in candidates if action not in node.children]
+            if untried:
+                action = untried[0]
+                child = node.children[action] = TreeNode()
+                node = child
+                match.apply(action)
+                path.append((node, color))
+                break
+            # Every candidate has been tried with some dice: UCB1 among those legal with these dice
+            log_visits = math.log(node.visits + 1)
+            def ucb(action):
+                child = node.children[action]
+                mean = child.reward / child.visits if child.visits else 0.5
+                return mean + self.EXPLORATION * math.sqrt(log_visits / (child.visits + 1))
+            action = max(candidates, key=ucb)
+            node = node.children[action]
+            match.apply(action)
+            path.append((node, color))
+
+        blue_reward = self.rollout(match, rng)
+        root.visits += 1
+        for node, color in path:
+            node.visits += 1
+            node.reward += blue_reward if color == "blue" else 1.0 - blue_reward
+
+
+
+
+    def rollout(self, match, rng):
+        """Play on with the scripted player for a few actions; return blue's reward in [0, 1]."""
+        for _ in range(self.rollout_actions):
+            if match.winner() is not None or not match.legal_actions():
+                break
+            match.apply(self.rollout_policy.choose(match, rng))
+        gain = self.evaluate(match) - self.baseline
+        return 1.0 / (1.0 + math.exp(max(-50.0, min(50.0, -gain / self.REWARD_SCALE))))
+
+
+
+
+    def close(self):
+        """Stop the worker processes (the next decision starts them again)."""
+        close_pools()
+
+
+
+
+    def report(self):
+        """Summary of the last decision, for the stats display."""
+        rate = self.rollouts / self.elapsed if self.elapsed else 0
+        return f"MCTS {self.rollouts} rollouts, {rate:.0f}/s on {self.workers} worker(s)"
+
+
+
+
+# Worker processes by their number, shared by every MCTSPolicy like the vision tables
+POOLS = {}
+
+# Tree searcher of each pool worker, built on its first task
+worker_policy = None
+
+
+
+
+def worker_pool(workers):
+    """The shared pool of `workers` processes, started on first use."""
+    pool = POOLS.get(workers)
+    if pool is None:
+        # Spawned rather than forked: the game has pygame and loader threads running
+        pool = POOLS[workers] = multiprocessing.get_context("spawn").Pool(workers)
+    return pool
+
+
+
+
+def close_pools():
+    """Stop every shared pool."""
+    for pool in POOLS.values():
+        pool.terminate()
+    POOLS.clear()
+
+
+
+
+def grow_tree(task):
+    """Pool task: grow one tree. :param task: (MatchState, seed, (budget in s, rollout actions, move width))."""
+    global worker_policy
+    state, seed, (budget, rollout_actions, move_width) = task
+    if worker_policy is None:
+        worker_policy = MCTSPolicy(workers=1)
+    worker_policy.budget, worker_policy.rollout_actions, worker_policy.move_width = budget, rollout_actions, move_width
+    return worker_policy.grow(state, seed)
+
+
+
+
+# Policies by the name used on the command line
+POLICIES = {
+    "random": RandomPolicy,
+    "scripted": ScriptedPolicy,
+    "alphabeta": AlphaBetaPolicy,
+    "mcts": MCTSPolicy,
+}
@@ -0,0 +1,290 @@
+"""
+Computer players that think in a background process, so the game's render loop keeps its frame rate.
+Pondering: an MCTS computer player that keeps growing its search tree in a background process
+while the other team plays, and moves the tree's root along the actions actually played,
+so by the time its own turn comes the subtree of the real position is already searched.
+Both players below decide without blocking: request() hands over the position, result() is None until
+the action is ready, and the game polls it once per frame.
+"""
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import time
+
+from bitboard import MatchState
+from policies import POLICIES, MCTSPolicy, TreeNode
+
+
+PONDER_LIMIT = 50000  # Root visits after which the background process waits instead of growing the tree further
+
+
+
+
+# Pondering Policy Class
+class PonderingPolicy:
+    """
+    MCTS player whose tree lives in a low-priority background process (see ponder_worker),
+    so the render loop keeps its frame rate. Tell it every whole-phase action played, by either team,
+    through observe(); choose() then only tops the tree up, and answers at once when it already has
+    `ready_rollouts` visits at the root.
+    """
+    def __init__(self, budget_ms=250, ready_rollouts=300, seed=None):
+        """
+        :param budget_ms: Longest time a decision may take when the tree is not ready.
+        :param ready_rollouts: Root visits that are enough to answer without searching more.
+        """
+        self.budget = budget_ms / 1000
+        self.ready_rollouts = ready_rollouts
+        # Spawned rather than forked: the game has pygame and loader threads running
+        context = multiprocessing.get_context("spawn")
+        self.connection, worker_end = context.Pipe()
+        self.process = context.Process(
+            target=ponder_worker, args=(worker_end, seed if seed is not None else random.getrandbits(32)), daemon=True
+        )
+        self.process.start()
+        self.position = None  # Units of the last position sent, to notice when the worker is out of sync
+        self.requests = 0  # Number of the last decision asked for, so answers to older ones are dropped
+        self.actions = self.rng = None
+        self.rollouts = self.pondered = 0
+        self.elapsed = 0.0
+
+
+
+
+    def ponder(self, match):
+        """Start thinking about `match` from scratch (new match, or a position the tree never saw)."""
+        state = MatchState.from_match(match)
+        self.connection.send(("position", state))
+        self.position = state.units
+
+
+
+
+    def observe(self, match, action):
+        """`action` (as legal_actions() lists them) was just played in `match`: move the root along it."""
+        if self.position is None:
+            self.ponder(match)
+            return
+        state = MatchState.from_match(match)
+        self.connection.send(("advance", action, state))
+        self.position = state.units
+
+
+
+
+    def request(self, match, rng):
+        """Ask for a decision on `match` without waiting for it."""
+        self.actions = match.legal_actions()
+        self.rng = rng
+        self.requests += 1
+        if len(self.actions) == 1:
+            return
+
+        if MatchState.from_match(match).units != self.position:
+            self.ponder(match)  # Actions were played without observe()
+        self.connection.send(("decide", self.requests, self.budget, self.ready_rollouts))
+
+
+
+
+    def result(self):
+        """The action asked for by the last request(), or None while the worker is still deciding."""
+        if len(self.actions) == 1:
+            return self.actions[0]
+        while self.connection.poll():
+            number, visits, self.rollouts, self.pondered, self.elapsed = self.connection.recv()
+            if number != self.requests:
+                continue  # Answer to a request that was given up
+
+            legal = [action for action in visits if action in self.actions]
+            if not legal:
+                return self.rng.choice(self.actions)
+            return max(legal, key=lambda action: (visits[action], self.rng.random()))
+        return None
+
+
+
+
+    def choose(self, match, rng):
+        self.request(match, rng)
+        return wait(self)
+
+
+
+
+    def close(self):
+        """Stop the background process."""
+        if self.process.is_alive():
+            self.connection.send(("stop",))
+            self.process.join(1)
+            if self.process.is_alive():
+                self.process.terminate()
+
+
+
+
+    def report(self):
+        """Summary of the last decision, for the stats display."""
+        return f"MCTS {self.rollouts} rollouts ({self.pondered} pondered), answered in {self.elapsed * 1000:.0f} ms"
+
+
+
+
+def ponder_worker(connection, seed):
+    """
+    Background process: grow the tree whenever no message is waiting. Messages:
+    ("position", MatchState) starts a new tree, ("advance", action, MatchState) makes the child
+    of `action` the root (a new node if the tree never tried it), ("decide", budget, ready) grows the tree
+    until it has `ready` root visits or the budget runs out, then answers (number, {root action: visits},
+    root visits, root visits gathered before the request, time taken in s), and ("stop",) ends.
+    """
+    if hasattr(os, "nice"):
+        os.nice(19)  # The game's render loop comes first
+    policy = MCTSPolicy(workers=1)
+    rng = random.Random(seed)
+    root = state = None
+
+    with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+        while True:
+            idle = root is None or root.visits >= PONDER_LIMIT
+            if idle or connection.poll():
+                message = connection.recv()
+                kind = message[0]
+                if kind == "stop":
+                    return
+                if kind == "position":
+                    state = message[1]
+                    root = TreeNode()
+                    policy.load(state)
+                    policy.baseline = policy.evaluate(policy.simulation)
+                elif kind == "advance" and root is not None:
+                    # The rewards below the new root stay relative to the baseline they were scored with
+                    action, state = message[1:]
+                    root = root.children.get(action) or TreeNode()
+                    policy.load(state)
+                elif kind == "decide" and root is not None:
+                    _, number, budget, ready = message
+                    pondered = root.visits
+                    start = time.perf_counter()
+                    while root.visits < ready and time.perf_counter() < start + budget:
+                        grow(policy, root, state, rng)
+                    connection.send((
+                        number, {action: child.visits for action, child in root.children.items()}, root.visits, pondered,
+                        time.perf_counter() - start,
+                    ))
+                continue
+            grow(policy, root, state, rng)
+
+
+
+
+def grow(policy, root, state, rng):
+    """One MCTS iteration from `root`, on fresh dice, leaving the search's match back at `state`."""
+    random.seed(rng.getrandbits(32))
+    policy.iterate(root, rng)
+    state.restore(policy.simulation)
+
+
+
+
+# Background Policy Class
+class BackgroundPolicy:
+    """
+    A policy of POLICIES (the alpha-beta search in the game) deciding in a background process,
+    at low priority like the pondering one, while the render loop goes on.
+    """
+    def __init__(self, name, **settings):
+        """
+        :param name: Policy name, as in POLICIES.
+        :param settings: Arguments of the policy's constructor, e.g. budget_ms.
+        """
+        context = multiprocessing.get_context("spawn")
+        self.connection, worker_end = context.Pipe()
+        self.process = context.Process(target=search_worker, args=(worker_end, name, settings), daemon=True)
+        self.process.start()
+        self.requests = 0  # Number of the last decision asked for, so answers to older ones are dropped
+        self.summary = f"{name}, no decision yet"
+
+
+
+
+    def request(self, match, rng):
+        """Ask for a decision on `match` without waiting for it."""
+        self.requests += 1
+        self.connection.send(("decide", self.requests, MatchState.from_match(match), rng.getrandbits(32)))
+
+
+
+
+    def result(self):
+        """The action asked for by the last request(), or None while the worker is still deciding."""
+        while self.connection.poll():
+            number, action, self.summary = self.connection.recv()
+            if number == self.requests:
+                return action
+        return None
+
+
+
+
+    def choose(self, match, rng):
+        self.request(match, rng)
+        return wait(self)
+
+
+
+
+    def close(self):
+        """Stop the background process."""
+        if self.process.is_alive():
+            self.connection.send(("stop",))
+            self.process.join(1)
+            if self.process.is_alive():
+                self.process.terminate()
+
+
+
+
+    def report(self):
+        """Summary of the last decision, for the stats display."""
+        return self.summary
+
+
+
+
+def search_worker(connection, name, settings):
+    """
+    Background process of a BackgroundPolicy. Messages: ("decide", number, MatchState, seed) answers
+    (number, action, the policy's report), ("stop",) ends.
+    """
+    if hasattr(os, "nice"):
+        os.nice(19)  # The game's render loop comes first
+    policy = POLICIES[name](**settings)
+    match = roster = None
+
+    with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+        while True:
+            message = connection.recv()
+            if message[0] == "stop":
+                return
+            _, number, state, seed = message
+            if match is None or roster != (state.blue, state.red):
+                match = state.to_match()
+                roster = (state.blue, state.red)
+            else:
+                state.restore(match)
+            action = policy.choose(match, random.Random(seed))
+            connection.send((number, action, policy.report() if hasattr(policy, "report") else name))
+
+
+
+
+def wait(player):
+    """Block until `player`'s last request is answered (headless use of choose())."""
+    action = player.result()
+    while action is None:
+        player.connection.poll(None)
+        action = player.result()
+    return action
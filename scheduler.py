@@ -0,0 +1,64 @@
+import time
+import pygame
+
+
+# Frame rate used while nothing on screen is moving
+IDLE_FPS = 5
+POLL_MS = 10  # While idle, how often the queue is checked for input
+
+
+# Frame Scheduler Class
+class FrameScheduler:
+    """
+    Paces the game loop: full frame rate while something animates or a key is held,
+    otherwise sleeps in short waits until input is queued or the next idle frame is due.
+    Keeps the measured frame rate and CPU use of the process.
+    """
+    def __init__(self, clock, fps, idle_fps=IDLE_FPS, throttle=True):
+        self.clock = clock
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.throttle = throttle  # False keeps the loop at full rate at all times
+
+        # CPU use, measured over windows of about one second
+        self.cpu_usage = 0.0  # Fraction of one core
+        self.window_wall = time.perf_counter()
+        self.window_cpu = time.process_time()
+
+
+
+
+    def tick(self, active):
+        """
+        Wait until the next frame is due.
+        :param active: True while an animation runs or input is held, to keep the full frame rate.
+        """
+        if active or not self.throttle:
+            self.clock.tick(self.fps)
+        else:
+            # Sleep until an event arrives or the idle frame is due; peek leaves the queue, and its order, to the game loop
+            deadline = pygame.time.get_ticks() + 1000 // self.idle_fps
+            while not pygame.event.peek() and pygame.time.get_ticks() < deadline:
+                pygame.time.wait(POLL_MS)
+            self.clock.tick()  # Only keeps the frame rate measurement up to date
+
+        self.update_cpu_usage()
+
+
+
+
+    def update_cpu_usage(self):
+        now = time.perf_counter()
+        elapsed = now - self.window_wall
+        if elapsed >= 1:
+            cpu = time.process_time()
+            self.cpu_usage = (cpu - self.window_cpu) / elapsed
+            self.window_wall = now
+            self.window_cpu = cpu
+
+
+
+
+    def frame_rate(self):
+        """Frames per second measured over the last few frames."""
+        return self.clock.get_fps()
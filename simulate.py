@@ -0,0 +1,212 @@
+"""
+Play many headless matches between computer players and report how the champions fare.
+
+    python simulate.py [--matches 600] [--blue scripted] [--red scripted] [--workers N] [--seed 0]
+                       [--set Garen.health=800] [--set "Noxian Guillotine.attack=350"] [--json report.json]
+
+Every ordered 2v2 pairing of the five champions is played in turn. Matches are spread over a pool
+of worker processes; each match gets its own seed, so a run is reproducible whatever the number of workers.
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import multiprocessing
+import random
+import statistics
+import time
+
+from engine import Match, create_units
+from policies import POLICIES
+
+ROSTER = create_units()
+CHAMPIONS = [unit.name for unit in ROSTER if unit.unit_type == "player"]
+TEAMS = list(itertools.combinations(CHAMPIONS, 2))
+MATCHUPS = [(blue, red) for blue in TEAMS for red in TEAMS if not set(blue) & set(red)]  # 30 pairings
+
+
+
+
+def parse_override(text):
+    """Turn "Garen.health=800" into ("Garen", "health", 800)."""
+    target, _, value = text.partition("=")
+    name, _, attribute = target.rpartition(".")
+    if not name or not attribute or not value:
+        raise argparse.ArgumentTypeError(f"expected NAME.attribute=value, got {text!r}")
+    owner = next((owner for unit in ROSTER for owner in [unit] + unit.abilities if owner.name == name), None)
+    if owner is None:
+        raise argparse.ArgumentTypeError(f"no unit or ability named {name!r}")
+    if not hasattr(owner, attribute):
+        raise argparse.ArgumentTypeError(f"{name} has no attribute {attribute!r}")
+    return name, attribute, json.loads(value)
+
+
+
+
+def apply_overrides(match, overrides):
+    """Set unit or ability numbers by name (champions sitting out the match are skipped). Health and mana also set their maximum."""
+    for name, attribute, value in overrides:
+        for unit in match.units:
+            for owner in [unit] + unit.abilities:
+                if owner.name == name:
+                    setattr(owner, attribute, value)
+                    if owner is unit and attribute in ("health", "mana"):
+                        setattr(owner, f"max_{attribute}", value)
+
+
+
+
+def play_match(task):
+    """
+    Play one match to the end, or until `max_turns` unit turns have passed.
+    :param task: (blue names, red names, blue policy, red policy, seed, max_turns, overrides).
+    :return: Dictionary with the winner, the length and the turns the keys and barriers changed hands.
+    """
+    blue, red, blue_policy, red_policy, seed, max_turns, overrides = task
+    random.seed(seed)  # The rules roll critical hits and pickups on the global generator
+    rng = random.Random(seed)
+    policies = {"blue": POLICIES[blue_policy](), "red": POLICIES[red_policy]()}
+    result = {"blue": blue, "red": red, "winner": None, "turns": 0, "actions": 0,
+              "first_key": {"blue": None, "red": None}, "barrier_down": {"blue": None, "red": None}}
+
+    with contextlib.redirect_stdout(io.StringIO()):  # The rules print a trace of every event
+        match = Match.new(blue, red)
+        apply_overrides(match, overrides)
+        while match.current_turn <= max_turns:
+            actions = match.legal_actions()
+            if not actions:
+                break
+            action = policies[match.current_unit.color].choose(match, rng)
+            if not match.apply(action):
+                raise RuntimeError(f"{match.current_unit.name} could not play the legal action {action!r} (seed {seed})")
+            result["actions"] += 1
+
+            # Enemy keys held by each team, and the barriers they opened
+            turn = match.current_turn
+            if result["first_key"]["blue"] is None and match.units[0].red_keys + match.units[1].red_keys:
+                result["first_key"]["blue"] = turn
+            if result["first_key"]["red"] is None and match.units[2].blue_keys + match.units[3].blue_keys:
+                result["first_key"]["red"] = turn
+            if result["barrier_down"]["red"] is None and match.red_barrier == "Down":
+                result["barrier_down"]["red"] = turn
+            if result["barrier_down"]["blue"] is None and match.blue_barrier == "Down":
+                result["barrier_down"]["blue"] = turn
+
+    result["winner"] = match.winner()
+    result["turns"] = match.current_turn
+    return result
+
+
+
+
+def simulate(matches, blue_policy="scripted", red_policy="scripted", workers=None, seed=0, max_turns=1000, overrides=()):
+    """
+    Play `matches` matches, cycling through MATCHUPS, on a pool of `workers` processes.
+    :return: List of play_match results, in the order of the matches.
+    """
+    tasks = [(*MATCHUPS[i % len(MATCHUPS)], blue_policy, red_policy, seed * 1000003 + i, max_turns, list(overrides))
+             for i in range(matches)]
+    workers = workers or multiprocessing.cpu_count()
+    if workers == 1:
+        return [play_match(task) for task in tasks]
+    with multiprocessing.Pool(workers) as pool:
+        return pool.map(play_match, tasks, chunksize=max(1, matches // (workers * 8)))
+
+
+
+
+def mean(values):
+    values = [value for value in values if value is not None]
+    return statistics.fmean(values) if values else None
+
+
+
+
+def summarize(results):
+    """Aggregate play_match results: win rates per champion and per pairing, game length, key and barrier timing."""
+    finished = [result for result in results if result["winner"]]
+    champions = {}
+    for name in CHAMPIONS:
+        played = [result for result in results if name in result["blue"] or name in result["red"]]
+        won = [result for result in played
+               if result["winner"] and name in result[result["winner"]]]
+        champions[name] = {"matches": len(played), "win_rate": len(won) / len(played) if played else None}
+
+    matchups = {}
+    for result in results:
+        key = f"{' + '.join(result['blue'])} vs {' + '.join(result['red'])}"
+        entry = matchups.setdefault(key, {"matches": 0, "blue_wins": 0, "red_wins": 0})
+        entry["matches"] += 1
+        if result["winner"]:
+            entry[f"{result['winner']}_wins"] += 1
+
+    return {
+        "matches": len(results),
+        "wins": {color: sum(result["winner"] == color for result in results) for color in ("blue", "red")},
+        "unfinished": len(results) - len(finished),
+        "turns": {"mean": mean([result["turns"] for result in finished]),
+                  "median": statistics.median([result["turns"] for result in finished]) if finished else None},
+        "actions": mean([result["actions"] for result in results]),
+        "first_key": {color: mean([result["first_key"][color] for result in results]) for color in ("blue", "red")},
+        "barrier_down": {color: {
+            "rate": sum(result["barrier_down"][color] is not None for result in results) / len(results),
+            "mean_turn": mean([result["barrier_down"][color] for result in results]),
+        } for color in ("blue", "red")},
+        "champions": champions,
+        "matchups": matchups,
+    }
+
+
+
+
+def fmt(value, pattern="{:.0f}"):
+    return "-" if value is None else pattern.format(value)
+
+
+
+
+def print_report(report):
+    print(f"{report['matches']} matches, blue {report['blue_policy']} vs red {report['red_policy']}, "
+          f"{report['workers']} worker(s), {report['elapsed']:.1f} s ({report['matches'] / report['elapsed']:.1f} matches/s)")
+    print(f"  wins blue / red / unfinished: {report['wins']['blue']} / {report['wins']['red']} / {report['unfinished']}")
+    print(f"  turns per finished match: mean {fmt(report['turns']['mean'])}, median {fmt(report['turns']['median'])}"
+          f" ({fmt(report['actions'])} actions per match)")
+    for color, enemy in (("blue", "red"), ("red", "blue")):
+        barrier = report["barrier_down"][enemy]
+        print(f"  {color} team: first {enemy} key on turn {fmt(report['first_key'][color])}, "
+              f"{enemy} barrier broken in {barrier['rate']:.0%} of matches (turn {fmt(barrier['mean_turn'])})")
+
+    print("\n  Champion    matches  win rate")
+    for name, entry in sorted(report["champions"].items(), key=lambda item: -(item[1]["win_rate"] or 0)):
+        print(f"  {name:<10} {entry['matches']:8} {fmt(entry['win_rate'], '{:9.0%}')}")
+
+    print("\n  Pairing                            matches  blue wins  red wins")
+    for key, entry in report["matchups"].items():
+        print(f"  {key:<34} {entry['matches']:7} {entry['blue_wins']:10} {entry['red_wins']:9}")
+
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play headless matches between computer players and report win rates.")
+    parser.add_argument("--matches", type=int, default=600, help="Number of matches (default: 600, 20 per pairing)")
+    parser.add_argument("--blue", choices=POLICIES, default="scripted", help="Policy of the blue team")
+    parser.add_argument("--red", choices=POLICIES, default="scripted", help="Policy of the red team")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=1000, help="Unit turns before a match counts as unfinished")
+    parser.add_argument("--set", dest="overrides", type=parse_override, action="append", default=[],
+                        metavar="NAME.attr=value", help="Change a unit or ability number, e.g. Garen.health=800")
+    parser.add_argument("--json", help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = simulate(args.matches, args.blue, args.red, args.workers, args.seed, args.max_turns, args.overrides)
+    report = summarize(results)
+    report.update(blue_policy=args.blue, red_policy=args.red, elapsed=time.perf_counter() - start,
+                  workers=args.workers or multiprocessing.cpu_count(), overrides=args.overrides)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump(report, output, indent=2)
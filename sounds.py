@@ -1,71 +1,245 @@
+import threading
 import pygame
 
+# Sound files, by the name used to play them
+SOUND_FILES = {
+    #ashe
+    "Arrow Shot": "sounds/ashe_arrow.mp3",
+    "Frost Arrow": "sounds/ashe_arrowattack.mp3",
+    "Ashe Basic Attack":"sounds/ashe_attack.ogg",
+    "Healing Wind":"sounds/blood.mp3",
+    #garen
+    "Charge":"sounds/charge.mp3",
+    "Slash":"sounds/sword.wav",
+    "Fortify":"sounds/justice_garen.mp3",
+    "Garen Basic Attack":"sounds/garen_ha.mp3",
+
+    #darius
+    "Darius Basic Attack":"sounds/darius_attack.ogg",
+    "Decimate ":"sounds/darius_attack2.ogg",
+    "Crippling Strike":"sounds/darius_laugh.ogg",
+    "darius_death":"sounds/darius_death.ogg",
+    "Noxian Guillotine":"sounds/Darius_Original_R_1.ogg",
+
+    "potion":"sounds/potion_sound.mp3",
+    #rengar
+    "rengar_attack":"sounds/rengar_attack.ogg",
+    "rengar_attack2":"sounds/rengar_attack2.ogg",
+    "Rengar Come ON":"sounds/rengar_comeon.ogg",
+    "Thrill of the Hunt":"sounds/rengar_hunt.ogg",
+    "Rengar Basic Attack":"sounds/rengar_roar.ogg",
+    "Battle Roar":"sounds/rengar_roarbattle.ogg",
+    "Savagery":"sounds/rengar_savagery.ogg",
+
+    "bomb":"sounds/smite-101soundboards.mp3",
+    #soraka
+    "Soraka Basic Attack":"sounds/soraka_attack.ogg",
+    "soraka_death":"sounds/soraka_death.ogg",
+    "Starcall":"sounds/soraka_starcall.ogg",
+    "Wish":"sounds/soraka_wish.ogg",
+    "Astral Infusion":"sounds/soraka_astral.ogg",
+
+    "selection":"sounds/selection.mp3",
+
+    #movement
+    "moving":"sounds/moving.mp3",
+    "water":"sounds/water.mp3",
+}
+
+# Music tracks, streamed from disk by the music player instead of decoded into memory
+MUSIC_FILES = {
+    "menu_music":"sounds/menu_music.mp3",
+    "game_music": "sounds/game_music.mp3",
+}
+
+# Volume applied when a clip is first loaded
+SOUND_VOLUMES = {
+    "moving": 0.2,
+    "water": 0.2,
+}
+
+
+
+
 class Sounds:
+    """
+    Process-wide sound bank: each clip is decoded once, the first time it is used
+    (or ahead of time by preload), and shared by every caller.
+    """
     def __init__(self):
+        self.sounds = {}  # name -> pygame.mixer.Sound, or None if the file is missing
+        self.lock = threading.Lock()
+        self.preload_thread = None
+
+
+
+
+    def get(self, name):
+        """Return the decoded clip for `name`, loading it on first use (None if unknown or missing)."""
+        if name in self.sounds:
+            return self.sounds[name]
+        if name not in SOUND_FILES:
+            return None
+
+        with self.lock:
+            if name not in self.sounds:  # Another thread may have loaded it meanwhile
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init()
+                try:
+                    sound = pygame.mixer.Sound(SOUND_FILES[name])
+                    sound.set_volume(SOUND_VOLUMES.get(name, 1.0))
+                except FileNotFoundError:
+                    print(f"Missing sound file {SOUND_FILES[name]}, '{name}' will be silent.")
+                    sound = None
+                self.sounds[name] = sound
+        return self.sounds[name]
+
+
+
+
+    def preload(self, names=None, background=True):
         """
-        Initialise le gestionnaire de sons et prépare le dictionnaire de sons.
+        Decode clips ahead of their first play.
+        :param names: Clips to load, all of them by default.
+        :param background: Load on a daemon thread instead of blocking the caller.
         """
-        pygame.mixer.init()
-        self.sounds = {
-            "menu_music":pygame.mixer.Sound("sounds/menu_music.mp3"),
-            #ashe
-            "Arrow Shot": pygame.mixer.Sound("sounds/ashe_arrow.mp3"),
-            "Frost Arrow": pygame.mixer.Sound("sounds/ashe_arrowattack.mp3"),
-            "Ashe Basic Attack":pygame.mixer.Sound("sounds/ashe_attack.ogg"),
-            "Healing Wind":pygame.mixer.Sound("sounds/blood.mp3"),
-            #garen
-            "Charge":pygame.mixer.Sound("sounds/charge.mp3"),
-            "Slash":pygame.mixer.Sound("sounds/sword.wav"),
-            "Fortify":pygame.mixer.Sound("sounds/justice_garen.mp3"),
-            "Garen Basic Attack":pygame.mixer.Sound("sounds/garen_ha.mp3"),
-
-            #darius
-            "Darius Basic Attack":pygame.mixer.Sound("sounds/darius_attack.ogg"),
-            "Decimate ":pygame.mixer.Sound("sounds/darius_attack2.ogg"),
-            "Crippling Strike":pygame.mixer.Sound("sounds/darius_laugh.ogg"),
-            "darius_death":pygame.mixer.Sound("sounds/darius_death.ogg"),
-            "Noxian Guillotine":pygame.mixer.Sound("sounds/Darius_Original_R_1.ogg"),
-            
-            "potion":pygame.mixer.Sound("sounds/potion_sound.mp3"),
-            #rengar
-            "rengar_attack":pygame.mixer.Sound("sounds/rengar_attack.ogg"),
-            "rengar_attack2":pygame.mixer.Sound("sounds/rengar_attack2.ogg"),
-            "Rengar Come ON":pygame.mixer.Sound("sounds/rengar_comeon.ogg"),
-            "Thrill of the Hunt":pygame.mixer.Sound("sounds/rengar_hunt.ogg"),
-            "Rengar Basic Attack":pygame.mixer.Sound("sounds/rengar_roar.ogg"),
-            "Battle Roar":pygame.mixer.Sound("sounds/rengar_roarbattle.ogg"),
-            "Savagery":pygame.mixer.Sound("sounds/rengar_savagery.ogg"),
-
-            "bomb":pygame.mixer.Sound("sounds/smite-101soundboards.mp3"),
-            #soraka
-            "Soraka Basic Attack":pygame.mixer.Sound("sounds/soraka_attack.ogg"),
-            "soraka_death":pygame.mixer.Sound("sounds/soraka_death.ogg"),
-            "Starcall":pygame.mixer.Sound("sounds/soraka_starcall.ogg"),
-            "Wish":pygame.mixer.Sound("sounds/soraka_wish.ogg"),
-            "Astral Infusion":pygame.mixer.Sound("sounds/soraka_astral.ogg"),
-            
-            "selection":pygame.mixer.Sound("sounds/selection.mp3"),
-            "game_music": pygame.mixer.Sound("sounds/game_music.mp3"),
-
-
-        }
+        names = list(SOUND_FILES) if names is None else list(names)
+        if not background:
+            for name in names:
+                self.get(name)
+            return
+        self.preload_thread = threading.Thread(target=self.preload, args=(names, False), daemon=True)
+        self.preload_thread.start()
+
+
 
 
     def play(self, name, loop=0):
-        if name in self.sounds:
-            self.sounds[name].play(loops=loop)  # Utilise l'option `loops` de pygame
+        sound = self.get(name)
+        if sound is not None:
+            sound.play(loops=loop)  # Utilise l'option `loops` de pygame
 
 
 
 
     def set_volume(self, sound_name, volume):
-        if sound_name in self.sounds:
-            self.sounds[sound_name].set_volume(volume)
-    
+        sound = self.get(sound_name)
+        if sound is not None:
+            sound.set_volume(volume)
+
+
 
 
-    
     def stop(self, sound_name):
-        if sound_name in self.sounds:
-            self.sounds[sound_name].stop()
-    
+        sound = self.sounds.get(sound_name)  # Never load a clip just to stop it
+        if sound is not None:
+            sound.stop()
+
+
+
+
+# Sound bank shared by the game, the pickups and the units
+sound_bank = Sounds()
+
+
+
+
+# Music Player Class
+class MusicPlayer:
+    """
+    Background music on pygame.mixer.music, which decodes the track from disk as it plays.
+    Volume fades are advanced by update(), called once per frame by the game loop.
+    """
+    def __init__(self):
+        self.track = None  # Name of the track currently loaded
+        self.volume = 1.0
+
+        # Current fade: volume goes from fade_from to fade_to between fade_start and fade_start + fade_duration (ms)
+        self.fade_from = 1.0
+        self.fade_to = 1.0
+        self.fade_start = 0
+        self.fade_duration = 0
+
+
+
+
+    def play(self, name, loop=-1, volume=1.0):
+        """
+        Start streaming a track, replacing the current one.
+        :param loop: Number of repeats, -1 to loop forever.
+        """
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        try:
+            pygame.mixer.music.load(MUSIC_FILES[name])
+        except (KeyError, FileNotFoundError, pygame.error):
+            print(f"Missing music track '{name}', playing nothing.")
+            self.track = None
+            return
+        self.track = name
+        self.fade_duration = 0
+        self.set_volume(volume)
+        pygame.mixer.music.play(loops=loop)
+
+
+
+
+    def is_playing(self, name):
+        return self.track == name and pygame.mixer.music.get_busy()
+
+
+
+
+    def set_volume(self, volume):
+        self.volume = volume
+        if pygame.mixer.get_init():
+            pygame.mixer.music.set_volume(volume)
+
+
+
+
+    def fade(self, volume, duration):
+        """Move to `volume` over `duration` milliseconds, without blocking."""
+        if duration <= 0:
+            self.fade_duration = 0
+            self.set_volume(volume)
+            return
+        self.fade_from = self.volume
+        self.fade_to = volume
+        self.fade_start = pygame.time.get_ticks()
+        self.fade_duration = duration
+
+
+
+
+    def is_fading(self):
+        return self.fade_duration > 0
+
+
+
+
+    def update(self):
+        """Advance the current fade to the current time."""
+        if not self.fade_duration:
+            return
+        progress = (pygame.time.get_ticks() - self.fade_start) / self.fade_duration
+        if progress >= 1:
+            self.fade_duration = 0  # Fade finished
+            self.set_volume(self.fade_to)
+        else:
+            self.set_volume(self.fade_from + (self.fade_to - self.fade_from) * progress)
+
+
+
+
+    def stop(self):
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
+        self.track = None
+        self.fade_duration = 0
+
+
+
+
+# Music player shared by the menus and the game loop
+music_player = MusicPlayer()
@@ -0,0 +1,89 @@
+"""
+NumPy views of the map: one array per terrain property, indexed [x, y] like grid.tiles,
+so whole-map questions (fog edges, hidden cells, spawn candidates) are array operations.
+"""
+import numpy as np
+
+
+# Terrain codes stored in TerrainMap.terrain
+TERRAIN_CODES = {"grass": 0, "water": 1, "rock": 2}
+
+
+
+
+# Terrain Map Class
+class TerrainMap:
+    """
+    Arrays mirroring a board's tiles: terrain code, move cost, traversable, bush and barrier masks.
+    Built once the tiles exist; the board reports overlay changes through set_overlay().
+    """
+    def __init__(self, terrains, overlays):
+        """
+        :param terrains: Terrain name of every cell, as a list of columns (terrains[x][y]).
+        :param overlays: Overlay of every cell (None, "bush" or "barrier"), same layout.
+        """
+        self.width = len(terrains)
+        self.height = len(terrains[0])
+        self.terrain = np.array([[TERRAIN_CODES[terrain] for terrain in column] for column in terrains], dtype=np.uint8)
+        self.traversable = self.terrain != TERRAIN_CODES["rock"]
+        self.move_cost = np.choose(self.terrain, [1.0, 2.0, np.inf])
+        self.bush = np.array([[overlay == "bush" for overlay in column] for column in overlays])
+        self.barrier = np.array([[overlay == "barrier" for overlay in column] for column in overlays])
+        self.spawn_cells = {}  # Tuple of terrain names -> flat indices of the cells with that terrain
+
+
+
+
+    @classmethod
+    def from_grid(cls, grid):
+        return cls(
+            [[tile.terrain for tile in column] for column in grid.tiles],
+            [[tile.overlay for tile in column] for column in grid.tiles],
+        )
+
+
+
+
+    def set_overlay(self, x, y, overlay):
+        self.bush[x, y] = overlay == "bush"
+        self.barrier[x, y] = overlay == "barrier"
+
+
+
+
+    def mask(self, indices):
+        """Boolean map with the given flat indices (x * height + y, as GridSearch returns them) set."""
+        mask = np.zeros((self.width, self.height), dtype=bool)
+        mask.flat[list(indices)] = True
+        return mask
+
+
+
+
+    def mask_from_bits(self, bits):
+        """Boolean map of an int bitset of flat indices (GridSearch.vision_bits)."""
+        size = self.width * self.height
+        packed = np.frombuffer(bits.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+        return np.unpackbits(packed, count=size, bitorder="little").view(bool).reshape(self.width, self.height)
+
+
+
+
+    def cells_of(self, terrains):
+        """Flat indices of every cell whose terrain is one of `terrains` (cached, terrain never changes)."""
+        key = tuple(terrains)
+        cells = self.spawn_cells.get(key)
+        if cells is None:
+            codes = [TERRAIN_CODES[terrain] for terrain in terrains]
+            cells = self.spawn_cells[key] = np.flatnonzero(np.isin(self.terrain, codes))
+        return cells
+
+
+
+
+    @staticmethod
+    def edges(mask):
+        """Cells of `mask` with at least one 4-neighbour outside it (the map border counts as outside)."""
+        padded = np.pad(mask, 1, constant_values=False)
+        inner = padded[:-2, 1:-1] & padded[2:, 1:-1] & padded[1:-1, :-2] & padded[1:-1, 2:]
+        return mask & ~inner
@@ -0,0 +1,263 @@
+"""
+Zobrist hashing of match states, and a bounded transposition table for the AI searches.
+Every feature of the position (a unit's cell, health bucket, a cooldown, the potions on the map...)
+has a random 64-bit key, and the hash is the XOR of the keys of the current features,
+so a change only XORs out the old key and XORs in the new one.
+The hash leaves out details (exact health, damage, timers...) that the table entries check instead.
+"""
+import random
+from collections import namedtuple
+from operator import attrgetter
+
+
+HEALTH_BUCKETS = 16  # Health and mana are hashed in sixteenths of their maximum, by default
+CAP = 15  # Cooldowns, durations and key counts above this share a key
+STATES = {"move": 0, "attack": 1, "done": 2}
+SEED = 0x5EED  # Same keys in every process, so hashes can be compared across workers
+
+# Per-unit features, in the order unit_features() returns them, and how many values each takes
+UNIT_SLOTS = (
+    ("cell", None),  # Flat index, or size when dead
+    ("initial_cell", None),
+    ("state", len(STATES)),
+    ("health", "buckets"),
+    ("mana", "buckets"),
+    ("buff_duration", CAP + 1),
+    ("debuff_duration", CAP + 1),
+    ("red_keys", CAP + 1),
+    ("blue_keys", CAP + 1),
+    ("barrier_status", 3),
+)
+
+# Unit attributes the features are computed from, compared first to skip the units that did not change
+RAW_FIELDS = (
+    "x", "y", "alive", "initial_x", "initial_y", "state", "health", "max_health", "mana", "max_mana",
+    "buff_duration", "debuff_duration", "red_keys", "blue_keys", "barrier_status",
+)
+# Other attributes a search depends on: not hashed, but part of the check key that tells positions apart
+CHECKED_FIELDS = (
+    "move_range", "target_x", "target_y", "damage", "physical_defense", "magical_defense", "crit_chance",
+    "death_timer", "buffed_damage_increase", "buffed_defense_increase", "debuffed_attack_reduction",
+    "debuffed_defense_reduction", "is_buffed", "is_debuffed",
+)
+raw_fields = attrgetter(*RAW_FIELDS + CHECKED_FIELDS)
+remaining_cooldown = attrgetter("remaining_cooldown")
+
+# Key tables by (abilities per unit, cells, potion kinds, buckets), shared like the vision tables
+KEYS = {}
+
+
+
+
+# Zobrist Keys Class
+class ZobristKeys:
+    """The random keys of every feature, for one roster size and board size."""
+    def __init__(self, abilities, size, potion_kinds, buckets=HEALTH_BUCKETS, seed=SEED):
+        """
+        :param abilities: Number of abilities of every unit, in the match's order.
+        :param size: Number of cells on the board.
+        :param potion_kinds: Number of potion types.
+        :param buckets: Number of health and mana buckets.
+        """
+        rng = random.Random(seed)
+        key = lambda: rng.getrandbits(64)
+        self.units = []
+        for count in abilities:
+            lengths = [size + 1 if values is None else buckets + 1 if values == "buckets" else values for _, values in UNIT_SLOTS]
+            slots = [[key() for _ in range(length)] for length in lengths]
+            slots += [[key() for _ in range(CAP + 1)] for _ in range(count)]  # One table per ability cooldown
+            self.units.append(slots)
+        self.turn = [key() for _ in abilities]  # Whose turn it is
+        self.pickups = [[key() for _ in range(potion_kinds)] for _ in range(size)]
+
+
+
+
+    @classmethod
+    def of(cls, match, buckets=HEALTH_BUCKETS):
+        search = match.grid.search
+        abilities = tuple(len(unit.abilities) for unit in match.units)
+        key = (abilities, search.size, len(match.pickup.pickup_types), buckets)
+        keys = KEYS.get(key)
+        if keys is None:
+            keys = KEYS[key] = cls(*key)
+        return keys
+
+
+
+
+# Zobrist Hash Class
+class ZobristHash:
+    """
+    Hash of a match, kept up to date by Match.apply() once attached with match.zobrist = ZobristHash(match).
+    update() reads every unit's attributes and cooldowns, but only recomputes the features of the units
+    whose attributes changed, and only XORs the keys of the features that did.
+    `check` is the exact position (every attribute the search depends on), for the transposition table
+    to tell apart positions that share a hash.
+    """
+    def __init__(self, match, buckets=HEALTH_BUCKETS):
+        """
+        :param buckets: Health and mana resolution: positions whose health and mana fall in the same
+                        fractions of the maximum hash alike. A search needs a fine one to tell hits apart.
+        """
+        self.keys = ZobristKeys.of(match, buckets)
+        self.buckets = buckets
+        self.height = match.grid.search.height
+        self.dead = match.grid.search.size
+        self.potions = {kind: index for index, kind in enumerate(match.pickup.pickup_types)}
+        self.raw = [None] * len(match.units)
+        self.features = [()] * len(match.units)
+        self.pickups = frozenset()
+        self.turn = None
+        self.value = 0
+        self.check = None
+        self.update(match)
+
+
+
+
+    def unit_features(self, raw, cooldowns):
+        """Value index of every slot of UNIT_SLOTS, then of every ability cooldown, from the raw attributes."""
+        (x, y, alive, initial_x, initial_y, state, health, max_health, mana, max_mana,
+         buff_duration, debuff_duration, red_keys, blue_keys, barrier_status) = raw[:len(RAW_FIELDS)]
+        return (
+            x * self.height + y if alive else self.dead,
+            initial_x * self.height + initial_y,
+            STATES[state],
+            min(max(health, 0) * self.buckets // max_health, self.buckets) if max_health > 0 else 0,
+            min(max(mana, 0) * self.buckets // max_mana, self.buckets) if max_mana > 0 else 0,
+            min(buff_duration, CAP),
+            min(debuff_duration, CAP),
+            min(red_keys, CAP),
+            min(blue_keys, CAP),
+            1 if barrier_status == "Up" else 2 if barrier_status == "Down" else 0,
+        ) + tuple(min(cooldown, CAP) for cooldown in cooldowns)
+
+
+
+
+    def update(self, match):
+        """Bring the hash up to date with `match` and return it."""
+        value = self.value
+        for index, unit in enumerate(match.units):
+            raw = (raw_fields(unit), tuple(map(remaining_cooldown, unit.abilities)))
+            if raw == self.raw[index]:
+                continue
+            self.raw[index] = raw
+            new = self.unit_features(*raw)
+            old = self.features[index]
+            if new != old:
+                tables = self.keys.units[index]
+                for slot, feature in enumerate(new):
+                    if not old:
+                        value ^= tables[slot][feature]
+                    elif old[slot] != feature:
+                        value ^= tables[slot][old[slot]] ^ tables[slot][feature]
+                self.features[index] = new
+
+        # Live potions: only the ones that appeared or were taken since the last update
+        pickup = match.pickup
+        pickups = frozenset((p.x * self.height + p.y, self.potions[p.overlay]) for p in pickup.all_pickups)
+        if pickups != self.pickups:
+            for cell, kind in pickups ^ self.pickups:
+                value ^= self.keys.pickups[cell][kind]
+            self.pickups = pickups
+
+        if match.current_unit_index != self.turn:
+            if self.turn is not None:
+                value ^= self.keys.turn[self.turn]
+            value ^= self.keys.turn[match.current_unit_index]
+            self.turn = match.current_unit_index
+
+        self.value = value
+        self.check = (
+            tuple(self.raw), match.current_unit_index, match.current_turn, match.blue_barrier, match.red_barrier,
+            tuple((p.x, p.y, p.overlay, p.spawn_turn) for p in pickup.all_pickups),
+            tuple(pickup.next_spawn_turns.items()), pickup.turn_count,
+        )
+        return value
+
+
+
+
+    @classmethod
+    def of(cls, match, buckets=HEALTH_BUCKETS):
+        """Hash of `match` computed from scratch."""
+        return cls(match, buckets).value
+
+
+
+
+# Bound of a stored value: exact, or only a lower / upper bound after a cutoff
+EXACT, LOWER, UPPER = 0, 1, 2
+
+Entry = namedtuple("Entry", "key check depth value bound action generation")
+
+
+
+
+# Transposition Table Class
+class TranspositionTable:
+    """
+    Search results by Zobrist hash, in a fixed number of slots (hash modulo the size).
+    Each slot holds two entries: one kept for depth, one always replaced. A new result goes
+    to the depth entry when it was searched at least as deep, or when that entry is from an older search.
+    An entry only answers a probe with the same hash and the same check key (ZobristHash.check),
+    so positions that share a hash never share results.
+    """
+    def __init__(self, size=1 << 16):
+        self.size = size
+        self.deep = [None] * size
+        self.recent = [None] * size
+        self.generation = 0
+        self.hits = self.misses = self.stores = 0
+
+
+
+
+    def new_search(self):
+        """Age every entry, so the next search may replace them regardless of depth."""
+        self.generation += 1
+
+
+
+
+    def probe(self, key, check=None):
+        """The stored entry for `key` and `check`, or None."""
+        slot = key % self.size
+        for entry in (self.deep[slot], self.recent[slot]):
+            if entry is not None and entry.key == key and entry.check == check:
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+
+
+
+    def store(self, key, depth, value, bound, action=None, check=None):
+        slot = key % self.size
+        entry = Entry(key, check, depth, value, bound, action, self.generation)
+        deep = self.deep[slot]
+        same = deep is not None and deep.key == key and deep.check == check
+        if deep is None or same or depth >= deep.depth or deep.generation != self.generation:
+            if deep is not None and not same:
+                self.recent[slot] = deep  # The displaced entry still gets a chance
+            self.deep[slot] = entry
+        else:
+            self.recent[slot] = entry
+        self.stores += 1
+
+
+
+
+    def clear(self):
+        self.deep = [None] * self.size
+        self.recent = [None] * self.size
+        self.hits = self.misses = self.stores = 0
+
+
+
+
+    def __len__(self):
+        return sum(entry is not None for entry in self.deep) + sum(entry is not None for entry in self.recent)